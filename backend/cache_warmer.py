@@ -0,0 +1,228 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from models import HotelSearchParams
+
+logger = logging.getLogger(__name__)
+
+# Off by default: warming spends upstream quota around the clock (up to
+# WARM_BUDGET_PER_CYCLE calls every WARM_INTERVAL_SECONDS, about one call per
+# warmed search per cache TTL) whatever the traffic. Opt in with
+# WARM_ENABLED=true on a deployment with a real key.
+WARM_ENABLED = os.getenv("WARM_ENABLED", "false").lower() == "true"
+WARM_DESTINATIONS_FILE = os.getenv(
+    "WARM_DESTINATIONS_FILE", os.path.join(os.path.dirname(__file__), "warm_destinations.json")
+)
+# Well below the result cache TTL, so an entry is refreshed shortly before it
+# expires rather than on every cycle
+WARM_INTERVAL_SECONDS = float(os.getenv("WARM_INTERVAL_SECONDS", "60"))
+# An entry is due once it has less than a cycle plus this margin of freshness left
+WARM_MARGIN_SECONDS = float(os.getenv("WARM_MARGIN_SECONDS", "15"))
+# Upstream calls the warmer may spend per cycle, on top of user traffic
+WARM_BUDGET_PER_CYCLE = int(os.getenv("WARM_BUDGET_PER_CYCLE", "5"))
+# Most of a cycle's budget configured destinations nobody searched may take,
+# so they never crowd out what users actually ask for
+WARM_CONFIGURED_SHARE = float(os.getenv("WARM_CONFIGURED_SHARE", "0.4"))
+WARM_CONCURRENCY = int(os.getenv("WARM_CONCURRENCY", "2"))
+# Most frequent recent user searches added to each cycle
+WARM_LEARNED_TOP = int(os.getenv("WARM_LEARNED_TOP", "10"))
+# Search counts halve this often, so only recent popularity matters
+WARM_POPULARITY_HALF_LIFE = float(os.getenv("WARM_POPULARITY_HALF_LIFE", "900"))
+MAX_TRACKED_QUERIES = 5000
+
+def load_configured_searches(path: str, today: date) -> List[HotelSearchParams]:
+    """Expand the hot-destination file into concrete searches relative to ``today``."""
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return []
+
+    searches = []
+    for offset in config.get("date_offsets", []):
+        arrival = today + timedelta(days=offset["arrival_in_days"])
+        departure = arrival + timedelta(days=offset["nights"])
+        for destination in config.get("destinations", []):
+            for currency in config.get("currencies", ["USD"]):
+                searches.append(HotelSearchParams(
+                    latitude=destination["latitude"],
+                    longitude=destination["longitude"],
+                    arrival_date=arrival.isoformat(),
+                    departure_date=departure.isoformat(),
+                    adults=config.get("adults", 2),
+                    room_qty=config.get("room_qty", 1),
+                    currency_code=currency,
+                ))
+    return searches
+
+class WarmCandidate(NamedTuple):
+    params: HotelSearchParams
+    searches: int  # recent user searches, halved every half-life
+    configured: bool  # from the destinations file and not popular itself
+
+class CacheWarmer:
+    """Periodically refreshes popular searches into the result cache.
+
+    Candidates are the configured hot destinations plus the most frequent
+    recent user searches (``record``). ``expires_in`` gives the seconds an
+    entry stays fresh (None if it is not cached); each cycle refreshes only
+    entries that are missing or would expire before the next cycle plus
+    ``margin``. Due entries are ranked together, most searched first and
+    then soonest to expire, and the top ``budget`` are refreshed, of which
+    configured destinations nobody searched take at most
+    ``configured_share``. The cycle is skipped while ``paused()`` is true
+    (the upstream circuit breaker is open), and, with several workers,
+    while ``leader()`` is false: only the worker holding the warmer role
+    spends quota, ranking by the searches it has seen itself.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[HotelSearchParams], Awaitable[Any]],
+        expires_in: Callable[[HotelSearchParams], Awaitable[Optional[float]]],
+        key: Callable[[HotelSearchParams], Hashable],
+        paused: Callable[[], bool],
+        leader: Optional[Callable[[], Awaitable[bool]]] = None,
+        interval: float = WARM_INTERVAL_SECONDS,
+        margin: float = WARM_MARGIN_SECONDS,
+        budget: int = WARM_BUDGET_PER_CYCLE,
+        configured_share: float = WARM_CONFIGURED_SHARE,
+        concurrency: int = WARM_CONCURRENCY,
+        learned_top: int = WARM_LEARNED_TOP,
+        half_life: float = WARM_POPULARITY_HALF_LIFE,
+        destinations_file: str = WARM_DESTINATIONS_FILE,
+    ):
+        self.refresh = refresh
+        self.expires_in = expires_in
+        self.key = key
+        self.paused = paused
+        self.leader = leader
+        self.interval = interval
+        self.margin = margin
+        self.budget = budget
+        self.configured_share = configured_share
+        self.concurrency = concurrency
+        self.learned_top = learned_top
+        self.half_life = half_life
+        self._decayed_at = time.monotonic()
+        self.destinations_file = destinations_file
+        self._query_counts: Counter = Counter()
+        self._query_params: Dict[Hashable, HotelSearchParams] = {}
+        self._task = None
+        self.stats: Dict[str, Any] = {
+            "cycles": 0, "warmed": 0, "errors": 0, "skipped_cycles": 0, "standby_cycles": 0, "last_run": None,
+        }
+
+    def record(self, params: HotelSearchParams) -> None:
+        """Count a user search so frequent ones get warmed too."""
+        key = self.key(params)
+        if key not in self._query_counts and len(self._query_counts) >= MAX_TRACKED_QUERIES:
+            return
+        self._query_counts[key] += 1
+        self._query_params[key] = params
+
+    def _decay(self) -> None:
+        now = time.monotonic()
+        if now - self._decayed_at < self.half_life:
+            return
+        self._decayed_at = now
+        self._query_counts = Counter({k: c // 2 for k, c in self._query_counts.items() if c // 2})
+        self._query_params = {k: self._query_params[k] for k in self._query_counts}
+
+    def candidates(self) -> List[WarmCandidate]:
+        self._decay()
+        today = date.today().isoformat()
+        candidates: Dict[Hashable, WarmCandidate] = {}
+        for key, count in self._query_counts.most_common():
+            if len(candidates) >= self.learned_top or count < 2:
+                break
+            params = self._query_params[key]
+            if params.arrival_date >= today:
+                candidates[key] = WarmCandidate(params, count, configured=False)
+        for params in load_configured_searches(self.destinations_file, date.today()):
+            key = self.key(params)
+            if key not in candidates:
+                candidates[key] = WarmCandidate(params, self._query_counts.get(key, 0), configured=True)
+        return list(candidates.values())
+
+    async def due(self) -> List[HotelSearchParams]:
+        """Searches to refresh this cycle, best first, within the budget."""
+        ranked = []
+        for candidate in self.candidates():
+            expires_in = await self.expires_in(candidate.params)
+            if expires_in is None:
+                expires_in = float("-inf")  # not cached at all: most urgent
+            if expires_in < self.interval + self.margin:
+                ranked.append((-candidate.searches, expires_in, candidate))
+        ranked.sort(key=lambda entry: entry[:2])
+
+        configured_left = int(self.budget * self.configured_share)
+        due = []
+        for _, _, candidate in ranked:
+            if len(due) >= self.budget:
+                break
+            if candidate.configured:
+                if configured_left <= 0:
+                    continue
+                configured_left -= 1
+            due.append(candidate.params)
+        return due
+
+    async def run_once(self) -> int:
+        if self.paused():
+            self.stats["skipped_cycles"] += 1
+            return 0
+        if self.leader is not None and not await self.leader():
+            self.stats["standby_cycles"] += 1
+            return 0
+
+        due = await self.due()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(params: HotelSearchParams) -> bool:
+            async with semaphore:
+                if self.paused():
+                    return False
+                try:
+                    await self.refresh(params)
+                    return True
+                except Exception as e:
+                    logger.warning(f"Cache warm failed for {self.key(params)}: {e}")
+                    self.stats["errors"] += 1
+                    return False
+
+        warmed = sum(await asyncio.gather(*(warm(params) for params in due)))
+        self.stats["cycles"] += 1
+        self.stats["warmed"] += warmed
+        self.stats["last_run"] = time.time()
+        return warmed
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Cache warmer cycle failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "tracked_queries": len(self._query_counts), "budget": self.budget, "interval": self.interval}
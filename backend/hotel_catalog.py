@@ -0,0 +1,191 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from models import Hotel
+
+HOTEL_CATALOG_PATH = os.getenv(
+    "HOTEL_CATALOG_PATH", os.path.join(os.path.dirname(__file__), "hotel_catalog.db")
+)
+# Seconds before static hotel attributes are re-validated from a search
+HOTEL_CATALOG_TTL = int(os.getenv("HOTEL_CATALOG_TTL", str(7 * 24 * 3600)))
+# Grid cell edge in degrees (~5.5 km of latitude)
+CATALOG_CELL_DEG = 0.05
+KM_PER_DEG_LAT = 111.32
+EARTH_RADIUS_KM = 6371.0088
+
+class CatalogHotel(NamedTuple):
+    """Static attributes of a hotel as last seen upstream."""
+    hotel_id: int
+    hotel_name: str
+    city: str
+    country_code: str
+    latitude: float
+    longitude: float
+    photo_url: str
+    accommodation_type: Optional[int]
+    timezone: Optional[str]
+    rating: Optional[float]
+    rating_description: Optional[str]
+    review_count: Optional[int]
+    badges: Tuple[Dict[str, str], ...]
+    updated_at: float
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id INTEGER PRIMARY KEY,
+    hotel_name TEXT NOT NULL,
+    city TEXT,
+    country_code TEXT,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    photo_url TEXT,
+    accommodation_type INTEGER,
+    timezone TEXT,
+    rating REAL,
+    rating_description TEXT,
+    review_count INTEGER,
+    badges TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+class HotelCatalog:
+    """Persistent catalog of every hotel seen upstream, with a spatial grid index.
+
+    Rows live in SQLite so the catalog survives restarts; lookups are served
+    from memory. Entries older than ``ttl`` are reported by ``is_expired`` so
+    searches re-read them from upstream. Hotels are bucketed into ``cell_deg`` x ``cell_deg`` grid
+    cells, so a radius query only inspects the cells overlapping its
+    bounding box.
+    """
+
+    def __init__(self, path: str = HOTEL_CATALOG_PATH, cell_deg: float = CATALOG_CELL_DEG, ttl: float = HOTEL_CATALOG_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.cell_deg = cell_deg
+        self._hotels: Dict[int, CatalogHotel] = {}
+        self._grid: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg))
+
+    def _index(self, hotel: CatalogHotel) -> None:
+        previous = self._hotels.get(hotel.hotel_id)
+        if previous is not None:
+            self._grid[self._cell(previous.latitude, previous.longitude)].discard(hotel.hotel_id)
+        self._hotels[hotel.hotel_id] = hotel
+        self._grid[self._cell(hotel.latitude, hotel.longitude)].add(hotel.hotel_id)
+
+    def open(self) -> None:
+        """Connect to the SQLite file and load every row into the index."""
+        with self._lock:
+            if self._db is not None:
+                return
+            self._db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            # Several worker processes may write to the same file
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+            for row in self._db.execute("SELECT * FROM hotels"):
+                self._index(CatalogHotel(*row[:12], tuple(json.loads(row[12] or "[]")), row[13]))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def remember(self, hotels: Iterable[CatalogHotel]) -> None:
+        """Add or refresh hotels in memory only."""
+        with self._lock:
+            for hotel in hotels:
+                self._index(hotel)
+
+    def persist(self, hotels: Iterable[CatalogHotel]) -> None:
+        """Write hotels to SQLite. Blocking; call from a worker thread."""
+        hotels = list(hotels)
+        if not hotels:
+            return
+        with self._lock:
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO hotels VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(*hotel[:12], json.dumps(list(hotel.badges)), hotel.updated_at) for hotel in hotels],
+                )
+                self._db.commit()
+
+    def upsert(self, hotels: Iterable[CatalogHotel]) -> None:
+        """Add or refresh hotels in memory and on disk. Blocking."""
+        hotels = list(hotels)
+        self.remember(hotels)
+        self.persist(hotels)
+
+    def is_expired(self, hotel: CatalogHotel) -> bool:
+        return time.time() - hotel.updated_at >= self.ttl
+
+    def get(self, hotel_id: int) -> Optional[CatalogHotel]:
+        return self._hotels.get(hotel_id)
+
+    def hotels(self) -> List[CatalogHotel]:
+        with self._lock:
+            return list(self._hotels.values())
+
+    def __len__(self) -> int:
+        return len(self._hotels)
+
+    def within(self, latitude: float, longitude: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[CatalogHotel, float]]:
+        """Hotels within ``radius_km`` of a point as (hotel, distance_km), nearest first."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(latitude)), 0.01))
+        min_row, min_col = self._cell(latitude - dlat, longitude - dlon)
+        max_row, max_col = self._cell(latitude + dlat, longitude + dlon)
+
+        with self._lock:
+            candidates = [
+                self._hotels[hotel_id]
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+                for hotel_id in self._grid.get((row, col), ())
+            ]
+
+        matches = []
+        for hotel in candidates:
+            distance = haversine_km(latitude, longitude, hotel.latitude, hotel.longitude)
+            if distance <= radius_km:
+                matches.append((hotel, round(distance, 2)))
+
+        matches.sort(key=lambda match: match[1])
+        return matches[:limit] if limit else matches
+
+def catalog_record(hotel: Hotel) -> CatalogHotel:
+    """Static part of an upstream ``Hotel``."""
+    return CatalogHotel(
+        hotel_id=hotel.hotel_id,
+        hotel_name=hotel.hotel_name,
+        city=hotel.city,
+        country_code=hotel.countrycode.upper(),
+        latitude=hotel.latitude,
+        longitude=hotel.longitude,
+        photo_url=hotel.main_photo_url,
+        accommodation_type=hotel.accommodation_type,
+        timezone=hotel.timezone,
+        rating=hotel.review_score,
+        rating_description=hotel.review_score_word,
+        review_count=hotel.review_nr,
+        badges=tuple(badge.model_dump() for badge in hotel.badges or ()),
+        updated_at=time.time(),
+    )
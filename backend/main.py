@@ -1,122 +1,250 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+import asyncio
 import httpx
 import os
+import time
+import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
-from models import HotelSearchParams, HotelResponse, HotelSearchResponse, Hotel, Badge
-from typing import List, Optional
+from models import HotelSearchParams, HotelFilterParams, HotelResponseWithDistance, RawHotelSearchResponse, HotelOffer, Hotel, BatchSearchRequest, BatchSearchItem, PriceCalendarParams
+from typing import Dict, Hashable, List, Literal, Optional
 from pydantic import ValidationError, BaseModel
 from geopy.distance import geodesic
+from responses import resolve_fields, project, json_response, representation_etag, etag_matches, not_modified
+from result_cache import Offer, ResultCache, ResultSet
+from pricing import summarize_price
+from price_math import stay_nights
+from upstream import RapidAPIClient
+from circuit_breaker import CircuitOpenError
+from cache_warmer import CacheWarmer, WARM_ENABLED
+from hotel_catalog import HotelCatalog, catalog_record
+from place_index import PlaceIndex
+from price_history import PriceHistoryWriter, PRICE_HISTORY_ENABLED, load_history, aggregate
+from shared_cache import SharedResultStore, SHARED_CACHE_ENABLED, SHARED_POLL_INTERVAL, BACKEND_WORKERS
+from price_calendar import calendar_searches, summarize_day
+import orjson
 
 load_dotenv()
 
-app = FastAPI()
+# Upper bound on concurrent upstream searches for a single batch request
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+# Concurrent per-date searches while building a price calendar
+CALENDAR_MAX_CONCURRENCY = int(os.getenv("CALENDAR_MAX_CONCURRENCY", "16"))
+
+upstream = RapidAPIClient(os.getenv("RAPIDAPI_KEY"))
+hotel_catalog = HotelCatalog()
+place_index = PlaceIndex()
+# Cross-process cache so extra workers do not each miss on their own
+shared_store = SharedResultStore(catalog=hotel_catalog) if SHARED_CACHE_ENABLED else None
+result_cache = ResultCache(shared=shared_store)
+price_history = PriceHistoryWriter()
+_inflight_searches: Dict[Hashable, asyncio.Future] = {}
+
+async def _fresh_for(params: HotelSearchParams) -> Optional[float]:
+    # Seconds the cached entry stays fresh; None if there is none
+    result_set = await result_cache.get_stale(params)
+    return None if result_set is None else result_cache.ttl - result_cache.age(result_set)
+
+async def _warm(params: HotelSearchParams) -> ResultSet:
+    return await _search_task(params)
+
+# With several workers only the one holding this role in the shared store warms
+WARMER_ROLE = "cache_warmer"
+_warmer_owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+async def _is_warmer() -> bool:
+    # Held for three cycles, so another worker takes over if this one dies
+    return await shared_store.ahold(WARMER_ROLE, _warmer_owner, 3 * cache_warmer.interval)
+
+cache_warmer = CacheWarmer(
+    refresh=_warm,
+    expires_in=_fresh_for,
+    key=result_cache.key,
+    paused=lambda: upstream.breaker.is_open(),
+    leader=_is_warmer if shared_store is not None else None,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(hotel_catalog.open)
+    await asyncio.to_thread(place_index.load)
+    await asyncio.to_thread(place_index.add_hotels, hotel_catalog.hotels())
+    if PRICE_HISTORY_ENABLED:
+        price_history.start()
+    if WARM_ENABLED:
+        cache_warmer.start()
+    yield
+    await cache_warmer.stop()
+    if shared_store is not None and WARM_ENABLED:
+        await shared_store.adrop(WARMER_ROLE, _warmer_owner)
+    await upstream.aclose()
+    hotel_catalog.close()
+    if shared_store is not None:
+        await asyncio.to_thread(shared_store.close)
+    await asyncio.to_thread(price_history.stop)
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Result-Version", "X-Cache-Stale", "Age", "ETag"],
 )
 
-RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
-RAPIDAPI_HOST = "booking-com15.p.rapidapi.com"
-
 @app.get("/api/test")
 async def test_endpoint():
     return {"status": 200, "message": "Server Working"}
 
-def parse_badges(badges: List[Badge]) -> List[dict]:
-    return [badge.dict() for badge in badges] if badges else []
+def _search_task(params: HotelSearchParams) -> asyncio.Future:
+    """Start or join the upstream search for ``params``.
 
-# Update HotelResponse to include distance
-class HotelResponseWithDistance(HotelResponse):
-    distance_km: Optional[float] = None
+    Identical concurrent searches (e.g. within one batch) share a single
+    upstream call.
+    """
+    key = result_cache.key(params)
+    task = _inflight_searches.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_search_shared(params))
+        _inflight_searches[key] = task
+        task.add_done_callback(lambda done: _finish_search(key, done))
+    return task
 
-@app.get("/api/hotels/search", response_model=List[HotelResponseWithDistance])
-async def search_hotels(params: HotelSearchParams = Depends(), max_distance_km: float = 10.0):
-    url = f"https://{RAPIDAPI_HOST}/api/v1/hotels/searchHotelsByCoordinates"
-    
-    query_params = {
-        "latitude": params.latitude,
-        "longitude": params.longitude,
-        "arrival_date": params.arrival_date,
-        "departure_date": params.departure_date,
-        "adults": params.adults,
-        "children_age": params.children_age if params.children_age else "",
-        "room_qty": params.room_qty,
-        "units": "metric",
-        "page_number": "1",
-        "temperature_unit": "c",
-        "languagecode": "en-us",
-        "currency_code": params.currency_code or "INR",
-    }
+def _finish_search(key: Hashable, task: asyncio.Future) -> None:
+    _inflight_searches.pop(key, None)
+    if not task.cancelled():
+        # Mark the error as retrieved; background refreshes have no awaiter
+        task.exception()
+
+async def fetch_result_set(params: HotelSearchParams) -> ResultSet:
+    """Return the cached result set for ``params``, querying upstream on a miss.
+
+    An expired entry is returned immediately (stale-while-revalidate) and
+    refreshed in the background, unless the circuit breaker is open, in which
+    case the stale entry is all we serve until upstream recovers.
+    """
+    cached = await result_cache.get(params)
+    if cached is not None:
+        return cached
+
+    stale = await result_cache.get_stale(params)
+    if stale is not None:
+        if not upstream.breaker.is_open():
+            _search_task(params)
+        return stale
 
+    return await asyncio.shield(_search_task(params))
+
+def cache_headers(result_set: ResultSet) -> Dict[str, str]:
     headers = {
-        "X-RapidAPI-Key": RAPIDAPI_KEY,
-        "X-RapidAPI-Host": RAPIDAPI_HOST
+        "X-Result-Version": result_set.version,
+        "Age": str(int(result_cache.age(result_set))),
     }
+    if not result_cache.is_fresh(result_set):
+        headers["X-Cache-Stale"] = "true"
+        headers["Warning"] = '110 - "Response is Stale"'
+    return headers
+
+async def _search_shared(params: HotelSearchParams) -> ResultSet:
+    """Run the upstream search once across all worker processes.
 
+    The worker holding the shared lease queries upstream; the others poll
+    the shared store for its result and only search themselves if the lease
+    expires without one.
+    """
+    if shared_store is None:
+        return await _search_upstream(params)
+
+    key = result_cache.key(params)
+    started = time.time()
+    deadline = time.monotonic() + shared_store.lease_seconds
+    while not await shared_store.aclaim(key):
+        await asyncio.sleep(SHARED_POLL_INTERVAL)
+        result_set = await shared_store.aget(key, newer_than=started)
+        if result_set is not None:
+            result_cache.set_local(params, result_set)
+            return result_set
+        if time.monotonic() > deadline:
+            break
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=query_params)
-            response.raise_for_status()
-            
-            raw_data = response.json()
-            
+        return await _search_upstream(params)
+    finally:
+        await shared_store.arelease(key)
+
+async def _search_upstream(params: HotelSearchParams) -> ResultSet:
+    try:
+        raw_data = await upstream.search_hotels_by_coordinates(params)
+        
+        try:
+            search_response = RawHotelSearchResponse(**raw_data)
+        except ValidationError as e:
+            print(f"Validation error in API response: {e}")
+            return ResultSet([])
+
+        hotels = search_response.data.result
+        if not hotels:
+            return ResultSet([])
+
+        nights = stay_nights(params.arrival_date, params.departure_date)
+        search_coords = (float(params.latitude), float(params.longitude))
+        offers = []
+        new_hotels = []
+        for raw_hotel in hotels:
             try:
-                search_response = HotelSearchResponse(**raw_data)
-            except ValidationError as e:
-                print(f"Validation error in API response: {e}")
-                return []
-
-            hotels = search_response.data.result
-            if not hotels:
-                return []
-
-            hotel_responses = []
-            for hotel_data in hotels:
-                try:
-                    hotel_response = HotelResponse(
-                        hotel_id=hotel_data.hotel_id,
-                        hotel_name=hotel_data.hotel_name,
-                        price=float(hotel_data.min_total_price),
-                        currency=hotel_data.currencycode,
-                        city=hotel_data.city,
-                        country_code=hotel_data.countrycode.upper(),
-                        latitude=hotel_data.latitude,
-                        longitude=hotel_data.longitude,
-                        photo_url=hotel_data.main_photo_url,
-                        rating=hotel_data.review_score,
-                        rating_description=hotel_data.review_score_word,
-                        review_count=hotel_data.review_nr,
-                        free_cancellation=hotel_data.is_free_cancellable,
-                        badges=parse_badges(hotel_data.badges),
-                        price_breakdown=hotel_data.composite_price_breakdown.dict() if hotel_data.composite_price_breakdown else None,
-                        accommodation_type=hotel_data.accommodation_type,
-                        timezone=hotel_data.timezone
-                    )
-                    # Calculate distance between search coordinates and hotel coordinates
-                    search_coords = (float(params.latitude), float(params.longitude))
-                    hotel_coords = (hotel_response.latitude, hotel_response.longitude)
-                    distance = geodesic(search_coords, hotel_coords).kilometers
-                    
-                    # Create a response with distance
-                    hotel_dict = hotel_response.dict()
-                    hotel_dict["distance_km"] = round(distance, 2)
-                    hotel_responses.append(HotelResponseWithDistance(**hotel_dict))
-                except (ValidationError, ValueError) as e:
-                    print(f"Error processing hotel data: {e}")
-                    continue
-
-            # Filter hotels by distance
-            filtered_hotel_responses = [hotel for hotel in hotel_responses if hotel.distance_km <= max_distance_km]
-            
-            # Sort by distance
-            filtered_hotel_responses.sort(key=lambda x: x.distance_km)
-            
-            return filtered_hotel_responses
+                offer = HotelOffer(**raw_hotel)
+                hotel = hotel_catalog.get(offer.hotel_id)
+                if hotel is None or hotel_catalog.is_expired(hotel):
+                    # Static attributes are only validated for new or expired hotels
+                    hotel = catalog_record(Hotel(**raw_hotel))
+                    new_hotels.append(hotel)
 
+                # Calculate distance between search coordinates and hotel coordinates
+                distance = geodesic(search_coords, (hotel.latitude, hotel.longitude)).kilometers
+                breakdown = offer.composite_price_breakdown
+                offers.append(Offer(
+                    hotel=hotel,
+                    price=offer.min_total_price,
+                    currency=offer.currencycode,
+                    free_cancellation=offer.is_free_cancellable,
+                    price_summary=summarize_price(breakdown, offer.min_total_price, offer.currencycode, nights),
+                    price_breakdown=breakdown.model_dump() if breakdown else None,
+                    distance_km=round(distance, 2),
+                ))
+            except (ValidationError, ValueError) as e:
+                print(f"Error processing hotel data: {e}")
+                continue
+
+        if new_hotels:
+            hotel_catalog.remember(new_hotels)
+            place_index.add_hotels(new_hotels)
+            # Write-through to SQLite off the event loop
+            asyncio.get_running_loop().run_in_executor(None, hotel_catalog.persist, new_hotels)
+
+        result_set = ResultSet(offers)
+        await result_cache.set(params, result_set)
+
+        if PRICE_HISTORY_ENABLED:
+            price_history.record(
+                [offer.hotel_id for offer in offers],
+                [offer.hotel.city for offer in offers],
+                [offer.currency for offer in offers],
+                [offer.price for offer in offers],
+                params.arrival_date,
+                params.departure_date,
+            )
+        return result_set
+
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Hotel search is temporarily unavailable",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"Error fetching hotel data: {e.response.text}")
     except ValidationError as e:
@@ -124,6 +252,261 @@ async def search_hotels(params: HotelSearchParams = Depends(), max_distance_km:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/metrics/upstream")
+async def upstream_metrics():
+    """Upstream limiter counters and circuit breaker state."""
+    return {**upstream.limiter.snapshot(), "breaker": upstream.breaker.snapshot()}
+
+@app.get("/api/metrics/warmer")
+async def warmer_metrics():
+    return cache_warmer.snapshot()
+
+@app.get("/api/metrics/shared-cache")
+async def shared_cache_metrics():
+    if shared_store is None:
+        return {"enabled": False, "workers": BACKEND_WORKERS}
+    return {"enabled": True, "workers": BACKEND_WORKERS, "pid": os.getpid(), **shared_store.snapshot()}
+
+@app.get("/api/metrics/price-history")
+async def price_history_metrics():
+    return price_history.snapshot()
+
+@app.get("/api/metrics/places")
+async def place_index_metrics():
+    return place_index.snapshot()
+
+@app.get("/api/hotels/search", response_model=List[HotelResponseWithDistance])
+async def search_hotels(
+    request: Request,
+    params: HotelSearchParams = Depends(),
+    filters: HotelFilterParams = Depends(),
+    max_distance_km: float = 10.0,
+    fields: Optional[str] = None,
+):
+    include = resolve_fields(HotelResponseWithDistance, fields)
+    cache_warmer.record(params)
+    place_index.record_search(params.latitude, params.longitude)
+    result_set = await fetch_result_set(params)
+    headers = cache_headers(result_set)
+    headers["ETag"] = representation_etag(request, result_set.version)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+    hotels = result_set.select(filters, max_distance_km=max_distance_km)
+    return json_response(project(hotels, include), request, headers=headers)
+
+async def _run_batch_item(item: BatchSearchItem, include, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        try:
+            result_set = await fetch_result_set(item)
+        except HTTPException as e:
+            return {"status": e.status_code, "error": e.detail}
+    hotels = result_set.select(item.filters, max_distance_km=item.max_distance_km)
+    return {
+        "status": 200,
+        "version": result_set.version,
+        "stale": not result_cache.is_fresh(result_set),
+        "hotels": project(hotels, include),
+    }
+
+@app.post("/api/hotels/search/batch")
+async def search_hotels_batch(request: Request, batch: BatchSearchRequest):
+    """Run several searches concurrently, keyed by each item's ``id`` (or index).
+
+    At most ``concurrency`` upstream searches run at once (capped by
+    ``BATCH_MAX_CONCURRENCY``). Items share the upstream client, the result
+    cache and in-flight requests. With ``stream=true`` results are sent as
+    NDJSON lines in completion order.
+    """
+    include = resolve_fields(HotelResponseWithDistance, batch.fields)
+    semaphore = asyncio.Semaphore(min(batch.concurrency, BATCH_MAX_CONCURRENCY))
+    ids = [item.id if item.id is not None else str(index) for index, item in enumerate(batch.searches)]
+
+    async def run(search_id: str, item: BatchSearchItem):
+        return search_id, await _run_batch_item(item, include, semaphore)
+
+    tasks = [asyncio.ensure_future(run(search_id, item)) for search_id, item in zip(ids, batch.searches)]
+
+    if batch.stream:
+        async def lines():
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    search_id, result = await next_done
+                    yield orjson.dumps({"id": search_id, **result}) + b"\n"
+            finally:
+                for task in tasks:
+                    task.cancel()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = dict(await asyncio.gather(*tasks))
+    return json_response({"results": results}, request)
+
+@app.get("/api/hotels/calendar")
+async def price_calendar(
+    request: Request,
+    params: PriceCalendarParams = Depends(),
+    filters: HotelFilterParams = Depends(),
+    max_distance_km: float = 10.0,
+):
+    """Cheapest stay of ``nights`` for every arrival date in a range.
+
+    The per-date searches run concurrently and reuse cached days, so a
+    calendar costs roughly as much as the slowest single search.
+    """
+    try:
+        searches = calendar_searches(params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    semaphore = asyncio.Semaphore(CALENDAR_MAX_CONCURRENCY)
+
+    async def run(search: HotelSearchParams) -> dict:
+        async with semaphore:
+            try:
+                result_set = await fetch_result_set(search)
+            except HTTPException as e:
+                return {
+                    "arrival_date": search.arrival_date,
+                    "departure_date": search.departure_date,
+                    "status": e.status_code,
+                    "error": e.detail,
+                }
+        day = summarize_day(search, result_set, filters, max_distance_km)
+        day["stale"] = not result_cache.is_fresh(result_set)
+        return day
+
+    days = await asyncio.gather(*(run(search) for search in searches))
+    priced = [day for day in days if day.get("min_price") is not None]
+    cheapest = min(priced, key=lambda day: day["min_price"], default=None)
+    return json_response({
+        "currency": params.currency_code,
+        "nights": params.nights,
+        "cheapest_arrival_date": cheapest["arrival_date"] if cheapest else None,
+        "dates": days,
+    }, request)
+
+@app.get("/api/hotels/nearby")
+async def nearby_hotels(
+    request: Request,
+    latitude: float,
+    longitude: float,
+    radius_km: float = Query(5.0, gt=0, le=50),
+    limit: int = Query(200, ge=1, le=2000),
+    arrival_date: Optional[str] = None,
+    departure_date: Optional[str] = None,
+    adults: int = 2,
+    children_age: Optional[str] = None,
+    room_qty: int = 1,
+    currency_code: str = "USD",
+):
+    """Instant preview of known hotels around a point from the local catalog.
+
+    When stay dates are given, prices from the cached search for those
+    dates are merged in (``priced``). On a cache miss the search is started
+    in the background so a follow-up ``/api/hotels/search`` or ``nearby``
+    call picks the live prices up.
+    """
+    offers = {}
+    priced = False
+    if arrival_date and departure_date:
+        params = HotelSearchParams(
+            latitude=latitude,
+            longitude=longitude,
+            arrival_date=arrival_date,
+            departure_date=departure_date,
+            adults=adults,
+            children_age=children_age,
+            room_qty=room_qty,
+            currency_code=currency_code,
+        )
+        result_set = await result_cache.get_stale(params)
+        if result_set is None:
+            if not upstream.breaker.is_open():
+                _search_task(params)
+        else:
+            priced = True
+            offers = {offer.hotel_id: offer for offer in result_set.offers}
+
+    hotels = []
+    for hotel, distance in hotel_catalog.within(latitude, longitude, radius_km, limit):
+        entry = {
+            "hotel_id": hotel.hotel_id,
+            "hotel_name": hotel.hotel_name,
+            "city": hotel.city,
+            "countrycode": hotel.country_code,
+            "latitude": hotel.latitude,
+            "longitude": hotel.longitude,
+            "main_photo_url": hotel.photo_url,
+            "review_score": hotel.rating,
+            "review_score_word": hotel.rating_description,
+            "review_nr": hotel.review_count,
+            "accommodation_type": hotel.accommodation_type,
+            "timezone": hotel.timezone,
+            "distance_km": distance,
+        }
+        offer = offers.get(hotel.hotel_id)
+        if offer is not None:
+            entry["min_total_price"] = offer.price
+            entry["currencycode"] = offer.currency
+            entry["is_free_cancellable"] = offer.free_cancellation
+            entry["price_summary"] = offer.price_summary.model_dump() if offer.price_summary else None
+        hotels.append(entry)
+
+    return json_response({"priced": priced, "hotels": hotels}, request)
+
+@app.get("/api/locations/autocomplete")
+async def autocomplete_locations(
+    request: Request,
+    q: str = Query(..., max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """Destination suggestions for a partly typed name, e.g. ``q=barc``.
+
+    Served from the in-memory place index: the local place list plus the
+    cities of catalog hotels, ranked by popularity and past searches.
+    """
+    suggestions = [
+        {
+            "name": place.name,
+            "label": place.label,
+            "country": place.country,
+            "country_code": place.country_code,
+            "latitude": place.latitude,
+            "longitude": place.longitude,
+        }
+        for place in place_index.suggest(q, limit)
+    ]
+    return json_response(
+        {"query": q, "suggestions": suggestions},
+        request,
+        headers={"Cache-Control": "public, max-age=60"},
+    )
+
+@app.get("/api/prices/history")
+async def price_history_summary(
+    by: Literal["hotel", "city"] = "hotel",
+    hotel_id: Optional[int] = None,
+    city: Optional[str] = None,
+    currency: Optional[str] = None,
+    arrival_date: Optional[str] = None,
+    since_days: Optional[float] = Query(None, gt=0),
+):
+    """Min/avg/max observed price and daily trend per hotel or city."""
+    def summarize():
+        table = load_history(
+            hotel_id=hotel_id,
+            city=city,
+            currency=currency,
+            arrival_date=arrival_date,
+            since_days=since_days,
+        )
+        return {"rows": table.num_rows, "groups": aggregate(table, by)}
+
+    try:
+        return await asyncio.to_thread(summarize)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Several workers need the app as an import string so each can load it
+    uvicorn.run("main:app" if BACKEND_WORKERS > 1 else app, host="0.0.0.0", port=8000, workers=BACKEND_WORKERS)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
+from datetime import date
 
 class HotelSearchParams(BaseModel):
     latitude: float
@@ -11,6 +12,25 @@ class HotelSearchParams(BaseModel):
     room_qty: int = 1
     currency_code: str = "USD"
 
+class PriceCalendarParams(BaseModel):
+    latitude: float
+    longitude: float
+    start_date: date
+    end_date: date
+    nights: int = Field(1, ge=1, le=30)
+    adults: int
+    children_age: Optional[str] = None
+    room_qty: int = 1
+    currency_code: str = "USD"
+
+class HotelFilterParams(BaseModel):
+    sort: Literal["recommended", "price", "price_desc", "rating", "distance"] = "distance"
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_review_score: Optional[float] = None
+    free_cancellation: Optional[bool] = None
+    accommodation_type: Optional[int] = None
+
 class Badge(BaseModel):
     id: str
     text: str
@@ -26,6 +46,17 @@ class PriceBreakdown(BaseModel):
     discounted_amount: Optional[Dict[str, Any]] = None
     strikethrough_amount: Optional[Dict[str, Any]] = None
 
+class PriceSummary(BaseModel):
+    """Flat price figures derived once from ``PriceBreakdown``."""
+    currency: str
+    base: float
+    taxes: float = 0.0
+    total: float
+    original: Optional[float] = None
+    discount_pct: Optional[float] = None
+    per_night: float
+    nights: int = 1
+
 class Hotel(BaseModel):
     hotel_id: int
     hotel_name: str
@@ -47,17 +78,27 @@ class Hotel(BaseModel):
     accommodation_type: Optional[int] = None
     timezone: Optional[str] = None
 
-class SearchResult(BaseModel):
-    result: List[Hotel]
-    filters: Optional[List[Dict[str, Any]]] = None
-    unfiltered_count: Optional[int] = None
-    count: Optional[int] = None
+class HotelOffer(BaseModel):
+    """Volatile part of an upstream hotel entry: price and availability."""
+    hotel_id: int
+    min_total_price: float
+    currencycode: str
+    is_free_cancellable: bool
+    composite_price_breakdown: Optional[PriceBreakdown] = None
 
-class HotelSearchResponse(BaseModel):
+class RawSearchResult(BaseModel):
+    result: List[Dict[str, Any]]
+
+class RawHotelSearchResponse(BaseModel):
+    """Search envelope with hotels left as raw dicts.
+
+    Each entry is validated as a ``HotelOffer``; the full ``Hotel`` model is
+    only validated for hotels missing from (or expired in) the catalog.
+    """
     status: bool
     message: str
     timestamp: Optional[int] = None
-    data: SearchResult
+    data: RawSearchResult
 
 class HotelResponse(BaseModel):
     hotel_id: int
@@ -76,8 +117,23 @@ class HotelResponse(BaseModel):
     free_cancellation: bool = Field(False, alias="is_free_cancellable")
     badges: List[Dict[str, str]] = []
     price_breakdown: Optional[Dict[str, Any]] = Field(None, alias="composite_price_breakdown")
+    price_summary: Optional[PriceSummary] = None
     accommodation_type: Optional[int] = None
     timezone: Optional[str] = None
 
     class Config:
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+class HotelResponseWithDistance(HotelResponse):
+    distance_km: Optional[float] = None
+
+class BatchSearchItem(HotelSearchParams):
+    id: Optional[str] = None
+    max_distance_km: float = 10.0
+    filters: HotelFilterParams = Field(default_factory=HotelFilterParams)
+
+class BatchSearchRequest(BaseModel):
+    searches: List[BatchSearchItem] = Field(..., min_length=1, max_length=50)
+    concurrency: int = Field(4, ge=1)
+    fields: Optional[str] = None
+    stream: bool = False
@@ -0,0 +1,216 @@
+import bisect
+import difflib
+import heapq
+import itertools
+import json
+import math
+import os
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from hotel_catalog import CatalogHotel, haversine_km
+
+PLACES_FILE = os.getenv("PLACES_FILE", os.path.join(os.path.dirname(__file__), "places.json"))
+# A search counts towards the nearest place within this distance
+SEARCH_MATCH_KM = 30.0
+# Grid cell edge in degrees for matching searches to places
+PLACE_CELL_DEG = 0.5
+# Ranking weights on log scales; a prefix of the name beats one of an alias
+# or of a later word, and an exact name or alias beats both
+HOTEL_WEIGHT = 0.5
+SEARCH_WEIGHT = 1.0
+NAME_START_BONUS = 1.0
+EXACT_BONUS = 3.0
+FUZZY_CUTOFF = 0.75
+# What an indexed term is the start of
+NAME, ALIAS, INNER = 2, 1, 0
+
+class Place(NamedTuple):
+    name: str
+    country: str
+    country_code: str
+    latitude: float
+    longitude: float
+    population: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.country}" if self.country else self.name
+
+def normalize(text: str) -> str:
+    """Case-, accent- and punctuation-insensitive form used for matching."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch if ch.isalnum() else " " for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
+
+class PlaceIndex:
+    """In-memory prefix index of destinations for autocomplete.
+
+    Places come from the local place list (``load``) and from the cities of
+    hotels in the catalog (``add_hotels``). Every name, alias and each word
+    inside them is kept in one sorted list, so a prefix is a ``bisect`` plus
+    a short scan. Matches are ranked by population, hotels seen there and
+    past searches (``record_search``); a query with no prefix match falls
+    back to close spellings. Counts are per process.
+    """
+
+    def __init__(self, cell_deg: float = PLACE_CELL_DEG):
+        self.cell_deg = cell_deg
+        self._places: List[Place] = []
+        self._ids: Dict[Tuple[str, str], int] = {}
+        # (term, place id, NAME / ALIAS if the term starts one, else INNER)
+        self._terms: List[Tuple[str, int, int]] = []
+        self._names: Dict[str, Set[int]] = defaultdict(set)
+        # Spelling fallback candidates by first letter, which typos rarely change
+        self._names_by_initial: Dict[str, List[str]] = defaultdict(list)
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._hotels: Counter = Counter()
+        self._searches: Counter = Counter()
+        self._hotel_ids: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg))
+
+    def _add_terms(self, place_id: int, name: str, kind: int) -> None:
+        term = normalize(name)
+        if not term or place_id in self._names.get(term, ()):
+            return
+        if term not in self._names:
+            self._names_by_initial[term[0]].append(term)
+        self._names[term].add(place_id)
+        words = term.split(" ")
+        for i in range(len(words)):
+            bisect.insort(self._terms, (" ".join(words[i:]), place_id, kind if i == 0 else INNER))
+
+    def _add(self, place: Place, aliases: Iterable[str] = ()) -> int:
+        key = (normalize(place.name), place.country_code.upper())
+        place_id = self._ids.get(key)
+        if place_id is None:
+            place_id = self._ids[key] = len(self._places)
+            self._places.append(place)
+            self._grid[self._cell(place.latitude, place.longitude)].append(place_id)
+        self._add_terms(place_id, place.name, NAME)
+        for alias in aliases:
+            self._add_terms(place_id, alias, ALIAS)
+        return place_id
+
+    def load(self, path: str = PLACES_FILE) -> None:
+        """Add the places of the local place list. Blocking."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            for entry in config.get("places", []):
+                place = Place(
+                    name=entry["name"],
+                    country=entry.get("country", ""),
+                    country_code=entry.get("country_code", "").upper(),
+                    latitude=entry["latitude"],
+                    longitude=entry["longitude"],
+                    population=entry.get("population", 0),
+                )
+                self._add(place, entry.get("aliases", ()))
+
+    def add_hotels(self, hotels: Iterable[CatalogHotel]) -> None:
+        """Count catalog hotels towards their city, adding unknown cities.
+
+        A new city is placed at the mean position of its hotels.
+        """
+        cities: Dict[Tuple[str, str], List[CatalogHotel]] = defaultdict(list)
+        with self._lock:
+            for hotel in hotels:
+                if hotel.city and hotel.hotel_id not in self._hotel_ids:
+                    self._hotel_ids.add(hotel.hotel_id)
+                    cities[(hotel.city, hotel.country_code.upper())].append(hotel)
+
+            for (city, country_code), city_hotels in cities.items():
+                place_id = self._ids.get((normalize(city), country_code))
+                if place_id is None:
+                    place_id = self._add(Place(
+                        name=city,
+                        country=country_code,
+                        country_code=country_code,
+                        latitude=sum(hotel.latitude for hotel in city_hotels) / len(city_hotels),
+                        longitude=sum(hotel.longitude for hotel in city_hotels) / len(city_hotels),
+                        population=0,
+                    ))
+                self._hotels[place_id] += len(city_hotels)
+
+    def _nearest_id(self, latitude: float, longitude: float, max_km: float) -> Optional[int]:
+        row, col = self._cell(latitude, longitude)
+        best, best_km = None, max_km
+        for cell in ((row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)):
+            for place_id in self._grid.get(cell, ()):
+                place = self._places[place_id]
+                distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+                if distance <= best_km:
+                    best, best_km = place_id, distance
+        return best
+
+    def record_search(self, latitude: float, longitude: float) -> None:
+        """Count a hotel search towards the nearest known place."""
+        with self._lock:
+            place_id = self._nearest_id(latitude, longitude, SEARCH_MATCH_KM)
+            if place_id is not None:
+                self._searches[place_id] += 1
+
+    def _score(self, place_id: int) -> float:
+        return (
+            math.log10(self._places[place_id].population + 1)
+            + HOTEL_WEIGHT * math.log1p(self._hotels[place_id])
+            + SEARCH_WEIGHT * math.log1p(self._searches[place_id])
+        )
+
+    def suggest(self, query: str, limit: int = 8) -> List[Place]:
+        """Best places for what the user has typed so far.
+
+        Text after a comma narrows the matches by country (``paris, fr``) and
+        is ignored if nothing matches it.
+        """
+        text, _, qualifier = query.partition(",")
+        text, qualifier = normalize(text), normalize(qualifier)
+        if not text:
+            return []
+
+        with self._lock:
+            bonus: Dict[int, float] = {}
+            start = bisect.bisect_left(self._terms, (text,))
+            for term, place_id, kind in itertools.islice(self._terms, start, None):
+                if not term.startswith(text):
+                    break
+                if kind != INNER and term == text:
+                    hit = EXACT_BONUS
+                else:
+                    hit = NAME_START_BONUS if kind == NAME else 0.0
+                bonus[place_id] = max(bonus.get(place_id, 0.0), hit)
+
+            if not bonus and len(text) >= 3:
+                candidates = self._names_by_initial.get(text[0], ())
+                for name in difflib.get_close_matches(text, candidates, n=limit, cutoff=FUZZY_CUTOFF):
+                    for place_id in self._names[name]:
+                        bonus[place_id] = 0.0
+
+            if qualifier:
+                narrowed = {
+                    place_id: hit for place_id, hit in bonus.items()
+                    if normalize(self._places[place_id].country).startswith(qualifier)
+                    or self._places[place_id].country_code.casefold() == qualifier
+                }
+                bonus = narrowed or bonus
+
+            best = heapq.nlargest(limit, bonus, key=lambda place_id: bonus[place_id] + self._score(place_id))
+            return [self._places[place_id] for place_id in best]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "places": len(self._places),
+                "terms": len(self._terms),
+                "searches": sum(self._searches.values()),
+            }
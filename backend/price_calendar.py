@@ -0,0 +1,61 @@
+from datetime import timedelta
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+from models import HotelFilterParams, HotelSearchParams, PriceCalendarParams
+from result_cache import ResultSet
+
+MAX_CALENDAR_DAYS = 62
+
+def calendar_searches(params: PriceCalendarParams) -> List[HotelSearchParams]:
+    """One search per arrival date in ``[start_date, end_date]`` for a stay of ``nights``."""
+    days = (params.end_date - params.start_date).days + 1
+    if days < 1:
+        raise ValueError("end_date must not be before start_date")
+    if days > MAX_CALENDAR_DAYS:
+        raise ValueError(f"Calendar range is limited to {MAX_CALENDAR_DAYS} days")
+
+    searches = []
+    for offset in range(days):
+        arrival = params.start_date + timedelta(days=offset)
+        searches.append(HotelSearchParams(
+            latitude=params.latitude,
+            longitude=params.longitude,
+            arrival_date=arrival.isoformat(),
+            departure_date=(arrival + timedelta(days=params.nights)).isoformat(),
+            adults=params.adults,
+            children_age=params.children_age,
+            room_qty=params.room_qty,
+            currency_code=params.currency_code,
+        ))
+    return searches
+
+def summarize_day(
+    search: HotelSearchParams,
+    result_set: ResultSet,
+    filters: HotelFilterParams,
+    max_distance_km: Optional[float],
+) -> Dict[str, Any]:
+    """Min/median price and the cheapest hotel for one arrival date."""
+    hotels = result_set.select(filters.model_copy(update={"sort": "price"}), max_distance_km=max_distance_km)
+    day = {
+        "arrival_date": search.arrival_date,
+        "departure_date": search.departure_date,
+        "status": 200,
+        "count": len(hotels),
+        "min_price": None,
+        "median_price": None,
+        "cheapest": None,
+    }
+    if hotels:
+        cheapest = hotels[0]
+        day["min_price"] = cheapest.price
+        day["median_price"] = round(median(hotel.price for hotel in hotels), 2)
+        day["cheapest"] = {
+            "hotel_id": cheapest.hotel_id,
+            "hotel_name": cheapest.hotel_name,
+            "price": cheapest.price,
+            "currency": cheapest.currency,
+            "distance_km": cheapest.distance_km,
+        }
+    return day
@@ -0,0 +1,318 @@
+import argparse
+import glob
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from price_math import parse_date
+
+PRICE_HISTORY_ENABLED = os.getenv("PRICE_HISTORY_ENABLED", "true").lower() == "true"
+PRICE_HISTORY_DIR = os.getenv(
+    "PRICE_HISTORY_DIR", os.path.join(os.path.dirname(__file__), "price_history")
+)
+# A part file is written when either limit is reached
+PRICE_HISTORY_FLUSH_ROWS = int(os.getenv("PRICE_HISTORY_FLUSH_ROWS", "20000"))
+PRICE_HISTORY_FLUSH_SECONDS = float(os.getenv("PRICE_HISTORY_FLUSH_SECONDS", "60"))
+# Rows kept in memory while the disk is slow; new rows are dropped (and
+# counted) beyond it
+PRICE_HISTORY_MAX_PENDING = int(os.getenv("PRICE_HISTORY_MAX_PENDING", "500000"))
+
+SCHEMA = pa.schema([
+    ("hotel_id", pa.int64()),
+    ("city", pa.dictionary(pa.int32(), pa.string())),
+    ("arrival_date", pa.date32()),
+    ("departure_date", pa.date32()),
+    ("currency", pa.dictionary(pa.int32(), pa.string())),
+    ("price", pa.float64()),
+    ("observed_at", pa.timestamp("s", tz="UTC")),
+])
+
+GROUP_KEYS = {"hotel": "hotel_id", "city": "city"}
+_SECONDS_PER_DAY = 86400.0
+
+class PriceHistoryWriter:
+    """Append-only writer of observed prices into Parquet part files.
+
+    ``record`` only appends to in-memory column lists under a lock, so it is
+    safe to call from the event loop. A daemon thread turns the buffer into
+    a new ``part-*.parquet`` file every ``flush_seconds`` or ``flush_rows``.
+    """
+
+    def __init__(
+        self,
+        directory: str = PRICE_HISTORY_DIR,
+        flush_rows: int = PRICE_HISTORY_FLUSH_ROWS,
+        flush_seconds: float = PRICE_HISTORY_FLUSH_SECONDS,
+        max_pending: int = PRICE_HISTORY_MAX_PENDING,
+    ):
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rows_rejected = 0
+        self.files_written = 0
+        self._columns = self._empty_columns()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, List[Any]]:
+        return {name: [] for name in SCHEMA.names}
+
+    def pending(self) -> int:
+        return len(self._columns["hotel_id"])
+
+    def record(
+        self,
+        hotel_ids: Iterable[int],
+        cities: Iterable[str],
+        currencies: Iterable[str],
+        prices: Iterable[float],
+        arrival_date: str,
+        departure_date: str,
+        observed_at: Optional[float] = None,
+    ) -> None:
+        """Buffer one search's prices; never blocks on I/O or raises on bad dates."""
+        hotel_ids = list(hotel_ids)
+        if not hotel_ids:
+            return
+        count = len(hotel_ids)
+        arrival = parse_date(arrival_date)
+        departure = parse_date(departure_date)
+        if arrival is None or departure is None:
+            print(f"Price history skipped, invalid dates: {arrival_date!r} - {departure_date!r}")
+            with self._lock:
+                self.rows_rejected += count
+            return
+        observed = datetime.fromtimestamp(observed_at or time.time(), tz=timezone.utc)
+        with self._lock:
+            if self.pending() + count > self.max_pending:
+                self.rows_dropped += count
+                return
+            columns = self._columns
+            columns["hotel_id"].extend(hotel_ids)
+            columns["city"].extend(cities)
+            columns["price"].extend(prices)
+            columns["arrival_date"].extend([arrival] * count)
+            columns["departure_date"].extend([departure] * count)
+            columns["currency"].extend(currencies)
+            columns["observed_at"].extend([observed] * count)
+            full = self.pending() >= self.flush_rows
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write buffered rows to a new part file. Blocking."""
+        with self._lock:
+            if not self.pending():
+                return
+            columns, self._columns = self._columns, self._empty_columns()
+        table = pa.Table.from_pydict(columns, schema=SCHEMA)
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet"
+        # Write under a temporary name so readers never see a partial file
+        tmp_path = os.path.join(self.directory, f".{name}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, os.path.join(self.directory, name))
+        self.rows_written += table.num_rows
+        self.files_written += 1
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Price history flush failed: {e}")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="price-history-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread and flush what is left. Blocking."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending(),
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "rows_rejected": self.rows_rejected,
+            "files_written": self.files_written,
+        }
+
+def load_history(
+    directory: str = PRICE_HISTORY_DIR,
+    hotel_id: Optional[int] = None,
+    city: Optional[str] = None,
+    currency: Optional[str] = None,
+    arrival_date: Optional[str] = None,
+    since_days: Optional[float] = None,
+) -> pa.Table:
+    """Read the rows matching the filters; predicates are pushed into Parquet."""
+    paths = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+    if not paths:
+        return SCHEMA.empty_table()
+
+    conditions = []
+    if hotel_id is not None:
+        conditions.append(ds.field("hotel_id") == hotel_id)
+    if city is not None:
+        conditions.append(ds.field("city") == city)
+    if currency is not None:
+        conditions.append(ds.field("currency") == currency)
+    if arrival_date is not None:
+        arrival = parse_date(arrival_date)
+        if arrival is None:
+            raise ValueError(f"Invalid arrival_date: {arrival_date!r}")
+        conditions.append(ds.field("arrival_date") == pa.scalar(arrival, pa.date32()))
+    if since_days is not None:
+        since = datetime.now(timezone.utc) - timedelta(days=since_days)
+        conditions.append(ds.field("observed_at") >= pa.scalar(since, pa.timestamp("s", tz="UTC")))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return ds.dataset(paths, schema=SCHEMA, format="parquet").to_table(filter=expression)
+
+def aggregate(table: pa.Table, by: str = "hotel") -> List[Dict[str, Any]]:
+    """Count/min/avg/max price and linear trend per ``by`` group and currency.
+
+    ``trend_per_day`` is the least-squares slope of price over observation
+    time, computed from grouped sums so the whole table is processed in a
+    single vectorized pass.
+    """
+    key = GROUP_KEYS[by]
+    if table.num_rows == 0:
+        return []
+
+    seconds = pc.cast(pc.cast(table["observed_at"], pa.timestamp("s")), pa.int64()).to_numpy()
+    # Days relative to the first observation keep the sums well conditioned
+    t = (seconds - seconds.min()) / _SECONDS_PER_DAY
+    price = table["price"].to_numpy()
+    work = pa.table({
+        key: table[key],
+        "currency": table["currency"],
+        "price": price,
+        "t": t,
+        "tp": t * price,
+        "tt": t * t,
+        "seconds": seconds,
+    })
+    grouped = work.group_by([key, "currency"]).aggregate([
+        ("price", "count"),
+        ("price", "min"),
+        ("price", "mean"),
+        ("price", "max"),
+        ("price", "sum"),
+        ("t", "sum"),
+        ("tp", "sum"),
+        ("tt", "sum"),
+        ("seconds", "min"),
+        ("seconds", "max"),
+    ])
+
+    n = grouped["price_count"].to_numpy().astype(np.float64)
+    sum_p = grouped["price_sum"].to_numpy()
+    sum_t = grouped["t_sum"].to_numpy()
+    sum_tp = grouped["tp_sum"].to_numpy()
+    sum_tt = grouped["tt_sum"].to_numpy()
+    denominator = n * sum_tt - sum_t * sum_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denominator > 1e-9, (n * sum_tp - sum_t * sum_p) / denominator, 0.0)
+
+    rows = []
+    columns = grouped.to_pydict()
+    for i in range(grouped.num_rows):
+        rows.append({
+            key: columns[key][i],
+            "currency": columns["currency"][i],
+            "count": columns["price_count"][i],
+            "min_price": round(columns["price_min"][i], 2),
+            "avg_price": round(columns["price_mean"][i], 2),
+            "max_price": round(columns["price_max"][i], 2),
+            "trend_per_day": round(float(slope[i]), 4),
+            "first_seen": datetime.fromtimestamp(columns["seconds_min"][i], tz=timezone.utc).isoformat(),
+            "last_seen": datetime.fromtimestamp(columns["seconds_max"][i], tz=timezone.utc).isoformat(),
+        })
+    rows.sort(key=lambda row: (row["currency"], row[key]))
+    return rows
+
+def compact(directory: str = PRICE_HISTORY_DIR) -> int:
+    """Merge all part files into one file; returns the number merged.
+
+    Run it from cron or the CLI while the API is idle; a reader that listed
+    the old parts just before they are removed would fail once.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+    if len(paths) < 2:
+        return 0
+    table = ds.dataset(paths, schema=SCHEMA, format="parquet").to_table()
+    name = f"compacted-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    pq.write_table(table, tmp_path, compression="zstd", row_group_size=1_000_000)
+    os.replace(tmp_path, os.path.join(directory, name))
+    for path in paths:
+        os.remove(path)
+    return len(paths)
+
+def _print_rows(rows: List[Dict[str, Any]], key: str, limit: int) -> None:
+    print(f"{key:>24} {'cur':>4} {'count':>8} {'min':>10} {'avg':>10} {'max':>10} {'trend/day':>10}")
+    for row in rows[:limit]:
+        print(
+            f"{str(row[key]):>24} {row['currency']:>4} {row['count']:>8} {row['min_price']:>10.2f} "
+            f"{row['avg_price']:>10.2f} {row['max_price']:>10.2f} {row['trend_per_day']:>10.4f}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query or compact the observed price history")
+    parser.add_argument("--dir", default=PRICE_HISTORY_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summary", help="min/avg/max/trend per hotel or city")
+    summary.add_argument("--by", choices=sorted(GROUP_KEYS), default="city")
+    summary.add_argument("--hotel-id", type=int)
+    summary.add_argument("--city")
+    summary.add_argument("--currency")
+    summary.add_argument("--arrival-date")
+    summary.add_argument("--since-days", type=float)
+    summary.add_argument("--limit", type=int, default=50)
+
+    commands.add_parser("compact", help="merge part files into one")
+
+    args = parser.parse_args()
+    if args.command == "compact":
+        print(f"Merged {compact(args.dir)} files")
+        return
+
+    started = time.perf_counter()
+    table = load_history(args.dir, args.hotel_id, args.city, args.currency, args.arrival_date, args.since_days)
+    rows = aggregate(table, args.by)
+    elapsed = time.perf_counter() - started
+    _print_rows(rows, GROUP_KEYS[args.by], args.limit)
+    print(f"{table.num_rows} rows, {len(rows)} groups in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Price arithmetic shared by the backend and the chatbot.
+
+Imports nothing from the backend, so the chatbot can load this file too
+(``chatbot/services/backend_modules.py``); ``pricing.summarize_price``
+wraps it into the ``PriceSummary`` model.
+"""
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+def _amount(entry: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Numeric value of a Booking.com amount dict (``{"value": ..., ...}``)."""
+    if not entry:
+        return None
+    value = entry.get("value")
+    if value is None:
+        value = entry.get("amount_unformatted")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def parse_date(value: str) -> Optional[date]:
+    """``YYYY-MM-DD`` date, also without zero padding (``2026-11-5``); None if invalid."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+def stay_nights(arrival_date: str, departure_date: str) -> int:
+    """Number of nights between two ISO dates, never less than one."""
+    arrival, departure = parse_date(arrival_date), parse_date(departure_date)
+    if arrival is None or departure is None:
+        return 1
+    return max((departure - arrival).days, 1)
+
+def _part(breakdown: Any, name: str) -> Optional[Dict[str, Any]]:
+    # A ``PriceBreakdown`` model or its raw dict form
+    if isinstance(breakdown, dict):
+        return breakdown.get(name)
+    return getattr(breakdown, name, None)
+
+def price_figures(breakdown: Any, price: float, currency: str, nights: int) -> Dict[str, Any]:
+    """Flatten ``composite_price_breakdown`` into base/taxes/total/discount figures.
+
+    Missing parts fall back to ``price`` (the upstream ``min_total_price``)
+    so every hotel gets a complete set.
+    """
+    base = taxes = total = original = gross = None
+    if breakdown is not None:
+        base = _amount(_part(breakdown, "net_amount"))
+        taxes = _amount(_part(breakdown, "excluded_amount"))
+        total = _amount(_part(breakdown, "all_inclusive_amount"))
+        original = _amount(_part(breakdown, "strikethrough_amount"))
+        gross = _amount(_part(breakdown, "gross_amount"))
+
+    if base is None:
+        base = price
+    if taxes is None:
+        taxes = 0.0
+    if total is None:
+        total = base + taxes
+
+    discount_pct = None
+    reference = gross if gross is not None else base
+    if original and original > reference:
+        discount_pct = round((original - reference) / original * 100, 1)
+    else:
+        original = None
+
+    return {
+        "currency": currency,
+        "base": round(base, 2),
+        "taxes": round(taxes, 2),
+        "total": round(total, 2),
+        "original": round(original, 2) if original is not None else None,
+        "discount_pct": discount_pct,
+        "per_night": round(total / max(nights, 1), 2),
+        "nights": nights,
+    }
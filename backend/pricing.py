@@ -0,0 +1,12 @@
+from typing import Optional
+
+from models import PriceBreakdown, PriceSummary
+from price_math import price_figures
+
+def summarize_price(breakdown: Optional[PriceBreakdown], price: float, currency: str, nights: int) -> PriceSummary:
+    """Flatten ``composite_price_breakdown`` into a ``PriceSummary``.
+
+    Missing parts fall back to ``price`` (the upstream ``min_total_price``)
+    so every hotel gets a complete summary.
+    """
+    return PriceSummary(**price_figures(breakdown, price, currency, nights))
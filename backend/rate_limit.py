@@ -0,0 +1,192 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+# The RapidAPI key's quota. The backend and the chatbot each run a limiter
+# against the same key, and each takes UPSTREAM_QUOTA_SHARE of it (half by
+# default); set the share to 1 when only one of them calls upstream. The
+# backend's share is split again between its BACKEND_WORKERS processes,
+# which each keep their own bucket.
+UPSTREAM_RATE_PER_SEC = float(os.getenv("UPSTREAM_RATE_PER_SEC", "5"))
+UPSTREAM_BURST = int(os.getenv("UPSTREAM_BURST", "10"))
+UPSTREAM_QUOTA_SHARE = float(os.getenv("UPSTREAM_QUOTA_SHARE", "0.5"))
+BACKEND_WORKERS = int(os.getenv("BACKEND_WORKERS", "1"))
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+UPSTREAM_MIN_CONCURRENCY = int(os.getenv("UPSTREAM_MIN_CONCURRENCY", "1"))
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "16"))
+
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 20.0  # seconds
+
+THROTTLE_STATUSES = {429, 503}
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse ``Retry-After`` given either as seconds or as an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket implemented as a reservation schedule (GCRA).
+
+    Each caller reserves the next free slot and sleeps until it, so no lock
+    is held across an ``await`` and the bucket works from any event loop.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * max(burst - 1, 0)
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            wait = max(tat - self.tolerance - now, 0.0)
+            self._tat = tat + self.interval
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every token for ``seconds`` (used for ``Retry-After``)."""
+        with self._lock:
+            self._tat = max(self._tat, time.monotonic() + seconds + self.tolerance)
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit: grows by ~1 per window of successes, halves on throttling.
+
+    Waiters park on futures and are woken in arrival order as soon as a call
+    ends or the limit grows. Event-loop only, no locking.
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    async def enter(self) -> None:
+        if self.in_flight < int(self.limit) and not self.waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled after the slot was handed over: pass it on
+                self.exit()
+            else:
+                self.waiters.remove(waiter)
+            raise
+
+    def _wake(self) -> None:
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def exit(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self) -> None:
+        self.limit = min(self.limit + 1.0 / self.limit, float(self.max_limit))
+        self._wake()
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.limit / 2.0, float(self.min_limit))
+
+class UpstreamLimiter:
+    """Rate limit, adaptive concurrency and jittered retries for upstream calls."""
+
+    def __init__(
+        self,
+        rate: float = UPSTREAM_RATE_PER_SEC * UPSTREAM_QUOTA_SHARE / BACKEND_WORKERS,
+        burst: int = max(int(UPSTREAM_BURST * UPSTREAM_QUOTA_SHARE / BACKEND_WORKERS), 1),
+        max_retries: int = UPSTREAM_MAX_RETRIES,
+        min_concurrency: int = UPSTREAM_MIN_CONCURRENCY,
+        max_concurrency: int = UPSTREAM_MAX_CONCURRENCY,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(max(burst // 2, 1), min_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.metrics: Dict[str, float] = {
+            "requests": 0,
+            "throttled": 0,
+            "retries": 0,
+            "gave_up": 0,
+            "rate_wait_seconds": 0.0,
+            "backoff_seconds": 0.0,
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter so synchronized clients spread out
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    async def call(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Run ``send`` under the limiter, retrying throttled responses.
+
+        Returns the last response; if every attempt was throttled the caller
+        sees that 429/503 through ``raise_for_status`` as before.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.metrics["rate_wait_seconds"] += await self.bucket.acquire()
+            await self.concurrency.enter()
+            try:
+                self.metrics["requests"] += 1
+                response = await send()
+            finally:
+                self.concurrency.exit()
+
+            if response.status_code not in THROTTLE_STATUSES:
+                self.concurrency.on_success()
+                return response
+
+            self.metrics["throttled"] += 1
+            self.concurrency.on_throttle()
+            delay = retry_after_seconds(response)
+            if delay is not None:
+                self.bucket.pause(delay)
+            if attempt == self.max_retries:
+                self.metrics["gave_up"] += 1
+                return response
+
+            delay = delay if delay is not None else self._backoff(attempt)
+            self.metrics["retries"] += 1
+            self.metrics["backoff_seconds"] += delay
+            await asyncio.sleep(delay)
+        return response
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "rate_per_sec": round(1.0 / self.bucket.interval, 2),
+        }
@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+
+import brotli
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+# Payloads smaller than this are sent uncompressed; the framing overhead
+# outweighs the savings.
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+def resolve_fields(model: Type[BaseModel], fields: Optional[str]) -> Optional[Set[str]]:
+    """Map a comma-separated ``fields=`` value onto model attribute names.
+
+    Clients ask for the keys they see in the JSON payload (the aliases, e.g.
+    ``min_total_price``); attribute names are accepted as well.
+    """
+    if not fields:
+        return None
+
+    lookup = {}
+    for name, field in model.model_fields.items():
+        lookup[name] = name
+        if field.alias:
+            lookup[field.alias] = name
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in lookup]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return {lookup[f] for f in requested}
+
+def project(items: Iterable[BaseModel], include: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """Dump models using their public (aliased) keys, keeping only ``include``."""
+    return [item.model_dump(by_alias=True, include=include) for item in items]
+
+def _pick_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+    if "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def representation_etag(request: Request, version: str) -> str:
+    """Strong ETag of a response built from content ``version``.
+
+    The body is fully determined by the content version, the query string
+    and the encoding chosen for the client, so those are what is hashed.
+    """
+    encoding = _pick_encoding(request.headers.get("accept-encoding", "")) or "identity"
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(orjson.dumps([version, query, encoding]), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check; the comparison is weak, as RFC 9110 requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def not_modified(headers: Optional[Dict[str, str]] = None) -> Response:
+    """Bodiless 304 carrying the headers a 200 would have had."""
+    response_headers = {"Vary": "Accept-Encoding"}
+    if headers:
+        response_headers.update(headers)
+    return Response(status_code=304, headers=response_headers)
+
+def json_response(content: Any, request: Request, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize ``content`` with orjson and compress it if the client allows."""
+    body = orjson.dumps(content)
+    response_headers = {"Vary": "Accept-Encoding"}
+    if headers:
+        response_headers.update(headers)
+
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = _pick_encoding(request.headers.get("accept-encoding", ""))
+        if encoding == "br":
+            body = brotli.compress(body, quality=BROTLI_QUALITY)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=response_headers)
@@ -0,0 +1,269 @@
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, NamedTuple, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from hotel_catalog import CatalogHotel, HotelCatalog
+from models import HotelFilterParams, HotelResponseWithDistance, HotelSearchParams, PriceSummary
+
+if TYPE_CHECKING:
+    from shared_cache import SharedResultStore
+
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 300  # seconds a result set is served as fresh
+RESULT_STALE_TTL = 6 * 3600  # seconds it is kept as a fallback when upstream fails
+
+# Distance beyond which the "recommended" ranking stops rewarding proximity
+RECOMMENDED_DISTANCE_CAP_KM = 20.0
+
+class Offer(NamedTuple):
+    """Price and availability of one hotel for one search.
+
+    Static attributes are not copied: ``hotel`` is the catalog record shared
+    by every cached search that returned the hotel.
+    """
+    hotel: CatalogHotel
+    price: float
+    currency: str
+    free_cancellation: bool
+    price_summary: Optional[PriceSummary]
+    price_breakdown: Optional[Dict[str, Any]]
+    distance_km: Optional[float]
+
+    @property
+    def hotel_id(self) -> int:
+        return self.hotel.hotel_id
+
+    def to_response(self) -> HotelResponseWithDistance:
+        """Join with the catalog record into the public response model."""
+        hotel = self.hotel
+        # Both halves were validated when the offer was built
+        return HotelResponseWithDistance.model_construct(
+            hotel_id=hotel.hotel_id,
+            hotel_name=hotel.hotel_name,
+            price=self.price,
+            currency=self.currency,
+            rating=hotel.rating,
+            rating_description=hotel.rating_description,
+            review_count=hotel.review_count,
+            city=hotel.city,
+            country_code=hotel.country_code,
+            latitude=hotel.latitude,
+            longitude=hotel.longitude,
+            photo_url=hotel.photo_url,
+            booking_url="",
+            free_cancellation=self.free_cancellation,
+            badges=list(hotel.badges),
+            price_breakdown=self.price_breakdown,
+            price_summary=self.price_summary,
+            accommodation_type=hotel.accommodation_type,
+            timezone=hotel.timezone,
+            distance_km=self.distance_km,
+        )
+
+class ResultSet:
+    """Offers returned by one upstream search, with sort keys computed once.
+
+    Sorting and filtering only read the flat key lists built here, so any
+    combination of ``HotelFilterParams`` can be served from the same cached
+    set without another upstream call. Offers are joined with the catalog
+    only for the hotels actually returned.
+    """
+
+    def __init__(self, offers: List[Offer], created_at: Optional[float] = None):
+        self.offers = offers
+        self.created_at = created_at or time.time()
+        self.prices = [offer.price for offer in offers]
+        self.ratings = [offer.hotel.rating if offer.hotel.rating is not None else -1.0 for offer in offers]
+        self.distances = [offer.distance_km if offer.distance_km is not None else float("inf") for offer in offers]
+        self.free_cancellation = [offer.free_cancellation for offer in offers]
+        self.accommodation_types = [offer.hotel.accommodation_type for offer in offers]
+        self.version = self._fingerprint()
+        self._orders: Dict[str, List[int]] = {}
+
+    def dumps(self) -> bytes:
+        """Serialize for the cross-process ``SharedResultStore``."""
+        return orjson.dumps({
+            "created_at": self.created_at,
+            "offers": [
+                [
+                    list(offer.hotel),
+                    offer.price,
+                    offer.currency,
+                    offer.free_cancellation,
+                    offer.price_summary.model_dump() if offer.price_summary else None,
+                    offer.price_breakdown,
+                    offer.distance_km,
+                ]
+                for offer in self.offers
+            ],
+        })
+
+    @classmethod
+    def loads(cls, data: bytes, catalog: Optional[HotelCatalog] = None) -> "ResultSet":
+        """Inverse of ``dumps``.
+
+        Hotels come from the payload as written, so every worker loads the
+        same set and the same ``version``. A ``catalog`` record is reused
+        only when it is identical apart from ``updated_at``; the catalog
+        learns hotels it lacks or holds an older record of.
+        """
+        payload = orjson.loads(data)
+        offers = []
+        new_hotels = []
+        for hotel_row, price, currency, free, summary, breakdown, distance in payload["offers"]:
+            hotel_row[12] = tuple(hotel_row[12])
+            hotel = CatalogHotel(*hotel_row)
+            known = catalog.get(hotel.hotel_id) if catalog is not None else None
+            if known is not None and known[:-1] == hotel[:-1]:
+                hotel = known
+            elif known is None or known.updated_at < hotel.updated_at:
+                new_hotels.append(hotel)
+            offers.append(Offer(
+                hotel=hotel,
+                price=price,
+                currency=currency,
+                free_cancellation=free,
+                price_summary=PriceSummary.model_construct(**summary) if summary else None,
+                price_breakdown=breakdown,
+                distance_km=distance,
+            ))
+        if catalog is not None and new_hotels:
+            catalog.remember(new_hotels)
+        return cls(offers, created_at=payload["created_at"])
+
+    def _fingerprint(self) -> str:
+        # Everything a response is built from, so equal versions mean equal
+        # payloads (the search ETag relies on it); only the catalog's
+        # updated_at is left out
+        rows = [
+            (offer.hotel[:-1], offer.price, offer.currency, offer.free_cancellation, offer.price_breakdown, offer.distance_km)
+            for offer in self.offers
+        ]
+        return hashlib.blake2b(orjson.dumps(rows), digest_size=8).hexdigest()
+
+    def _recommended_scores(self) -> List[float]:
+        max_price = max(self.prices, default=0.0) or 1.0
+        scores = []
+        for price, rating, distance, free in zip(self.prices, self.ratings, self.distances, self.free_cancellation):
+            proximity = 1.0 - min(distance, RECOMMENDED_DISTANCE_CAP_KM) / RECOMMENDED_DISTANCE_CAP_KM
+            scores.append(
+                0.6 * max(rating, 0.0) / 10.0
+                + 0.25 * (1.0 - price / max_price)
+                + 0.15 * proximity
+                + (0.05 if free else 0.0)
+            )
+        return scores
+
+    def order(self, sort: str) -> List[int]:
+        """Indices of ``offers`` in the requested order, memoized per sort."""
+        order = self._orders.get(sort)
+        if order is not None:
+            return order
+
+        indices = range(len(self.offers))
+        if sort == "price":
+            order = sorted(indices, key=self.prices.__getitem__)
+        elif sort == "price_desc":
+            order = sorted(indices, key=self.prices.__getitem__, reverse=True)
+        elif sort == "rating":
+            order = sorted(indices, key=lambda i: (-self.ratings[i], self.distances[i]))
+        elif sort == "recommended":
+            scores = self._recommended_scores()
+            order = sorted(indices, key=scores.__getitem__, reverse=True)
+        else:
+            order = sorted(indices, key=self.distances.__getitem__)
+
+        self._orders[sort] = order
+        return order
+
+    def select(self, filters: HotelFilterParams, max_distance_km: Optional[float] = None) -> List[HotelResponseWithDistance]:
+        """Return the hotels matching ``filters`` in ``filters.sort`` order."""
+        checks = []
+        if max_distance_km is not None:
+            checks.append(lambda i: self.distances[i] <= max_distance_km)
+        if filters.min_price is not None:
+            checks.append(lambda i: self.prices[i] >= filters.min_price)
+        if filters.max_price is not None:
+            checks.append(lambda i: self.prices[i] <= filters.max_price)
+        if filters.min_review_score is not None:
+            checks.append(lambda i: self.ratings[i] >= filters.min_review_score)
+        if filters.free_cancellation is not None:
+            checks.append(lambda i: self.free_cancellation[i] == filters.free_cancellation)
+        if filters.accommodation_type is not None:
+            checks.append(lambda i: self.accommodation_types[i] == filters.accommodation_type)
+
+        offers = self.offers
+        return [offers[i].to_response() for i in self.order(filters.sort) if all(check(i) for check in checks)]
+
+class ResultCache:
+    """In-process cache of ``ResultSet`` objects keyed by search params.
+
+    Entries are fresh for ``ttl`` seconds and then kept, stale, until
+    ``stale_ttl`` so the last good result can be served while upstream is
+    unavailable or being refreshed. With a ``shared`` store (multi-worker
+    mode) a local miss, or a local entry that has gone stale, is looked up
+    in the store so results fetched by any worker are reused by all.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = RESULT_CACHE_SIZE,
+        ttl: float = RESULT_CACHE_TTL,
+        stale_ttl: float = RESULT_STALE_TTL,
+        shared: Optional["SharedResultStore"] = None,
+    ):
+        self.ttl = ttl
+        self.shared = shared
+        self._entries = TTLCache(maxsize=maxsize, ttl=max(stale_ttl, ttl))
+
+    @staticmethod
+    def key(params: HotelSearchParams) -> Hashable:
+        return (
+            round(params.latitude, 5),
+            round(params.longitude, 5),
+            params.arrival_date,
+            params.departure_date,
+            params.adults,
+            params.children_age or "",
+            params.room_qty,
+            params.currency_code,
+        )
+
+    def age(self, result_set: ResultSet) -> float:
+        return time.time() - result_set.created_at
+
+    def is_fresh(self, result_set: ResultSet) -> bool:
+        return self.age(result_set) < self.ttl
+
+    async def _lookup(self, params: HotelSearchParams) -> Optional[ResultSet]:
+        key = self.key(params)
+        result_set = self._entries.get(key)
+        if self.shared is not None and (result_set is None or not self.is_fresh(result_set)):
+            newer = await self.shared.aget(key, newer_than=result_set.created_at if result_set is not None else 0.0)
+            if newer is not None:
+                self._entries[key] = result_set = newer
+        return result_set
+
+    async def get(self, params: HotelSearchParams) -> Optional[ResultSet]:
+        """Fresh entry for ``params``, if any."""
+        result_set = await self._lookup(params)
+        if result_set is not None and self.is_fresh(result_set):
+            return result_set
+        return None
+
+    async def get_stale(self, params: HotelSearchParams) -> Optional[ResultSet]:
+        """Entry for ``params`` regardless of freshness."""
+        return await self._lookup(params)
+
+    def set_local(self, params: HotelSearchParams, result_set: ResultSet) -> None:
+        """Cache in this process only (``result_set`` came from the shared store)."""
+        self._entries[self.key(params)] = result_set
+
+    async def set(self, params: HotelSearchParams, result_set: ResultSet) -> None:
+        key = self.key(params)
+        self._entries[key] = result_set
+        if self.shared is not None:
+            await self.shared.aput(key, result_set)
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Optional
+
+import orjson
+
+from hotel_catalog import HotelCatalog
+from rate_limit import BACKEND_WORKERS
+from result_cache import RESULT_STALE_TTL, ResultSet
+
+# Shared by default whenever more than one worker serves the API
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", str(BACKEND_WORKERS > 1)).lower() == "true"
+SHARED_CACHE_PATH = os.getenv(
+    "SHARED_CACHE_PATH", os.path.join(os.path.dirname(__file__), "shared_cache.db")
+)
+# How long one worker may hold a search before others stop waiting for it
+SHARED_LEASE_SECONDS = float(os.getenv("SHARED_LEASE_SECONDS", "30"))
+SHARED_POLL_INTERVAL = 0.05  # seconds
+_PURGE_EVERY = 200  # writes
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS result_sets (
+        key TEXT PRIMARY KEY,
+        created_at REAL NOT NULL,
+        payload BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leases (
+        key TEXT PRIMARY KEY,
+        expires_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS roles (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+)
+
+class SharedResultStore:
+    """Result sets shared by every worker process through one SQLite file.
+
+    The file runs in WAL mode, so readers never wait for the writer and a
+    lookup is a single indexed read. ``claim``/``release`` hold a short lease
+    per search key so that only one worker queries upstream for a given
+    search while the others wait for its result; ``hold``/``drop`` keep a
+    longer, renewable role (the cache warmer) on one worker.
+
+    The methods block (up to the 5 s busy timeout under write contention);
+    async code uses the ``a``-prefixed variants, which run them on the
+    store's own thread instead of the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str = SHARED_CACHE_PATH,
+        catalog: Optional[HotelCatalog] = None,
+        stale_ttl: float = RESULT_STALE_TTL,
+        lease_seconds: float = SHARED_LEASE_SECONDS,
+    ):
+        self.path = path
+        self.catalog = catalog
+        self.stale_ttl = stale_ttl
+        self.lease_seconds = lease_seconds
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # One thread: the connection is used under a lock anyway
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Opened lazily so each worker process gets its own connection
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                db.execute(statement)
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    async def _call(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    async def aget(self, key: Hashable, newer_than: float = 0.0) -> Optional[ResultSet]:
+        return await self._call(self.get, key, newer_than=newer_than)
+
+    async def aput(self, key: Hashable, result_set: ResultSet) -> None:
+        await self._call(self.put, key, result_set)
+
+    async def aclaim(self, key: Hashable) -> bool:
+        return await self._call(self.claim, key)
+
+    async def arelease(self, key: Hashable) -> None:
+        await self._call(self.release, key)
+
+    async def ahold(self, name: str, owner: str, seconds: float) -> bool:
+        return await self._call(self.hold, name, owner, seconds)
+
+    async def adrop(self, name: str, owner: str) -> None:
+        await self._call(self.drop, name, owner)
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return orjson.dumps(key).decode()
+
+    def get(self, key: Hashable, newer_than: float = 0.0) -> Optional[ResultSet]:
+        """Stored result set for ``key`` created after ``newer_than``, if any."""
+        newer_than = max(newer_than, time.time() - self.stale_ttl)
+        with self._lock:
+            row = self.db.execute(
+                "SELECT payload FROM result_sets WHERE key = ? AND created_at > ?",
+                (self._key(key), newer_than),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ResultSet.loads(row[0], self.catalog)
+
+    def put(self, key: Hashable, result_set: ResultSet) -> None:
+        payload = result_set.dumps()
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO result_sets (key, created_at, payload) VALUES (?, ?, ?)",
+                (self._key(key), result_set.created_at, payload),
+            )
+            self._writes += 1
+            if self._writes % _PURGE_EVERY == 0:
+                now = time.time()
+                self.db.execute("DELETE FROM result_sets WHERE created_at < ?", (now - self.stale_ttl,))
+                self.db.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+
+    def claim(self, key: Hashable) -> bool:
+        """Take the search lease for ``key``; False while another worker holds it."""
+        now = time.time()
+        with self._lock:
+            cursor = self.db.execute(
+                "INSERT INTO leases (key, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET expires_at = excluded.expires_at WHERE leases.expires_at < ?",
+                (self._key(key), now + self.lease_seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            self.db.execute("DELETE FROM leases WHERE key = ?", (self._key(key),))
+
+    def hold(self, name: str, owner: str, seconds: float) -> bool:
+        """Take or renew role ``name`` for ``owner``; False while another owner holds it."""
+        now = time.time()
+        with self._lock:
+            cursor = self.db.execute(
+                "INSERT INTO roles (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE roles.owner = excluded.owner OR roles.expires_at < ?",
+                (name, owner, now + seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def drop(self, name: str, owner: str) -> None:
+        with self._lock:
+            self.db.execute("DELETE FROM roles WHERE name = ? AND owner = ?", (name, owner))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"path": self.path, "hits": self.hits, "misses": self.misses, "writes": self._writes}
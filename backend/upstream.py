@@ -0,0 +1,90 @@
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from models import HotelSearchParams
+from rate_limit import UpstreamLimiter
+from circuit_breaker import CircuitBreaker
+
+RAPIDAPI_HOST = "booking-com15.p.rapidapi.com"
+# Overridable to point at a local stand-in (benchmarks, staging)
+RAPIDAPI_BASE_URL = os.getenv("RAPIDAPI_BASE_URL", f"https://{RAPIDAPI_HOST}")
+SEARCH_BY_COORDINATES_URL = f"{RAPIDAPI_BASE_URL}/api/v1/hotels/searchHotelsByCoordinates"
+
+UPSTREAM_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "20"))
+
+class RapidAPIClient:
+    """Keep-alive client for the Booking.com RapidAPI, shared by all requests.
+
+    Every call goes through ``limiter`` so the quota is shared by plain,
+    batch and calendar searches alike, and through ``breaker`` so a failing
+    or slow upstream is skipped fast (``CircuitOpenError``) instead of
+    waiting out the timeout on every request.
+    """
+
+    def __init__(self, api_key: Optional[str], limiter: Optional[UpstreamLimiter] = None, breaker: Optional[CircuitBreaker] = None):
+        self.api_key = api_key
+        self.limiter = limiter or UpstreamLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=UPSTREAM_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=UPSTREAM_MAX_CONNECTIONS,
+                    max_keepalive_connections=UPSTREAM_MAX_CONNECTIONS,
+                ),
+                headers={
+                    "X-RapidAPI-Key": self.api_key or "",
+                    "X-RapidAPI-Host": RAPIDAPI_HOST,
+                },
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def search_hotels_by_coordinates(self, params: HotelSearchParams) -> Dict[str, Any]:
+        query_params = {
+            "latitude": params.latitude,
+            "longitude": params.longitude,
+            "arrival_date": params.arrival_date,
+            "departure_date": params.departure_date,
+            "adults": params.adults,
+            "children_age": params.children_age if params.children_age else "",
+            "room_qty": params.room_qty,
+            "units": "metric",
+            "page_number": "1",
+            "temperature_unit": "c",
+            "languagecode": "en-us",
+            "currency_code": params.currency_code or "INR",
+        }
+        self.breaker.check()
+        latency = 0.0
+
+        async def send() -> httpx.Response:
+            # Time only the HTTP exchange, not limiter waits or backoff
+            nonlocal latency
+            started = time.monotonic()
+            try:
+                return await self.client.get(SEARCH_BY_COORDINATES_URL, params=query_params)
+            finally:
+                latency = time.monotonic() - started
+
+        response = None
+        try:
+            response = await self.limiter.call(send)
+        finally:
+            # Transport errors and cancellation count as failures
+            failed = response is None or response.status_code >= 500 or response.status_code == 429
+            self.breaker.record(failed, latency)
+        response.raise_for_status()
+        return response.json()
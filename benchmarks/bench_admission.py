@@ -0,0 +1,148 @@
+"""/chat under overload, with and without admission control.
+
+The real app from ``chatbot/main.py`` is driven in process through
+``httpx.ASGITransport``. The agent runs on the offline fakes; its model is
+a ``ScriptedChatModel`` behind a shared quota of LLM_CAPACITY concurrent
+calls of LLM_LATENCY seconds each, which stands in for the Gemini quota.
+Every turn makes two model calls, so the service handles about
+LLM_CAPACITY / (2 * LLM_LATENCY) turns per second.
+
+Requests arrive open-loop at OFFERED x that capacity for DURATION seconds,
+each from a new session. "off" uses limits so high that nothing is ever
+queued or shed; "on" uses the defaults of services/admission.py scaled to
+this capacity. Reported: answered turns and their latency, and shed turns
+and how fast they were turned away.
+
+Finally three messages of one session are sent at once: they must be
+answered in order, and a fourth beyond CHAT_SESSION_QUEUE gets a 429.
+
+    python benchmarks/bench_admission.py
+"""
+import asyncio
+import contextlib
+import functools
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("TRACE_EXPORT", "off")
+os.environ.setdefault("GEMINI_API_KEY", "bench")
+os.environ.setdefault("RAPIDAPI_KEY", "bench")
+os.environ["SESSION_STORE"] = "memory"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+import httpx
+
+from agents import hotel_booking_agent
+from services import admission
+from services.fakes import ScriptedChatModel
+
+LLM_CAPACITY = 8  # concurrent model calls
+LLM_LATENCY = 0.5  # seconds per model call
+OFFERED = 1.5  # offered load as a multiple of capacity
+DURATION = 10.0  # seconds of arrivals
+CAPACITY = LLM_CAPACITY / (2 * LLM_LATENCY)  # turns per second
+
+REPLIES = [
+    "Thought: Check the date.\nAction: date_tool\nAction Input: none",
+    "Thought: Done.\nFinal Answer: Where would you like to stay?",
+]
+
+class QuotaChatModel(ScriptedChatModel):
+    """Scripted model whose calls queue for a shared quota, like a rate-limited API."""
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        async with QUOTA[0]:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+QUOTA = []
+
+def fake_agent_init(original):
+    def init(self, api_key, llm=None, hotel_service=None, geo_service=None):
+        transcripts = {message: REPLIES for message in ("Hello", "First", "Second", "Third", "Fourth")}
+        original(self, api_key, llm=QuotaChatModel(transcripts=transcripts, latency=LLM_LATENCY))
+    return init
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)] if values else float("nan")
+
+async def overload(app):
+    results = []
+
+    async def one(client):
+        started = time.perf_counter()
+        response = await client.post("/chat", json={"message": "Hello"})
+        results.append((response.status_code, time.perf_counter() - started))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://chat", timeout=None) as client:
+        tasks = []
+        interval = 1.0 / (CAPACITY * OFFERED)
+        started = time.perf_counter()
+        while time.perf_counter() - started < DURATION:
+            tasks.append(asyncio.create_task(one(client)))
+            await asyncio.sleep(interval)
+        await asyncio.gather(*tasks)
+        metrics = (await client.get("/metrics")).json()["admission"]
+    return results, metrics
+
+async def ordering(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://chat", timeout=None) as client:
+        finished = []
+
+        async def send(message):
+            response = await client.post("/chat", json={"message": message, "session_id": "ordered"})
+            finished.append((message, response.status_code))
+
+        tasks = []
+        for message in ("First", "Second", "Third", "Fourth"):
+            tasks.append(asyncio.create_task(send(message)))
+            await asyncio.sleep(0.01)  # arrival order
+        await asyncio.gather(*tasks)
+    return finished
+
+async def main_async():
+    original_controller = admission.AdmissionController
+    hotel_booking_agent.HotelBookingAgent.__init__ = fake_agent_init(hotel_booking_agent.HotelBookingAgent.__init__)
+    print(
+        f"capacity ~{CAPACITY:.0f} turns/s ({LLM_CAPACITY} concurrent LLM calls x {LLM_LATENCY}s, 2 per turn), "
+        f"offered {CAPACITY * OFFERED:.0f} turns/s for {DURATION:.0f}s"
+    )
+    controllers = {
+        "off": functools.partial(original_controller, max_concurrency=10**6, max_queue=10**6, queue_timeout=3600),
+        "on": functools.partial(
+            original_controller, max_concurrency=LLM_CAPACITY, max_queue=2 * LLM_CAPACITY, queue_timeout=3.0
+        ),
+    }
+    for label, controller in controllers.items():
+        QUOTA[:] = [asyncio.Semaphore(LLM_CAPACITY)]
+        admission.AdmissionController = controller
+        import main
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, metrics = await overload(main.create_app())
+        ok = [elapsed for status, elapsed in results if status == 200]
+        shed = [elapsed for status, elapsed in results if status in (429, 503)]
+        print(
+            f"  admission {label:<3}: {len(ok)}/{len(results)} answered, p50 {percentile(ok, 0.5):.2f}s "
+            f"p95 {percentile(ok, 0.95):.2f}s max {max(ok):.2f}s; {len(shed)} shed in p95 "
+            f"{percentile(shed, 0.95) * 1000:.1f} ms; queue wait p95 {metrics['queue_wait_p95']:.2f}s"
+        )
+
+    QUOTA[:] = [asyncio.Semaphore(LLM_CAPACITY)]
+    admission.AdmissionController = original_controller
+    import main
+    with contextlib.redirect_stdout(io.StringIO()):
+        finished = await ordering(main.create_app())
+    print(f"one session, 4 messages at once: {finished}")
+
+def main():
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        asyncio.run(main_async())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Replay scripted conversations through the agent, fully offline.
+
+Each conversation in the corpus (benchmarks/data/agent_conversations.json)
+gets its own ``HotelBookingAgent`` wired to ``services.fakes``: a
+``ScriptedChatModel`` that answers each ReAct step from the transcript, a
+fake geocoder and a fake RapidAPI transport. Turns go through
+``process_message`` exactly as in the API, so the executor, output parser,
+memory, tools and tracer all run for real; only the network is replaced.
+
+Conversations run concurrently (bounded by --concurrency), turns within a
+conversation in order. Reported per turn: latency p50/p95/max, ReAct
+iterations and LLM calls (from the turn trace), and with --trace-alloc the
+peak traced allocation. Peaks are exact only at --concurrency 1, since
+concurrent turns share the process heap. Replies the script did not cover
+are counted as "unscripted"; a non-zero count means the corpus and the
+agent disagree about the conversation and the timings are suspect.
+
+    python benchmarks/bench_agent_replay.py [--concurrency 8] [--repeat 5]
+        [--llm-latency 0.0] [--tool-latency 0.0] [--trace-alloc]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("TRACE_EXPORT", "off")
+os.environ.setdefault("UPSTREAM_RATE_PER_SEC", "100000")
+os.environ.setdefault("UPSTREAM_BURST", "100000")
+os.environ.setdefault("RAPIDAPI_KEY", "bench")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+from agents.hotel_booking_agent import HotelBookingAgent
+from services.fakes import FakeGeocoder, ScriptedChatModel, fake_rapidapi_transport
+from services.geo_service import GeoService
+from services.hotel_service import HotelService
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "agent_conversations.json")
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+async def replay(conversation, args, semaphore, turns, models):
+    async with semaphore:
+        llm = ScriptedChatModel(
+            transcripts={turn["user"]: turn["replies"] for turn in conversation["turns"]},
+            latency=args.llm_latency,
+        )
+        models.append(llm)
+        agent = HotelBookingAgent(
+            api_key="bench",
+            llm=llm,
+            hotel_service=HotelService(transport=fake_rapidapi_transport(latency=args.tool_latency)),
+            geo_service=GeoService(geolocator=FakeGeocoder(latency=args.tool_latency)),
+        )
+        for turn in conversation["turns"]:
+            if args.trace_alloc:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            await agent.process_message(turn["user"])
+            elapsed = time.perf_counter() - started
+            trace = agent.last_trace or {}
+            turns.append({
+                "conversation": conversation["name"],
+                "latency": elapsed,
+                "iterations": trace.get("iterations", 0),
+                "llm_calls": trace.get("llm_calls", 0),
+                "status": trace.get("status", "error"),
+                "peak_bytes": tracemalloc.get_traced_memory()[1] - before if args.trace_alloc else None,
+            })
+
+async def run(corpus, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    turns, models = [], []
+    conversations = [conversation for _ in range(args.repeat) for conversation in corpus]
+    started = time.perf_counter()
+    await asyncio.gather(*(replay(conversation, args, semaphore, turns, models) for conversation in conversations))
+    return time.perf_counter() - started, turns, models
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--concurrency", type=int, default=1, help="conversations in flight")
+    parser.add_argument("--repeat", type=int, default=5, help="times each conversation is replayed")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="seconds per geocode/search call")
+    parser.add_argument("--trace-alloc", action="store_true", help="peak traced allocation per turn")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    # The booking tool appends to hotel_bookings.csv in the working directory
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        if args.trace_alloc:
+            tracemalloc.start()
+        # The executor runs verbose and the tools print; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            wall, turns, models = asyncio.run(run(corpus, args))
+        if args.trace_alloc:
+            tracemalloc.stop()
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    latencies = [turn["latency"] * 1000 for turn in turns]
+    print(
+        f"{len(corpus)} conversations x {args.repeat}, {len(turns)} turns, concurrency {args.concurrency}, "
+        f"LLM latency {args.llm_latency * 1000:.0f} ms, tool latency {args.tool_latency * 1000:.0f} ms"
+    )
+    print(f"  wall time       : {wall:.2f} s ({len(turns) / wall:.1f} turns/s)")
+    print(
+        f"  turn latency    : p50 {percentile(latencies, 0.5):.1f} ms, p95 {percentile(latencies, 0.95):.1f} ms, "
+        f"max {max(latencies):.1f} ms"
+    )
+    print(
+        f"  per turn        : {statistics.mean(t['iterations'] for t in turns):.2f} iterations, "
+        f"{statistics.mean(t['llm_calls'] for t in turns):.2f} LLM calls"
+    )
+    if args.trace_alloc:
+        peaks = [turn["peak_bytes"] / 1024 for turn in turns]
+        print(f"  peak alloc/turn : p50 {percentile(peaks, 0.5):.0f} KiB, max {max(peaks):.0f} KiB")
+    errors = sum(turn["status"] != "ok" for turn in turns)
+    unscripted = sum(model.unscripted for model in models)
+    print(f"  errors          : {errors}, unscripted replies: {unscripted}")
+
+    print("  by conversation (mean latency, iterations per turn):")
+    for conversation in corpus:
+        rows = [turn for turn in turns if turn["conversation"] == conversation["name"]]
+        print(
+            f"    {conversation['name']:<24} {statistics.mean(t['latency'] for t in rows) * 1000:7.1f} ms  "
+            f"{statistics.mean(t['iterations'] for t in rows):.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Latency of /api/locations/autocomplete.
+
+The place index holds the local place list plus CATALOG_HOTELS catalog
+hotels spread over CATALOG_CITIES extra cities, and has seen a few thousand
+searches. Queries are what a user types on the way to a destination: every
+prefix of a random place name, with one in ten misspelled (a letter dropped)
+so that the close-spelling fallback is exercised too.
+
+Reported: the index lookup alone, and the endpoint of the real app from
+``backend/main.py`` driven in process through ``httpx.ASGITransport`` by
+CLIENTS concurrent clients for DURATION seconds.
+
+    python benchmarks/bench_autocomplete.py
+"""
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+TMP = tempfile.mkdtemp()
+os.environ.setdefault("RAPIDAPI_KEY", "bench")
+os.environ["WARM_ENABLED"] = "false"
+os.environ["PRICE_HISTORY_ENABLED"] = "false"
+os.environ["HOTEL_CATALOG_PATH"] = os.path.join(TMP, "hotel_catalog.db")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+import httpx
+
+import main
+from hotel_catalog import CatalogHotel
+from place_index import PlaceIndex
+
+CATALOG_HOTELS = 50_000
+CATALOG_CITIES = 2_000
+SEARCHES = 5_000
+LOOKUPS = 20_000
+CLIENTS = 32
+DURATION = 5.0  # seconds
+
+def fake_hotels(rnd):
+    cities = []
+    for _ in range(CATALOG_CITIES):
+        name = "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 10))).title()
+        cities.append((name, rnd.choice(["FR", "DE", "US", "JP", "BR"]), rnd.uniform(-60, 60), rnd.uniform(-180, 180)))
+    hotels = []
+    for hotel_id in range(CATALOG_HOTELS):
+        city, country_code, latitude, longitude = rnd.choice(cities)
+        hotels.append(CatalogHotel(
+            hotel_id, f"Hotel {hotel_id}", city, country_code,
+            latitude + rnd.uniform(-0.05, 0.05), longitude + rnd.uniform(-0.05, 0.05),
+            "", None, None, None, None, None, (), 0.0,
+        ))
+    return hotels, cities
+
+def typed_queries(rnd, names, count):
+    queries = []
+    while len(queries) < count:
+        name = rnd.choice(names)
+        if rnd.random() < 0.1 and len(name) > 4:
+            cut = rnd.randrange(1, len(name) - 1)
+            queries.append(name[:cut] + name[cut + 1:])
+        else:
+            queries.extend(name[:length] for length in range(1, len(name) + 1))
+    return queries[:count]
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+def report(label, latencies, elapsed=None):
+    rate = f", {len(latencies) / elapsed:,.0f} req/s" if elapsed else ""
+    print(
+        f"  {label:<9}: p50 {percentile(latencies, 0.5) * 1000:.3f} ms, p99 {percentile(latencies, 0.99) * 1000:.3f} ms, "
+        f"max {max(latencies) * 1000:.3f} ms{rate}"
+    )
+
+def seed(index, hotels, cities, rnd):
+    index.load()
+    index.add_hotels(hotels)
+    for _ in range(SEARCHES):
+        _, _, latitude, longitude = rnd.choice(cities)
+        index.record_search(latitude, longitude)
+
+async def drive(app, queries):
+    latencies = []
+    deadline = time.perf_counter() + DURATION
+
+    async def client_loop(client, rnd):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get("/api/locations/autocomplete", params={"q": rnd.choice(queries)})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://backend") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, random.Random(i)) for i in range(CLIENTS)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+def main_bench():
+    rnd = random.Random(0)
+    hotels, cities = fake_hotels(rnd)
+    index = PlaceIndex()
+    started = time.perf_counter()
+    seed(index, hotels, cities, rnd)
+    print(f"index: {index.snapshot()} built in {time.perf_counter() - started:.2f} s")
+
+    names = [place.name for place in index._places]
+    queries = typed_queries(rnd, names, LOOKUPS)
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.suggest(query, 8)
+        latencies.append(time.perf_counter() - started)
+    report("lookup", latencies)
+
+    main.place_index = index
+    latencies, elapsed = asyncio.run(drive(main.app, queries))
+    report(f"endpoint ({CLIENTS} clients)", latencies, elapsed)
+
+if __name__ == "__main__":
+    main_bench()
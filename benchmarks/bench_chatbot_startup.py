@@ -0,0 +1,86 @@
+"""Chatbot cold start: import time and time to first health check.
+
+1. ``python -X importtime -c "import main"`` in ``chatbot/``: total import
+   time and the slowest top-level packages (self time summed per package).
+2. The same for ``agents.hotel_booking_agent`` plus ``warm_up()``, i.e. what
+   the first chat message pays once the LLM stack is needed.
+3. ``python main.py --api``: seconds until ``/health`` answers and until
+   ``/ready`` reports the agent warm.
+
+Dummy API keys are used; nothing is sent to Gemini or RapidAPI.
+
+    python benchmarks/bench_chatbot_startup.py
+"""
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import requests
+
+CHATBOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot")
+ENV = dict(os.environ, GEMINI_API_KEY="bench", RAPIDAPI_KEY="bench", PYTHONDONTWRITEBYTECODE="1")
+TOP = 12
+PORT = 8000
+
+def import_profile(code):
+    """Run ``code`` under ``-X importtime``; return (wall_seconds, {package: self_us})."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=CHATBOT_DIR, env=ENV, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        # Self time summed per top-level package attributes nested imports exactly
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return elapsed, packages
+
+def report(label, code):
+    elapsed, packages = import_profile(code)
+    print(f"{label}: {elapsed:.2f} s wall, {sum(packages.values()) / 1e6:.2f} s imports")
+    for name, us in sorted(packages.items(), key=lambda item: -item[1])[:TOP]:
+        print(f"    {name:<32} {us / 1000:8.1f} ms")
+
+def api_cold_start(timeout=120.0):
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "main.py", "--api"],
+        cwd=CHATBOT_DIR, env=ENV, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    healthy = ready = None
+    try:
+        while time.perf_counter() - started < timeout and ready is None:
+            try:
+                if healthy is None:
+                    requests.get(f"http://127.0.0.1:{PORT}/health", timeout=1).raise_for_status()
+                    healthy = time.perf_counter() - started
+                if requests.get(f"http://127.0.0.1:{PORT}/ready", timeout=1).status_code == 200:
+                    ready = time.perf_counter() - started
+            except requests.RequestException:
+                pass
+            time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait()
+    return healthy, ready
+
+def main():
+    report("import main", "import main")
+    report(
+        "import agent + warm_up()",
+        "from agents.hotel_booking_agent import HotelBookingAgent; HotelBookingAgent('bench').warm_up()",
+    )
+    healthy, ready = api_cold_start()
+    print(f"main.py --api: /health after {healthy or float('nan'):.2f} s, /ready after {ready or float('nan'):.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Local date resolution: corpus check, cost per phrase, and LLM round-trips saved.
+
+1. Every phrase in benchmarks/data/date_phrases.json is resolved against its
+   fixed "today" and compared with the expected check-in and nights; any
+   mismatch is listed and the script exits non-zero.
+2. Microseconds per ``resolve`` call over the corpus.
+3. "Check in next friday for 3 nights" replayed through the agent with the
+   offline fakes: the old flow (date_tool for today's date, the model works
+   out the calendar, then update_preference_tool) against passing the phrase
+   straight to check_in. LLM_LATENCY seconds are charged per model call.
+
+    python benchmarks/bench_date_resolution.py
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from datetime import date
+
+os.environ.setdefault("TRACE_EXPORT", "off")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+from agents.hotel_booking_agent import HotelBookingAgent
+from services.date_parser import resolve
+from services.fakes import ScriptedChatModel
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "date_phrases.json")
+LLM_LATENCY = 0.8  # seconds, typical Gemini flash round-trip
+REPEAT = 200
+USER_INPUT = "Check in next friday for 3 nights"
+
+def check_corpus(cases):
+    failures = []
+    for case in cases:
+        resolved = resolve(case["phrase"], today=date.fromisoformat(case["today"]))
+        got = (resolved.check_in.isoformat(), resolved.nights) if resolved else (None, None)
+        if got != (case["check_in"], case["nights"]):
+            failures.append((case, got))
+    return failures
+
+def time_corpus(cases):
+    phrases = [(case["phrase"], date.fromisoformat(case["today"])) for case in cases]
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        for phrase, today in phrases:
+            resolve(phrase, today=today)
+    return (time.perf_counter() - started) / (REPEAT * len(phrases)) * 1e6
+
+async def replay(replies):
+    llm = ScriptedChatModel(transcripts={USER_INPUT: replies}, latency=LLM_LATENCY)
+    agent = HotelBookingAgent(api_key="bench", llm=llm)
+    agent.warm_up()
+    started = time.perf_counter()
+    await agent.process_message(USER_INPUT)
+    elapsed = time.perf_counter() - started
+    return elapsed, agent.last_trace, (agent.user_prefs.check_in, agent.user_prefs.check_out), llm.unscripted
+
+def main():
+    with open(CORPUS, encoding="utf-8") as f:
+        cases = json.load(f)
+    failures = check_corpus(cases)
+    print(f"corpus: {len(cases) - len(failures)}/{len(cases)} phrases resolved as expected")
+    for case, got in failures:
+        print(f"  {case['phrase']!r} (today {case['today']}): expected {case['check_in']}, {case['nights']}; got {got[0]}, {got[1]}")
+    print(f"resolve(): {time_corpus(cases):.1f} us per phrase")
+
+    friday = resolve("next friday").check_in.isoformat()
+    flows = {
+        "date_tool + model math": [
+            "Thought: I need today's date to work out next friday.\nAction: date_tool\nAction Input: none",
+            f"Thought: Next friday is {friday}.\nAction: update_preference_tool\nAction Input: check_in={friday}, nights=3",
+            "Thought: Dates stored.\nFinal Answer: How many adults and rooms?",
+        ],
+        "phrase to check_in": [
+            "Thought: Store the dates as given.\nAction: update_preference_tool\nAction Input: check_in=next friday, nights=3",
+            "Thought: Dates stored.\nFinal Answer: How many adults and rooms?",
+        ],
+    }
+    print(f"{USER_INPUT!r}, {LLM_LATENCY}s per LLM call")
+    stays = {}
+    for label, replies in flows.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, trace, stays[label], unscripted = asyncio.run(replay(replies))
+        print(
+            f"  {label:<24}: {elapsed:.2f} s, {trace['iterations']} iterations, {trace['llm_calls']} LLM calls, "
+            f"stay {stays[label][0]} to {stays[label][1]}, unscripted replies {unscripted}"
+        )
+    print(f"  same stay: {len(set(stays.values())) == 1}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""ReAct iterations spent setting a destination, before and after set_destination.
+
+Replays the same three-turn conversation through the real AgentExecutor
+with a scripted chat model. In the old flow the model stores the city,
+geocodes it and stores the coordinates (three tool round-trips); in the new
+flow it makes one ``set_destination`` call. Iterations and LLM calls are
+counted with the turn tracer. The geocode cache is seeded, so no network
+is used, and each LLM call is charged LLM_LATENCY seconds for the projection.
+
+    python benchmarks/bench_destination_iterations.py
+"""
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("TRACE_EXPORT", "off")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "chatbot"))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agents.hotel_booking_agent import HotelBookingAgent
+from services import geo_service
+from services.tracing import TurnTracer
+from tools.geo_location_tool import GeoLocationTool
+
+LLM_LATENCY = 0.8  # seconds, typical Gemini flash round-trip
+PARIS = (48.8566, 2.3522)
+
+USER_TURNS = [
+    "I want a hotel in Paris",
+    "Check in on 2030-06-01 for 3 nights",
+    "2 adults, 1 room",
+]
+
+COMMON_TURNS = [
+    [
+        "Thought: Store the dates.\nAction: update_preference_tool\nAction Input: check_in=2030-06-01, nights=3",
+        "Thought: I need the guests.\nFinal Answer: How many adults and rooms?",
+    ],
+    [
+        "Thought: Store the guests.\nAction: update_preference_tool\nAction Input: adults=2, rooms=1",
+        "Thought: Everything is set.\nFinal Answer: Shall I search for hotels now?",
+    ],
+]
+
+OLD_FLOW = [
+    [
+        "Thought: Store the city.\nAction: update_preference_tool\nAction Input: city=Paris",
+        "Thought: Get its coordinates.\nAction: geo_location_tool\nAction Input: Paris",
+        "Thought: Store the coordinates.\nAction: update_preference_tool\nAction Input: latitude=48.8566, longitude=2.3522",
+        "Thought: I need the check-in date.\nFinal Answer: What is your check-in date?",
+    ],
+    *COMMON_TURNS,
+]
+
+NEW_FLOW = [
+    [
+        "Thought: Set the destination.\nAction: set_destination\nAction Input: Paris",
+        "Thought: I need the check-in date.\nFinal Answer: What is your check-in date?",
+    ],
+    *COMMON_TURNS,
+]
+
+async def replay(script, old_tools=False):
+    agent = HotelBookingAgent(api_key="bench")
+    agent._llm = FakeListChatModel(responses=[response for turn in script for response in turn])
+    if old_tools:
+        agent._tools = agent.tools + [GeoLocationTool(user_prefs=agent.user_prefs)]
+
+    iterations = llm_calls = 0
+    for user_input in USER_TURNS:
+        tracer = TurnTracer(user_input)
+        await agent.agent_executor.ainvoke({"input": user_input}, config={"callbacks": [tracer]})
+        trace = tracer.finish()
+        iterations += trace["iterations"]
+        llm_calls += trace["llm_calls"]
+    prefs = agent.user_prefs
+    return iterations, llm_calls, prefs.is_ready_for_search() and prefs.city == "Paris"
+
+def main():
+    geo_service._geocode_cache[geo_service._cache_key("Paris")] = PARIS
+    results = {
+        "update + geocode + update": asyncio.run(replay(OLD_FLOW, old_tools=True)),
+        "set_destination": asyncio.run(replay(NEW_FLOW)),
+    }
+    print(f"{len(USER_TURNS)}-turn conversation, {LLM_LATENCY}s per LLM call")
+    for label, (iterations, llm_calls, ready) in results.items():
+        print(
+            f"  {label:<26}: {iterations} iterations, {llm_calls} LLM calls, "
+            f"~{llm_calls * LLM_LATENCY:.1f}s of LLM time, ready for search: {ready}"
+        )
+    saved = results["update + geocode + update"][1] - results["set_destination"][1]
+    print(f"  saved per conversation     : {saved} LLM round-trips (~{saved * LLM_LATENCY:.1f}s)")
+
+if __name__ == "__main__":
+    main()
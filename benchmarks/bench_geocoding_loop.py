@@ -0,0 +1,72 @@
+"""Event-loop stalls from geocoding, blocking vs async.
+
+CONCURRENT conversations each geocode a different city at once, with
+LATENCY seconds per lookup, while a ticker task measures how late the event
+loop wakes it (every other request on the worker sees the same lag).
+
+- blocking     : ``GeoService.get_coordinates`` called on the loop, which is
+                 what a sync geocoder inside an async handler does
+- thread pool  : ``get_coordinates_async`` with a custom (blocking)
+                 geolocator, run on the GEOCODE_THREADS pool
+- async client : ``get_coordinates_async`` over the pooled
+                 ``httpx.AsyncClient`` (Photon stand-in transport)
+
+    python benchmarks/bench_geocoding_loop.py
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+from services import geo_service
+from services.fakes import FakeGeocoder, fake_photon_transport
+from services.geo_service import GEOCODE_THREADS, GeoService
+
+CONCURRENT = 20
+LATENCY = 0.3  # seconds per lookup
+TICK = 0.01  # seconds
+PLACES = {f"city {i}": (40.0 + i / 10, 2.0 + i / 10, f"City {i}, Country") for i in range(CONCURRENT)}
+
+async def ticker(lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - expected)
+
+async def run(lookup):
+    geo_service._geocode_cache.clear()
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(TICK * 2)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(lookup(city) for city in PLACES))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+    return elapsed, max(lags), sum(result is not None for result in results)
+
+async def main_async():
+    blocking = GeoService(geolocator=FakeGeocoder(PLACES, latency=LATENCY))
+    pooled = GeoService(geolocator=FakeGeocoder(PLACES, latency=LATENCY))
+    client = GeoService(transport=fake_photon_transport(PLACES, latency=LATENCY))
+
+    async def on_loop(city):
+        return blocking.get_coordinates(city)
+
+    modes = {
+        "blocking": on_loop,
+        f"thread pool ({GEOCODE_THREADS})": pooled.get_coordinates_async,
+        "async client": client.get_coordinates_async,
+    }
+    print(f"{CONCURRENT} concurrent lookups, {LATENCY}s each")
+    for label, lookup in modes.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, max_lag, found = await run(lookup)
+        print(f"  {label:<16}: {elapsed:5.2f} s total, event loop stalled up to {max_lag * 1000:7.1f} ms, {found} found")
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
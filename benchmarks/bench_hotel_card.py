@@ -0,0 +1,119 @@
+"""Render time of 100 hotel cards per Streamlit rerun, before and after templates.
+
+- before: ``hotel_card`` as it was before the compiled templates (inline
+  f-strings, a pandas DataFrame for the price table, a pytz lookup per
+  card), loaded from git at BASELINE_COMMIT
+- after, no memo: today's ``hotel_card`` without a result-set version, so
+  every rerun renders the templates again
+- after, memoized: today's ``hotel_card`` with a version, first rerun
+  (cold cache) and later reruns
+
+Streamlit is replaced by a stand-in that only counts what a card sends, so
+both versions are timed on building their HTML and not on the browser; the
+per-hotel map is off in both (``show_map=False``).
+
+    python benchmarks/bench_hotel_card.py
+"""
+import os
+import subprocess
+import sys
+import time
+import types
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(REPO, "frontend"))
+# For services.fakes (``services`` spans the frontend and chatbot dirs) and
+# the backend's price_math
+sys.path.append(os.path.join(REPO, "chatbot"))
+sys.path.append(os.path.join(REPO, "backend"))
+# The last commit with the inline, pandas-based card
+BASELINE_COMMIT = "5723f9d"
+
+CARDS = 100
+RERUNS = 20
+NIGHTS = 3
+
+class _Block:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class FakeStreamlit(types.ModuleType):
+    """The Streamlit calls a card makes, counting the characters sent."""
+
+    def __init__(self):
+        super().__init__("streamlit")
+        self.sent = 0
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self.sent += len(body)
+
+    def image(self, url, **kwargs):
+        self.sent += len(url)
+
+    def warning(self, body):
+        self.sent += len(body)
+
+    def container(self):
+        return _Block()
+
+    def columns(self, spec):
+        return [_Block() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def tabs(self, labels):
+        return [_Block() for _ in labels]
+
+st = sys.modules["streamlit"] = FakeStreamlit()
+sys.modules["streamlit_folium"] = types.SimpleNamespace(folium_static=lambda *args, **kwargs: None)
+
+from components.card_templates import clear_card_cache
+from components.hotel_card import hotel_card
+from price_math import price_figures
+from services.fakes import fake_search_payload
+
+def load_baseline():
+    source = subprocess.run(
+        ["git", "show", f"{BASELINE_COMMIT}:frontend/components/hotel_card.py"],
+        cwd=REPO, capture_output=True, text=True, check=True,
+    ).stdout
+    module = types.ModuleType("baseline_hotel_card")
+    exec(compile(source, "baseline_hotel_card.py", "exec"), module.__dict__)
+    return module.hotel_card
+
+def make_hotels(count):
+    """Search rows as the backend returns them, ``price_summary`` included."""
+    hotels = fake_search_payload(48.8566, 2.3522, count)["data"]["result"]
+    for hotel in hotels:
+        hotel["price_summary"] = price_figures(
+            hotel["composite_price_breakdown"], hotel["min_total_price"], hotel["currencycode"], NIGHTS,
+        )
+    return hotels
+
+def rerun(render, hotels, **kwargs):
+    start = time.perf_counter()
+    for hotel in hotels:
+        render(hotel, show_map=False, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+def mean_rerun(render, hotels, **kwargs):
+    return sum(rerun(render, hotels, **kwargs) for _ in range(RERUNS)) / RERUNS
+
+if __name__ == "__main__":
+    hotels = make_hotels(CARDS)
+    baseline_card = load_baseline()
+
+    before = mean_rerun(baseline_card, hotels)
+    sent_before, st.sent = st.sent / RERUNS, 0
+    no_memo = mean_rerun(hotel_card, hotels)
+    sent_after, st.sent = st.sent / RERUNS, 0
+    clear_card_cache()
+    first = rerun(hotel_card, hotels, version="v1")
+    memoized = mean_rerun(hotel_card, hotels, version="v1")
+
+    print(f"{CARDS} cards, mean of {RERUNS} reruns")
+    print(f"  before (inline + pandas) : {before:8.2f} ms, {sent_before / 1024:6.0f} KiB sent")
+    print(f"  after, no memo           : {no_memo:8.2f} ms, {sent_after / 1024:6.0f} KiB sent")
+    print(f"  after, first rerun       : {first:8.2f} ms")
+    print(f"  after, memoized reruns   : {memoized:8.2f} ms  ({before / memoized:.1f}x faster than before)")
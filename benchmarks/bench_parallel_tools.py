@@ -0,0 +1,82 @@
+"""One turn with several details: sequential ReAct vs parallel tool calls.
+
+The user gives destination, dates and guests in one message. With the
+classic ReAct parser the model stores them one tool call per step; with
+AGENT_PARALLEL_TOOLS it lists both calls in one step and the executor runs
+them together. Both runs use the offline fakes from ``services.fakes`` with
+LLM_LATENCY per model call and TOOL_LATENCY per geocode, and the turn is
+repeated with a fresh agent (and an empty geocode cache) each time. The
+resulting preferences are checked to be identical, so the concurrent
+updates did not lose a field.
+
+    python benchmarks/bench_parallel_tools.py
+"""
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("TRACE_EXPORT", "off")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+from agents import hotel_booking_agent
+from agents.hotel_booking_agent import HotelBookingAgent
+from services import geo_service
+from services.fakes import FakeGeocoder, ScriptedChatModel
+from services.geo_service import GeoService
+
+LLM_LATENCY = 0.8  # seconds, typical Gemini flash round-trip
+TOOL_LATENCY = 0.4  # seconds, typical Photon geocode
+RUNS = 5
+
+USER_INPUT = "Paris, check in 2030-05-08 for 3 nights, 2 adults, 1 room"
+
+SEQUENTIAL = [
+    "Thought: Set the destination.\nAction: set_destination\nAction Input: Paris",
+    "Thought: Store the stay.\nAction: update_preference_tool\nAction Input: check_in=2030-05-08, nights=3, adults=2, rooms=1",
+    "Thought: Everything is stored.\nFinal Answer: Shall I search for hotels now?",
+]
+
+PARALLEL = [
+    "Thought: Store the destination and the stay at once.\n"
+    "Action: set_destination\nAction Input: Paris\n"
+    "Action: update_preference_tool\nAction Input: check_in=2030-05-08, nights=3, adults=2, rooms=1",
+    "Thought: Everything is stored.\nFinal Answer: Shall I search for hotels now?",
+]
+
+async def turn(parallel: bool):
+    hotel_booking_agent.AGENT_PARALLEL_TOOLS = parallel
+    geo_service._geocode_cache.clear()
+    llm = ScriptedChatModel(transcripts={USER_INPUT: PARALLEL if parallel else SEQUENTIAL}, latency=LLM_LATENCY)
+    agent = HotelBookingAgent(api_key="bench", llm=llm, geo_service=GeoService(geolocator=FakeGeocoder(latency=TOOL_LATENCY)))
+    agent.warm_up()
+    started = time.perf_counter()
+    await agent.process_message(USER_INPUT)
+    elapsed = time.perf_counter() - started
+    prefs = agent.user_prefs.model_dump(exclude={"coordinates"})
+    return elapsed, agent.last_trace, prefs, llm.unscripted
+
+def main():
+    results = {}
+    for label, parallel in (("sequential", False), ("parallel", True)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            runs = [asyncio.run(turn(parallel)) for _ in range(RUNS)]
+        results[label] = runs
+
+    print(f"{RUNS} turns each, {LLM_LATENCY}s per LLM call, {TOOL_LATENCY}s per geocode")
+    for label, runs in results.items():
+        trace = runs[-1][1]
+        print(
+            f"  {label:<10}: {statistics.median(r[0] for r in runs):.2f} s median, "
+            f"{trace['iterations']} iterations, {trace['llm_calls']} LLM calls, "
+            f"{trace['tool_calls']} tool calls, unscripted replies {sum(r[3] for r in runs)}"
+        )
+    prefs = {label: runs[-1][2] for label, runs in results.items()}
+    print(f"  same preferences: {prefs['sequential'] == prefs['parallel']} "
+          f"(ready for search: {prefs['parallel']['check_out'] is not None and prefs['parallel']['latitude'] is not None})")
+
+if __name__ == "__main__":
+    main()
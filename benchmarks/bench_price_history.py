@@ -0,0 +1,76 @@
+"""Aggregation time over a synthetic price history.
+
+Writes ROWS observed prices (2,000 hotels in 20 cities over 90 days) as
+Parquet part files, the way ``PriceHistoryWriter`` does, then times the
+per-city and per-hotel summaries served by ``/api/prices/history``.
+
+    python benchmarks/bench_price_history.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from price_history import SCHEMA, PriceHistoryWriter, aggregate, load_history
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+PART_ROWS = 250_000
+HOTELS = 2000
+CITIES = [f"City {i}" for i in range(20)]
+
+def write_parts(directory, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc).timestamp()
+    for part, start in enumerate(range(0, rows, PART_ROWS)):
+        count = min(PART_ROWS, rows - start)
+        hotel_ids = rng.integers(0, HOTELS, count)
+        arrivals = np.datetime64(date.today()) + rng.integers(1, 120, count).astype("timedelta64[D]")
+        observed = (now - rng.uniform(0, 90 * 86400, count)).astype("int64")
+        table = pa.table({
+            "hotel_id": pa.array(hotel_ids, pa.int64()),
+            "city": pa.DictionaryArray.from_arrays(pa.array(hotel_ids % len(CITIES), pa.int32()), CITIES),
+            "arrival_date": pa.array(arrivals, pa.date32()),
+            "departure_date": pa.array(arrivals + np.timedelta64(2, "D"), pa.date32()),
+            "currency": pa.DictionaryArray.from_arrays(pa.array(np.zeros(count, "int32")), ["EUR"]),
+            "price": pa.array(rng.uniform(60, 600, count)),
+            "observed_at": pa.array(observed, pa.timestamp("s", tz="UTC")),
+        }, schema=SCHEMA)
+        pq.write_table(table, os.path.join(directory, f"part-{part:05d}.parquet"), compression="zstd")
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"  {label:<34}: {(time.perf_counter() - started) * 1000:7.0f} ms")
+    return result
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        write_parts(tmp, ROWS)
+        print(f"{ROWS:,} rows in {len(os.listdir(tmp))} part files")
+
+        table = timed("load all rows", lambda: load_history(tmp))
+        timed("summary by city", lambda: aggregate(table, "city"))
+        timed("summary by hotel", lambda: aggregate(table, "hotel"))
+        timed("load + summary, one city, 30 days", lambda: aggregate(load_history(tmp, city="City 3", since_days=30), "hotel"))
+        timed("load + summary, one hotel", lambda: aggregate(load_history(tmp, hotel_id=42), "hotel"))
+
+        writer = PriceHistoryWriter(directory=tmp)
+        ids, cities, prices = list(range(50)), ["City 1"] * 50, [100.0] * 50
+        currencies = ["EUR"] * 50
+        arrival = (date.today() + timedelta(days=7)).isoformat()
+        departure = (date.today() + timedelta(days=9)).isoformat()
+        started = time.perf_counter()
+        for _ in range(1000):
+            writer.record(ids, cities, currencies, prices, arrival, departure)
+        per_call = (time.perf_counter() - started) / 1000 * 1e6
+        print(f"  {'record() of a 50-hotel search':<34}: {per_call:7.1f} us")
+
+if __name__ == "__main__":
+    main()
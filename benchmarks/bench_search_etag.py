@@ -0,0 +1,86 @@
+"""Cost of re-fetching an unchanged search, with and without ETags.
+
+The real app from ``backend/main.py`` is driven in process through
+``httpx.ASGITransport`` with upstream replaced by a fixed 100-hotel payload
+from ``services.fakes.fake_search_payload``. The same search the Streamlit
+frontend sends (its field list, one sort) is fetched REPEATS times after the
+first, once as a plain GET and once revalidated with ``If-None-Match`` the
+way ``frontend/services/api_client.py`` does. Reported per fetch: bytes on the wire (body as sent, after brotli, plus
+response headers) and server time.
+
+    python benchmarks/bench_search_etag.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+TMP = tempfile.mkdtemp()
+os.environ.setdefault("RAPIDAPI_KEY", "bench")
+os.environ["WARM_ENABLED"] = "false"
+os.environ["PRICE_HISTORY_ENABLED"] = "false"
+os.environ["HOTEL_CATALOG_PATH"] = os.path.join(TMP, "hotel_catalog.db")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+# After the backend, whose ``models`` must win over the chatbot's
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+import httpx
+
+import main
+from services.fakes import fake_search_payload
+
+HOTELS = 100
+REPEATS = 500
+# What frontend/services/api_client.py asks for
+HOTEL_FIELDS = [
+    "hotel_id", "hotel_name", "min_total_price", "currencycode",
+    "review_score", "review_score_word", "review_nr", "city", "countrycode",
+    "latitude", "longitude", "main_photo_url", "is_free_cancellable",
+    "badges", "price_summary", "accommodation_type", "timezone",
+]
+SEARCH = {
+    "latitude": "48.85660000",
+    "longitude": "2.35220000",
+    "arrival_date": "2026-11-02",
+    "departure_date": "2026-11-05",
+    "adults": 2,
+    "room_qty": 1,
+    "currency_code": "EUR",
+    "sort": "recommended",
+    "max_distance_km": 20.0,
+    "fields": ",".join(HOTEL_FIELDS),
+}
+
+def wire_bytes(response):
+    headers = sum(len(name) + len(value) + 4 for name, value in response.headers.raw)
+    return response.num_bytes_downloaded + headers
+
+async def fetch_repeatedly(client, revalidate):
+    first = await client.get("/api/hotels/search", params=SEARCH)
+    first.raise_for_status()
+    etag = first.headers["ETag"]
+    sizes, timings, statuses = [], [], set()
+    for _ in range(REPEATS):
+        headers = {"If-None-Match": etag} if revalidate else {}
+        started = time.perf_counter()
+        response = await client.get("/api/hotels/search", params=SEARCH, headers=headers)
+        timings.append(time.perf_counter() - started)
+        sizes.append(wire_bytes(response))
+        statuses.add(response.status_code)
+    timings.sort()
+    return sum(sizes) / len(sizes), timings[len(timings) // 2], statuses
+
+async def main_async():
+    payload = fake_search_payload(float(SEARCH["latitude"]), float(SEARCH["longitude"]), HOTELS)
+    main.upstream._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=payload)))
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", headers={"Accept-Encoding": "br, gzip"}) as client:
+            print(f"{HOTELS} hotels, {REPEATS} repeated fetches of one cached search")
+            for label, revalidate in (("plain GET", False), ("If-None-Match", True)):
+                size, p50, statuses = await fetch_repeatedly(client, revalidate)
+                print(f"  {label:<14}: {size:8,.0f} bytes per fetch, p50 {p50 * 1000:.2f} ms, status {sorted(statuses)}")
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
@@ -0,0 +1,106 @@
+"""Parse time and cached size of one 100-hotel search response.
+
+Compares validating every hotel into a full ``HotelResponseWithDistance``
+(the old behaviour) with validating only the price part into an ``Offer``
+joined to an already warm hotel catalog. No network or server is needed.
+
+    python benchmarks/bench_search_parse.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+# After the backend, whose ``models`` must win over the chatbot's
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "chatbot"))
+
+from hotel_catalog import HotelCatalog, catalog_record
+from models import Hotel, HotelOffer, HotelResponseWithDistance
+from pricing import summarize_price
+from result_cache import Offer, ResultSet
+from services.fakes import fake_search_payload
+
+HOTELS = 100
+REPEATS = 50
+
+def parse_full(raw_hotels):
+    hotels = []
+    for raw in raw_hotels:
+        hotel = Hotel(**raw)
+        breakdown = hotel.composite_price_breakdown
+        hotels.append(HotelResponseWithDistance(
+            hotel_id=hotel.hotel_id,
+            hotel_name=hotel.hotel_name,
+            price=hotel.min_total_price,
+            currency=hotel.currencycode,
+            city=hotel.city,
+            country_code=hotel.countrycode.upper(),
+            latitude=hotel.latitude,
+            longitude=hotel.longitude,
+            photo_url=hotel.main_photo_url,
+            rating=hotel.review_score,
+            rating_description=hotel.review_score_word,
+            review_count=hotel.review_nr,
+            free_cancellation=hotel.is_free_cancellable,
+            badges=[badge.model_dump() for badge in hotel.badges or ()],
+            price_breakdown=breakdown.model_dump() if breakdown else None,
+            price_summary=summarize_price(breakdown, hotel.min_total_price, hotel.currencycode, 2),
+            accommodation_type=hotel.accommodation_type,
+            timezone=hotel.timezone,
+            distance_km=1.0,
+        ))
+    return hotels
+
+def parse_offers(raw_hotels, catalog):
+    offers = []
+    for raw in raw_hotels:
+        offer = HotelOffer(**raw)
+        hotel = catalog.get(offer.hotel_id)
+        if hotel is None or catalog.is_expired(hotel):
+            hotel = catalog_record(Hotel(**raw))
+            catalog.remember([hotel])
+        breakdown = offer.composite_price_breakdown
+        offers.append(Offer(
+            hotel=hotel,
+            price=offer.min_total_price,
+            currency=offer.currencycode,
+            free_cancellation=offer.is_free_cancellable,
+            price_summary=summarize_price(breakdown, offer.min_total_price, offer.currencycode, 2),
+            price_breakdown=breakdown.model_dump() if breakdown else None,
+            distance_km=1.0,
+        ))
+    return ResultSet(offers)
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*args)
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+def retained_kb(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1024
+
+def main():
+    raw_hotels = fake_search_payload(48.8566, 2.3522, HOTELS)["data"]["result"]
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = HotelCatalog(path=os.path.join(tmp, "catalog.db"))
+        parse_offers(raw_hotels, catalog)  # warm the catalog
+
+        full_ms = timed(parse_full, raw_hotels)
+        offer_ms = timed(parse_offers, raw_hotels, catalog)
+        full_kb = retained_kb(parse_full, raw_hotels)
+        offer_kb = retained_kb(parse_offers, raw_hotels, catalog)
+
+    print(f"{HOTELS} hotels per search, {REPEATS} repeats")
+    print(f"  full validation   : {full_ms:7.2f} ms/search  {full_kb:7.1f} KiB cached")
+    print(f"  offers + catalog  : {offer_ms:7.2f} ms/search  {offer_kb:7.1f} KiB cached")
+
+if __name__ == "__main__":
+    main()
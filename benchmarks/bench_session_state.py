@@ -0,0 +1,127 @@
+"""Cost of externalized chat session state.
+
+1. A realistic session (full preferences, SESSION_HISTORY_MESSAGES messages
+   of chat history, 50 search results) is exported from an agent, then
+   measured: serialized size, ``dumps``/``loads``, ``export_state`` and
+   ``restore_state``, and a save + load round-trip through the memory and
+   SQLite stores.
+2. A search-and-book conversation from the replay corpus is run with every
+   turn on a different agent (standing in for a different worker), handing
+   state over only through the SQLite store. The booking has to find the
+   hotel the search returned on the other "worker".
+
+    python benchmarks/bench_session_state.py
+"""
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("TRACE_EXPORT", "off")
+os.environ.setdefault("UPSTREAM_RATE_PER_SEC", "100000")
+os.environ.setdefault("UPSTREAM_BURST", "100000")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+from agents.hotel_booking_agent import HotelBookingAgent
+from services.fakes import FakeGeocoder, ScriptedChatModel, fake_rapidapi_transport, fake_search_payload
+from services.geo_service import GeoService
+from services.hotel_service import HotelService
+from services.session_store import SESSION_HISTORY_MESSAGES, MemorySessionStore, SessionState, SQLiteSessionStore
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "agent_conversations.json")
+REPEAT = 2000
+
+def per_call_us(fn, repeat=REPEAT):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def sample_agent():
+    agent = HotelBookingAgent(api_key="bench", llm=ScriptedChatModel(transcripts={}), hotel_service=HotelService())
+    for field, value in [("check_in", "2030-06-01"), ("nights", "3"), ("adults", "2"), ("rooms", "1"), ("timezone", "Europe/Paris")]:
+        agent.user_prefs.update(field, value)
+    agent.user_prefs.set_destination("Paris", 48.8566, 2.3522)
+    for i in range(SESSION_HISTORY_MESSAGES // 2):
+        agent.memory.chat_memory.add_user_message(f"User message number {i} about dates, guests and the city.")
+        agent.memory.chat_memory.add_ai_message(f"Assistant reply number {i}, asking for the next detail. " * 3)
+    hotels = fake_search_payload(48.8566, 2.3522)["data"]["result"]
+    agent.tools
+    agent.hotel_service.search_results = [
+        {"hotel_id": h["hotel_id"], "name": h["hotel_name"], "address": f"{h['city']}, {h['countrycode']}",
+         "price": h["min_total_price"], "currency": h["currencycode"], "rating": h["review_score"],
+         "distance_km": 1.5, "latitude": h["latitude"], "longitude": h["longitude"], "badges": h["badges"],
+         "price_summary": {"total": h["min_total_price"]}}
+        for h in hotels
+    ]
+    return agent
+
+async def handover(conversation, store):
+    transcripts = {turn["user"]: turn["replies"] for turn in conversation["turns"]}
+    session_id = "bench"
+    outputs = []
+    for turn in conversation["turns"]:
+        # A fresh agent per turn, as if another worker served it
+        agent = HotelBookingAgent(
+            api_key="bench",
+            llm=ScriptedChatModel(transcripts=transcripts),
+            hotel_service=HotelService(transport=fake_rapidapi_transport()),
+            geo_service=GeoService(geolocator=FakeGeocoder()),
+        )
+        state = store.load(session_id)
+        if state is not None:
+            agent.restore_state(state)
+        await agent.process_message(turn["user"])
+        outputs.append(agent.last_trace["spans"])
+        store.save(session_id, agent.export_state())
+    return outputs, store.load(session_id)
+
+def main():
+    agent = sample_agent()
+    state = agent.export_state()
+    data = state.dumps()
+    print(
+        f"session: {len(state.history)} messages, {len(state.search_results)} search results, "
+        f"{len(data)} bytes serialized"
+    )
+    print(f"  export_state       : {per_call_us(agent.export_state):7.1f} us")
+    print(f"  dumps              : {per_call_us(state.dumps):7.1f} us")
+    print(f"  loads              : {per_call_us(lambda: SessionState.loads(data)):7.1f} us")
+    print(f"  restore_state      : {per_call_us(lambda: agent.restore_state(state)):7.1f} us (same worker as last turn)")
+    # Alternating histories defeat the same-worker shortcut, as on a worker that did not serve the last turn
+    other = state._replace(history=state.history[2:] + [("human", "Another message"), ("ai", "Another reply")])
+    alternating = itertools.cycle([other, state])
+    print(f"  restore_state      : {per_call_us(lambda: agent.restore_state(next(alternating))):7.1f} us (other worker)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {"memory": MemorySessionStore(), "sqlite": SQLiteSessionStore(os.path.join(tmp, "sessions.db"))}
+        for name, store in stores.items():
+            store.save("warm", state)
+            save = per_call_us(lambda: store.save("bench", state))
+            load = per_call_us(lambda: store.load("bench"))
+            print(f"  {name + ' save/load':<19}: {save:7.1f} / {load:.1f} us")
+
+        with open(CORPUS, encoding="utf-8") as f:
+            conversation = next(c for c in json.load(f) if c["name"] == "search-and-book-london")
+        os.chdir(tmp)  # the booking tool writes hotel_bookings.csv here
+        with contextlib.redirect_stdout(io.StringIO()):
+            spans, final = asyncio.run(handover(conversation, stores["sqlite"]))
+        booking = next(
+            span for turn in spans for span in turn if span["name"] == "hotel_booking_tool"
+        )
+        booked = open("hotel_bookings.csv").read().strip() if os.path.exists("hotel_bookings.csv") else ""
+        print(
+            f"handover over SQLite, new agent every turn: city {final.prefs.get('city')}, "
+            f"{len(final.search_results)} results kept, booking tool {booking['status']}, "
+            f"booked: {booked.split(',')[0] or 'nothing'}"
+        )
+        stores["sqlite"].close()
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == "__main__":
+    main()
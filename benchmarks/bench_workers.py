@@ -0,0 +1,164 @@
+"""Search throughput of the backend with 1..N uvicorn workers.
+
+Starts a local stand-in for the RapidAPI search endpoint (100 hotels from
+``services.fakes.fake_search_payload`` per response, 200 ms latency), then
+for each worker count starts the backend with the shared cache enabled and
+drives it with several client processes for a fixed time. Requests cycle through SEARCHES distinct searches and all
+sort orders, so after the first few seconds the work is the CPU-bound
+cached path (filter, sort, serialize, compress). Upstream calls are
+reported too: with the shared cache they stay close to SEARCHES however
+many workers there are.
+
+    python benchmarks/bench_workers.py [max_workers]
+"""
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chatbot"))
+
+from services.fakes import fake_search_payload
+
+MAX_WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+SEARCHES = 20
+HOTELS = 100
+DURATION = 10.0  # seconds per worker count
+CLIENT_PROCESSES = 4
+CLIENT_THREADS = 8
+UPSTREAM_PORT = 8901
+BACKEND_PORT = 8902
+SORTS = ["recommended", "price", "price_desc", "rating", "distance"]
+
+class FakeUpstream(BaseHTTPRequestHandler):
+    calls = 0
+    payloads = {}
+
+    def do_GET(self):
+        FakeUpstream.calls += 1
+        time.sleep(0.2)
+        body = FakeUpstream.payloads.get(self.path)
+        if body is None:
+            params = parse_qs(urlsplit(self.path).query)
+            latitude, longitude = float(params["latitude"][0]), float(params["longitude"][0])
+            body = json.dumps(fake_search_payload(latitude, longitude, HOTELS)).encode()
+            FakeUpstream.payloads[self.path] = body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def search_params(i):
+    return {
+        "latitude": 48.85,
+        "longitude": 2.35,
+        "arrival_date": f"2030-01-{(i % SEARCHES) + 1:02d}",
+        "departure_date": "2030-02-01",
+        "adults": 2,
+        "sort": SORTS[i // SEARCHES % len(SORTS)],
+    }
+
+def client(deadline, counts):
+    session = requests.Session()
+    done = 0
+    i = random.randrange(1000)
+    while time.time() < deadline:
+        response = session.get(
+            f"http://127.0.0.1:{BACKEND_PORT}/api/hotels/search",
+            params=search_params(i),
+            headers={"Accept-Encoding": "br, gzip"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        done += 1
+        i += 1
+    counts.append(done)
+
+def client_process(deadline, queue):
+    counts = []
+    threads = [threading.Thread(target=client, args=(deadline, counts)) for _ in range(CLIENT_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queue.put(sum(counts))
+
+def wait_until_up(timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{BACKEND_PORT}/api/test", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError("backend did not start")
+
+def run(workers, tmp):
+    env = dict(
+        os.environ,
+        BACKEND_WORKERS=str(workers),
+        SHARED_CACHE_ENABLED="true",
+        SHARED_CACHE_PATH=os.path.join(tmp, f"shared-{workers}.db"),
+        HOTEL_CATALOG_PATH=os.path.join(tmp, f"catalog-{workers}.db"),
+        PRICE_HISTORY_ENABLED="false",
+        WARM_ENABLED="false",
+        RAPIDAPI_KEY="bench",
+        RAPIDAPI_BASE_URL=f"http://127.0.0.1:{UPSTREAM_PORT}",
+        UPSTREAM_RATE_PER_SEC="1000",
+        UPSTREAM_BURST="1000",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(BACKEND_PORT),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        wait_until_up()
+        FakeUpstream.calls = 0
+        queue = multiprocessing.Queue()
+        deadline = time.time() + DURATION
+        clients = [multiprocessing.Process(target=client_process, args=(deadline, queue)) for _ in range(CLIENT_PROCESSES)]
+        for process in clients:
+            process.start()
+        total = sum(queue.get() for _ in clients)
+        for process in clients:
+            process.join()
+        return total / DURATION, FakeUpstream.calls
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    upstream = ThreadingHTTPServer(("127.0.0.1", UPSTREAM_PORT), FakeUpstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    print(f"{os.cpu_count()} CPUs, {SEARCHES} distinct searches, {DURATION:.0f} s per run")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        workers = 1
+        while workers <= MAX_WORKERS:
+            throughput, upstream_calls = run(workers, tmp)
+            baseline = baseline or throughput
+            print(
+                f"  {workers:>2} worker(s): {throughput:8.1f} req/s  "
+                f"x{throughput / baseline:4.2f}  upstream calls {upstream_calls}"
+            )
+            workers *= 2
+    upstream.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,164 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain.prompts import PromptTemplate
-from langchain.memory import ConversationBufferMemory
-from tools.date_tool import DateTool
-from tools.geo_location_tool import GeoLocationTool
-from tools.hotel_search_tool import HotelSearchTool
-from tools.hotel_booking_tool import HotelBookingTool
-from tools.update_preference_tool import UpdatePreferenceTool
+# LangChain, the Gemini client and the tools are imported where they are
+# first needed, so importing this module (and starting the API) stays fast.
 from models.hotel_models import UserPreferences
+import asyncio
 import logging
+import os
+import threading
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Let the model request several independent tool calls in one step; they run concurrently
+AGENT_PARALLEL_TOOLS = os.getenv("AGENT_PARALLEL_TOOLS", "true").lower() == "true"
+
+PARALLEL_TOOLS_GUIDELINE = """- If the user gives several independent details at once, list one Action/Action Input pair per tool call in the same step, e.g. set_destination and update_preference_tool together. They run at the same time and all results come back in one Observation.
+"""
+
 class HotelBookingAgent:
-    def __init__(self, api_key: str):
+    """ReAct agent over the booking tools.
+
+    The LLM client, tools, memory and executor are built on first use, or
+    ahead of time with ``warm_up``, so constructing the agent is cheap.
+    ``llm``, ``hotel_service`` and ``geo_service`` replace Gemini and the
+    tool backends, e.g. with ``services.fakes`` for offline runs.
+    """
+
+    def __init__(self, api_key: str, llm=None, hotel_service=None, geo_service=None):
         self.api_key = api_key
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=api_key,
-            temperature=0.2
-        )
         self.user_prefs = UserPreferences()
-        self.tools = self._initialize_tools()
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-        self.agent_executor = self._create_agent()
+        self.hotel_service = hotel_service
+        self.geo_service = geo_service
+        self.last_trace = None
+        self._llm = llm
+        self._tools = None
+        self._memory = None
+        self._agent_executor = None
+        self._trace_exporter = None
+        self._lock = threading.RLock()
+
+    @property
+    def llm(self):
+        with self._lock:
+            if self._llm is None:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                self._llm = ChatGoogleGenerativeAI(
+                    model="gemini-2.0-flash",
+                    google_api_key=self.api_key,
+                    temperature=0.2
+                )
+            return self._llm
+
+    @property
+    def tools(self):
+        with self._lock:
+            if self._tools is None:
+                self._tools = self._initialize_tools()
+            return self._tools
+
+    @property
+    def memory(self):
+        with self._lock:
+            if self._memory is None:
+                from langchain.memory import ConversationBufferMemory
+                self._memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+            return self._memory
+
+    @property
+    def agent_executor(self):
+        with self._lock:
+            if self._agent_executor is None:
+                self._agent_executor = self._create_agent()
+            return self._agent_executor
+
+    @property
+    def trace_exporter(self):
+        with self._lock:
+            if self._trace_exporter is None:
+                from services.tracing import get_exporter
+                self._trace_exporter = get_exporter() or False
+            return self._trace_exporter
+
+    @property
+    def is_ready(self) -> bool:
+        return self._agent_executor is not None
+
+    def warm_up(self) -> None:
+        """Import the LLM stack and build the executor now. Blocking."""
+        self.agent_executor
+        self.trace_exporter
+
+    def export_state(self):
+        """Preferences, recent history and last search results as a ``SessionState``."""
+        from services.session_store import SEARCH_RESULT_FIELDS, SESSION_HISTORY_MESSAGES, SessionState
+
+        history = []
+        if self._memory is not None:
+            messages = self._memory.chat_memory.messages[-SESSION_HISTORY_MESSAGES:]
+            history = [(message.type, message.content) for message in messages]
+        results = self.hotel_service.search_results if self.hotel_service else []
+        return SessionState(
+            prefs=self.user_prefs.snapshot(),
+            history=history,
+            search_results=[[hotel.get(field) for field in SEARCH_RESULT_FIELDS] for hotel in results],
+        )
+
+    def restore_state(self, state) -> None:
+        """Replace this agent's session state with ``state`` (from ``export_state``)."""
+        from services.session_store import SEARCH_RESULT_FIELDS
+
+        # The tools hold this UserPreferences object, so it is updated in place
+        self.user_prefs.restore(state.prefs)
+
+        if state.history or self._memory is not None:
+            from langchain_core.messages import AIMessage, HumanMessage
+            chat_memory = self.memory.chat_memory
+            messages = chat_memory.messages[-len(state.history):] if state.history else []
+            # Usually this worker served the previous turn; building messages is the costly part
+            if [(message.type, message.content) for message in messages] != state.history:
+                messages = [
+                    HumanMessage(content=text) if role == "human" else AIMessage(content=text)
+                    for role, text in state.history
+                ]
+            chat_memory.messages = messages
+
+        if state.search_results or self.hotel_service is not None:
+            self.tools
+            self.hotel_service.search_results = [dict(zip(SEARCH_RESULT_FIELDS, row)) for row in state.search_results]
+
+    def _export_trace(self, trace) -> None:
+        exporter = self.trace_exporter
+        if exporter:
+            # File or network I/O stays off the event loop
+            asyncio.get_running_loop().run_in_executor(None, exporter.export, trace)
 
     def _initialize_tools(self):
+        from tools.date_tool import DateTool
+        from tools.set_destination_tool import SetDestinationTool
+        from tools.hotel_search_tool import HotelSearchTool
+        from tools.hotel_booking_tool import HotelBookingTool
+        from tools.update_preference_tool import UpdatePreferenceTool
+        from services.geo_service import GeoService
+        from services.hotel_service import HotelService
+
+        # Search and booking share one service: booking picks from its search results
+        self.hotel_service = self.hotel_service or HotelService()
+        self.geo_service = self.geo_service or GeoService()
         return [
-            DateTool(),
-            GeoLocationTool(user_prefs=self.user_prefs),
-            HotelSearchTool(user_prefs=self.user_prefs),
-            HotelBookingTool(user_prefs=self.user_prefs),
+            DateTool(user_prefs=self.user_prefs),
+            SetDestinationTool(user_prefs=self.user_prefs, geo_service=self.geo_service),
+            HotelSearchTool(user_prefs=self.user_prefs, hotel_service=self.hotel_service),
+            HotelBookingTool(user_prefs=self.user_prefs, hotel_service=self.hotel_service),
             UpdatePreferenceTool(user_prefs=self.user_prefs)
         ]
 
     def _create_agent(self):
+        from langchain.agents import AgentExecutor, create_react_agent
+        from langchain.prompts import PromptTemplate
+        from agents.parallel_react import create_parallel_react_agent
+
         prompt_template = PromptTemplate(
-            input_variables=["tools", "tool_names", "input", "agent_scratchpad", "chat_history"],
+            input_variables=["tools", "tool_names", "input", "agent_scratchpad", "chat_history", "parallel_guideline"],
             template="""
 You are a hotel booking assistant. You have access to these tools: {tools}
 
@@ -59,39 +181,36 @@ Observation: [result from the tool]
 [When you have a response for the user or need to ask a question:]
 Final Answer: [your message to the user]
 
-When you receive information from the user, use the update_preference_tool to store it. The update_preference_tool takes input in the format 'field=value', where field can be: city, check_in, nights, adults, rooms, latitude, longitude.
+When the user names a destination, use set_destination with the city name; it stores the city, latitude and longitude in one step. For everything else, use the update_preference_tool to store it. The update_preference_tool takes input in the format 'field=value', where field can be: check_in, nights, adults, rooms.
 
 Example:
 Question: I want to book a hotel in Paris.
-Thought: I need to update the city to Paris and automatically fetch its coordinates.
-Action: update_preference_tool
-Action Input: city=Paris
-Observation: Updated city to Paris
-Thought: Now I need to get the latitude and longitude for Paris.
-Action: geo_location_tool
+Thought: I need to set the destination to Paris.
+Action: set_destination
 Action Input: Paris
-Observation: Latitude=48.8566, Longitude=2.3522
-Action: update_preference_tool
-Action Input: latitude=48.8566, longitude=2.3522
-Observation: Updated coordinates for Paris
+Observation: Destination set to Paris (latitude=48.8566, longitude=2.3522)
 Thought: Now I need the check-in date.
 Final Answer: What is your desired check-in date?
 
 Guidelines:
 - If you need information, ask the user with a Final Answer, but only for details not yet stored.
-- When the user provides information, use update_preference_tool to save it before proceeding.
+- When the user provides information, save it (set_destination or update_preference_tool) before proceeding.
 - Required details are: city, latitude, longitude, check_in, nights, adults, rooms. Use hotel_search_tool only when all are set.
-- Use date_tool to get today’s date if needed (e.g., for relative dates like 'tomorrow').
+- Pass dates the way the user said them, e.g. check_in=next friday or check_in=March 16 for 4 nights; they are resolved to calendar dates for you. Use date_tool only to look up a date without storing it.
 - Do not use tools to ask questions; use Final Answer for that.
 - Ask for one piece of information at a time unless the user provides multiple details.
 - Check the chat history to avoid asking for information already provided.
-
+{parallel_guideline}
 Begin!
 Question: {input}
 {agent_scratchpad}
 """
         )
-        agent = create_react_agent(
+        prompt_template = prompt_template.partial(
+            parallel_guideline=PARALLEL_TOOLS_GUIDELINE if AGENT_PARALLEL_TOOLS else ""
+        )
+        create_agent = create_parallel_react_agent if AGENT_PARALLEL_TOOLS else create_react_agent
+        agent = create_agent(
             llm=self.llm,
             tools=self.tools,
             prompt=prompt_template
@@ -105,10 +224,22 @@ Question: {input}
             max_iterations=5
         )
 
-    async def process_message(self, user_input: str) -> str:
+    async def process_message(self, user_input: str, session_id: Optional[str] = None) -> str:
+        tracer = None
+        error = None
         try:
-            response = await self.agent_executor.ainvoke({"input": user_input})
+            if not self.is_ready:
+                # Build off the event loop; other requests keep being served
+                await asyncio.to_thread(self.warm_up)
+            from services.tracing import TurnTracer
+            tracer = TurnTracer(user_input, session_id=session_id)
+            response = await self.agent_executor.ainvoke({"input": user_input}, config={"callbacks": [tracer]})
             return response["output"]
         except Exception as e:
+            error = e
             logger.error(f"Processing error: {str(e)}")
-            return "Sorry, I encountered an error. Let's try that again."
\ No newline at end of file
+            return "Sorry, I encountered an error. Let's try that again."
+        finally:
+            if tracer is not None:
+                self.last_trace = tracer.finish(error)
+                self._export_trace(self.last_trace)
\ No newline at end of file
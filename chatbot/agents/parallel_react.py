@@ -0,0 +1,78 @@
+# agents/parallel_react.py
+"""ReAct agent that may request several tool calls in one step.
+
+The model lists one or more ``Action:``/``Action Input:`` pairs; the parser
+returns them together, so ``AgentExecutor`` treats the agent as multi-action
+and, on the async path, runs the tools concurrently with ``asyncio.gather``.
+All observations of a step come back under a single ``Observation:`` so the
+transcript keeps one observation per model call.
+"""
+import re
+from typing import List, Sequence, Tuple, Union
+
+from langchain.agents.agent import AgentOutputParser
+from langchain.agents.output_parsers import ReActSingleInputOutputParser
+from langchain.agents.output_parsers.react_single_input import FINAL_ANSWER_ACTION, FINAL_ANSWER_AND_PARSABLE_ACTION_ERROR_MESSAGE
+from langchain_core.agents import AgentAction, AgentFinish
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnablePassthrough
+from langchain_core.tools import BaseTool, render_text_description
+
+_ACTION = re.compile(
+    r"Action\s*\d*\s*:[\s]*(.*?)[\s]*Action\s*\d*\s*Input\s*\d*\s*:[\s]*(.*?)(?=\n\s*(?:Action\s*\d*|Thought)\s*:|\Z)",
+    re.DOTALL,
+)
+
+class ParallelReActOutputParser(AgentOutputParser):
+    """Parses ReAct output with any number of single-input actions.
+
+    Every action of one reply carries the full reply as its ``log``, which is
+    how ``format_scratchpad`` groups them back into one step. Replies without
+    an action are handled exactly like ``ReActSingleInputOutputParser``.
+    """
+
+    def parse(self, text: str) -> Union[List[AgentAction], AgentFinish]:
+        matches = _ACTION.findall(text)
+        if not matches:
+            return ReActSingleInputOutputParser().parse(text)
+        if FINAL_ANSWER_ACTION in text:
+            raise OutputParserException(f"{FINAL_ANSWER_AND_PARSABLE_ACTION_ERROR_MESSAGE}: {text}")
+        return [AgentAction(tool.strip(), tool_input.strip().strip('"'), text) for tool, tool_input in matches]
+
+    @property
+    def _type(self) -> str:
+        return "parallel-react"
+
+def format_scratchpad(intermediate_steps: Sequence[Tuple[AgentAction, str]]) -> str:
+    """Like ``format_log_to_str``, with the actions of one reply under one Observation."""
+    thoughts = ""
+    i = 0
+    while i < len(intermediate_steps):
+        action, observation = intermediate_steps[i]
+        group = [(action, observation)]
+        while i + len(group) < len(intermediate_steps) and intermediate_steps[i + len(group)][0].log == action.log:
+            group.append(intermediate_steps[i + len(group)])
+        i += len(group)
+
+        thoughts += action.log
+        if len(group) == 1:
+            thoughts += f"\nObservation: {observation}\nThought: "
+        else:
+            results = "\n".join(f"- {step.tool}: {result}" for step, result in group)
+            thoughts += f"\nObservation:\n{results}\nThought: "
+    return thoughts
+
+def create_parallel_react_agent(llm, tools: Sequence[BaseTool], prompt):
+    """``create_react_agent`` with ``ParallelReActOutputParser`` and ``format_scratchpad``."""
+    prompt = prompt.partial(
+        tools=render_text_description(list(tools)),
+        tool_names=", ".join(tool.name for tool in tools),
+    )
+    agent = (
+        RunnablePassthrough.assign(agent_scratchpad=lambda x: format_scratchpad(x["intermediate_steps"]))
+        | prompt
+        | llm.bind(stop=["\nObservation"])
+        | ParallelReActOutputParser()
+    )
+    # AgentExecutor picks its multi-action wrapper from the declared output type
+    return agent.with_types(output_type=Union[List[AgentAction], AgentFinish])
@@ -3,8 +3,9 @@ import os
 import asyncio
 import argparse
 import logging
+import math
+import uuid
 from dotenv import load_dotenv
-from agents.hotel_booking_agent import HotelBookingAgent
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +28,8 @@ def check_required_env_vars():
 
 async def run_cli_mode():
     """Run the hotel booking agent in command-line interface mode."""
+    from agents.hotel_booking_agent import HotelBookingAgent
+
     agent = HotelBookingAgent(api_key=os.getenv("GEMINI_API_KEY"))
     
     print("Welcome to the Hotel Booking Assistant!")
@@ -48,19 +51,63 @@ async def run_cli_mode():
             logger.error(f"Error processing message: {str(e)}")
             print(f"I'm sorry, I encountered an error: {str(e)}. Please try again.")
 
-def run_api_mode():
-    """Run the hotel booking agent as a FastAPI service."""
+def create_app():
+    """Build the FastAPI app; one per worker process."""
+    from contextlib import asynccontextmanager
+    from cachetools import LRUCache
     from fastapi import FastAPI, Request
     from fastapi.responses import JSONResponse
-    import uvicorn
-    
-    app = FastAPI(title="Hotel Booking API")
+    from agents.hotel_booking_agent import HotelBookingAgent
+    from services.admission import AdmissionController, Overloaded
+    from services.session_store import get_session_store
+
+    # Warmed at startup; session agents share its LLM client
     agent = HotelBookingAgent(api_key=os.getenv("GEMINI_API_KEY"))
+    session_store = get_session_store()
+    # Agents of recent sessions; their state is reloaded from the store every turn
+    session_agents = LRUCache(maxsize=int(os.getenv("SESSION_AGENT_CACHE", "256")))
+    # Bounds turns in flight and orders the turns of each session, across
+    # workers through the store's session leases
+    admission = AdmissionController(leases=session_store if session_store.shared else None)
+
+    async def session_agent(session_id: str) -> HotelBookingAgent:
+        state = await asyncio.to_thread(session_store.load, session_id)
+        cached = session_agents.get(session_id)
+        if cached is None or state is None:
+            # New or expired session: start from a clean agent
+            llm = await asyncio.to_thread(lambda: agent.llm)
+            cached = session_agents[session_id] = HotelBookingAgent(api_key=agent.api_key, llm=llm)
+        if not cached.is_ready:
+            await asyncio.to_thread(cached.warm_up)
+        if state is not None:
+            cached.restore_state(state)
+        return cached
+
+    async def warm_up_agent():
+        try:
+            await asyncio.to_thread(agent.warm_up)
+            logger.info("Agent ready")
+        except Exception as e:
+            logger.error(f"Agent warm-up failed: {str(e)}")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Accept health checks immediately; the LLM stack loads in the background
+        warm_up = asyncio.create_task(warm_up_agent())
+        yield
+        warm_up.cancel()
+        session_store.close()
+        from services.geo_service import aclose_clients
+        await aclose_clients()
+
+    app = FastAPI(title="Hotel Booking API", lifespan=lifespan)
     
     @app.post("/chat")
     async def chat(request: Request):
         data = await request.json()
         user_message = data.get("message", "")
+        # Turns of one conversation share a session id; any worker can serve them
+        session_id = data.get("session_id") or uuid.uuid4().hex
         
         if not user_message:
             return JSONResponse(
@@ -69,8 +116,17 @@ def run_api_mode():
             )
         
         try:
-            response = await agent.process_message(user_message)
-            return {"response": response}
+            async with admission.admit(session_id):
+                session = await session_agent(session_id)
+                response = await session.process_message(user_message, session_id=session_id)
+                await asyncio.to_thread(session_store.save, session_id, session.export_state())
+            return {"response": response, "session_id": session_id}
+        except Overloaded as e:
+            return JSONResponse(
+                status_code=e.status_code,
+                content={"error": e.reason, "session_id": session_id},
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            )
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
             return JSONResponse(
@@ -81,11 +137,38 @@ def run_api_mode():
     # Add a health check endpoint
     @app.get("/health")
     async def health_check():
-        return {"status": "healthy"}
+        # Liveness: answers before the agent is warm
+        return {"status": "healthy", "agent": "ready" if agent.is_ready else "warming"}
+
+    @app.get("/ready")
+    async def readiness_check():
+        if not agent.is_ready:
+            return JSONResponse(status_code=503, content={"status": "warming"})
+        return {"status": "ready"}
     
+    @app.get("/metrics")
+    async def metrics():
+        from services.hotel_service import upstream_limiter
+        return {
+            "upstream": upstream_limiter.snapshot(),
+            "sessions": session_store.snapshot(),
+            "admission": admission.snapshot(),
+        }
+
+    return app
+
+def run_api_mode():
+    """Run the hotel booking agent as a FastAPI service."""
+    import uvicorn
+    from services.session_store import CHATBOT_WORKERS
+
     # Start the API server
     logger.info("Starting API server on http://localhost:8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if CHATBOT_WORKERS > 1:
+        # Workers import the app themselves and share sessions through the store
+        uvicorn.run("main:create_app", factory=True, host="0.0.0.0", port=8000, workers=CHATBOT_WORKERS)
+    else:
+        uvicorn.run(create_app(), host="0.0.0.0", port=8000)
 
 if __name__ == "__main__":
     # Parse command line arguments
@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Dict, Optional
 from datetime import datetime, date, timedelta
+from services.date_parser import resolve
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import threading
 
 class Coordinates(BaseModel):
     latitude: Optional[float] = Field(None, description="Latitude coordinate of the location")
@@ -20,6 +23,9 @@ class UserPreferences(BaseModel):
     nights: Optional[int] = Field(None, description="Number of nights to stay")
     children_age: Optional[str] = Field(None, description="Ages of children, comma-separated")
     currency_code: str = Field("EUR", description="Currency code for pricing")
+    timezone: Optional[str] = Field(None, description="IANA timezone that relative dates are read in")
+    # Tools of one agent step may run concurrently; each update is applied atomically
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
     
     def is_ready_for_search(self) -> bool:
         """Check if all required fields are set for a hotel search."""
@@ -32,15 +38,52 @@ class UserPreferences(BaseModel):
             self.room_qty is not None
         )
     
+    def snapshot(self) -> Dict[str, Any]:
+        """The set fields in JSON form, as one consistent copy."""
+        with self._lock:
+            return self.model_dump(mode="json", exclude_none=True)
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Replace every field with those of a ``snapshot``, in place."""
+        restored = UserPreferences.model_validate(data)
+        with self._lock:
+            for name in UserPreferences.model_fields:
+                setattr(self, name, getattr(restored, name))
+
+    def set_destination(self, city: str, latitude: float, longitude: float) -> None:
+        """Set the city and its coordinates together."""
+        with self._lock:
+            self._set_destination(city, latitude, longitude)
+
+    def _set_destination(self, city: str, latitude: float, longitude: float) -> None:
+        self.city = city
+        self.latitude = latitude
+        self.longitude = longitude
+        self.coordinates = Coordinates(latitude=latitude, longitude=longitude)
+
     def update(self, field: str, value: str) -> str:
         """Update a preference field with the given value."""
+        with self._lock:
+            return self._update(field, value)
+
+    def _update(self, field: str, value: str) -> str:
         try:
             if field == "city":
                 self.city = value
             elif field in ["latitude", "longitude"]:
                 setattr(self, field, float(value))
             elif field == "check_in":
-                self.check_in = datetime.strptime(value, "%Y-%m-%d").date()
+                try:
+                    self.check_in = datetime.strptime(value, "%Y-%m-%d").date()
+                except ValueError:
+                    # Phrases like "next friday for 3 nights" are resolved locally
+                    resolved = resolve(value, timezone=self.timezone)
+                    if resolved is None:
+                        return f"Could not read a date from '{value}'. Use YYYY-MM-DD or a phrase like 'next friday'."
+                    self.check_in = resolved.check_in
+                    if resolved.nights:
+                        self.nights = resolved.nights
+                    value = resolved.as_update().replace("check_in=", "", 1)
                 # Update check_out if nights is set
                 if self.nights is not None:
                     self.check_out = self.check_in + timedelta(days=self.nights)
@@ -72,6 +115,12 @@ class UserPreferences(BaseModel):
                 self.children_age = value
             elif field == "currency_code":
                 self.currency_code = value.upper()
+            elif field == "timezone":
+                try:
+                    ZoneInfo(value)
+                except (ZoneInfoNotFoundError, ValueError):
+                    return f"Invalid {field} value: {value}. Use an IANA name like Europe/Paris."
+                self.timezone = value
             else:
                 return f"Invalid field: {field}"
             
@@ -0,0 +1,229 @@
+# services/admission.py
+import asyncio
+import math
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+
+# Turns running at once; each can make up to max_iterations LLM calls
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "8"))
+# Turns waiting for a slot before new ones are shed with 503
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", "32"))
+# Longest a turn waits for a slot (or for the session's previous turn)
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "10"))
+# Turns of one session waiting behind the running one before 429
+CHAT_SESSION_QUEUE = int(os.getenv("CHAT_SESSION_QUEUE", "2"))
+_LEASE_POLL_INTERVAL = 0.05  # seconds between tries for a session lease held by another worker
+_WAIT_SAMPLES = 1024
+_TURN_SECONDS_ALPHA = 0.2  # weight of the newest turn in the duration average
+
+class Overloaded(Exception):
+    """A turn was not admitted; maps to an HTTP status with ``Retry-After``."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+class FifoSlots:
+    """``limit`` slots handed to waiters strictly in arrival order.
+
+    Waiters park on plain futures and a released slot is passed straight to
+    the oldest one, so a timeout or a cancelled request can never lose or
+    duplicate a slot. Event-loop only, no locking.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def idle(self) -> bool:
+        return self.in_use == 0 and not self.waiters
+
+    def try_take(self) -> bool:
+        if self.in_use < self.limit and not self.waiters:
+            self.in_use += 1
+            return True
+        return False
+
+    async def take(self, timeout: float) -> bool:
+        """Wait for a slot; False if none came within ``timeout`` seconds."""
+        if self.try_take():
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except BaseException:
+            # Cancelled after the slot was handed over: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter; in_use stays the same
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+class AdmissionController:
+    """Global concurrency limit with a bounded FIFO queue, plus one turn at a time per session.
+
+    A turn first waits behind earlier turns of its session, then for a global
+    slot, so a queued follow-up message never holds a slot. Turns are shed
+    instead of queued when the queue is full or the expected wait is longer
+    than ``queue_timeout``: 503 for global overload, 429 when one session
+    sends more than ``session_queue`` messages ahead of its replies.
+
+    Per-session order is kept in process; with several workers, ``leases``
+    (the shared session store) also makes a turn wait while another worker
+    runs a turn of the same session.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = CHAT_MAX_CONCURRENCY,
+        max_queue: int = CHAT_MAX_QUEUE,
+        queue_timeout: float = CHAT_QUEUE_TIMEOUT,
+        session_queue: int = CHAT_SESSION_QUEUE,
+        leases=None,
+    ):
+        self.slots = FifoSlots(max_concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.session_queue = session_queue
+        self.leases = leases
+        self.sessions: Dict[str, FifoSlots] = {}
+        self.turn_seconds: Optional[float] = None  # moving average of admitted turns
+        self.waits: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self.metrics: Dict[str, float] = {
+            "admitted": 0,
+            "completed": 0,
+            "rejected_queue_full": 0,
+            "rejected_wait_too_long": 0,
+            "rejected_timeout": 0,
+            "rejected_session": 0,
+            "queue_wait_seconds": 0.0,
+        }
+
+    def expected_wait(self) -> float:
+        """Rough wait for a new turn: queued turns ahead times average turn time per slot."""
+        if self.turn_seconds is None:
+            return 0.0
+        ahead = len(self.slots.waiters) + 1
+        return self.turn_seconds * math.ceil(ahead / self.slots.limit)
+
+    def _reject(self, metric: str, status_code: int, reason: str, retry_after: Optional[float] = None) -> Overloaded:
+        self.metrics[metric] += 1
+        retry_after = retry_after if retry_after is not None else max(self.expected_wait(), 1.0)
+        return Overloaded(status_code, reason, retry_after)
+
+    async def _enter_session(self, session_id: str) -> FifoSlots:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = FifoSlots(1)
+        if len(session.waiters) >= self.session_queue:
+            raise self._reject(
+                "rejected_session", 429, "Too many messages waiting for this conversation",
+                retry_after=self.turn_seconds or 1.0,
+            )
+        try:
+            if not await session.take(self.queue_timeout):
+                raise self._reject("rejected_session", 429, "The previous message is still being answered")
+        finally:
+            if session.idle:
+                self.sessions.pop(session_id, None)
+        return session
+
+    async def _claim_lease(self, session_id: str) -> Optional[str]:
+        if self.leases is None:
+            return None
+        owner = uuid.uuid4().hex
+        deadline = time.perf_counter() + self.queue_timeout
+        while not await asyncio.to_thread(self.leases.claim, session_id, owner):
+            if time.perf_counter() >= deadline:
+                raise self._reject("rejected_session", 429, "The previous message is still being answered")
+            await asyncio.sleep(_LEASE_POLL_INTERVAL)
+        return owner
+
+    def _leave_session(self, session_id: str, session: FifoSlots) -> None:
+        session.release()
+        if session.idle:
+            self.sessions.pop(session_id, None)
+
+    async def _enter_global(self) -> float:
+        started = time.perf_counter()
+        if not self.slots.try_take():
+            if len(self.slots.waiters) >= self.max_queue:
+                raise self._reject("rejected_queue_full", 503, "The assistant is busy, please retry shortly")
+            if self.expected_wait() > self.queue_timeout:
+                # Shed now rather than after a timeout the client would wait through anyway
+                raise self._reject("rejected_wait_too_long", 503, "The assistant is busy, please retry shortly")
+            if not await self.slots.take(self.queue_timeout):
+                raise self._reject("rejected_timeout", 503, "The assistant is busy, please retry shortly")
+        waited = time.perf_counter() - started
+        self.waits.append(waited)
+        self.metrics["queue_wait_seconds"] += waited
+        self.metrics["admitted"] += 1
+        return waited
+
+    @asynccontextmanager
+    async def admit(self, session_id: str):
+        """Hold the session's turn and a global slot; raises ``Overloaded`` if not admitted."""
+        session = await self._enter_session(session_id)
+        try:
+            owner = await self._claim_lease(session_id)
+            try:
+                await self._enter_global()
+                started = time.perf_counter()
+                try:
+                    yield
+                finally:
+                    self.slots.release()
+                    elapsed = time.perf_counter() - started
+                    self.metrics["completed"] += 1
+                    self.turn_seconds = elapsed if self.turn_seconds is None else (
+                        _TURN_SECONDS_ALPHA * elapsed + (1 - _TURN_SECONDS_ALPHA) * self.turn_seconds
+                    )
+            finally:
+                if owner is not None:
+                    await asyncio.to_thread(self.leases.release, session_id, owner)
+        finally:
+            self._leave_session(session_id, session)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+
+        def percentile(q: float) -> float:
+            return round(waits[min(int(q * len(waits)), len(waits) - 1)], 4) if waits else 0.0
+
+        return {
+            **self.metrics,
+            "in_flight": self.slots.in_use,
+            "queued": len(self.slots.waiters),
+            "max_concurrency": self.slots.limit,
+            "max_queue": self.max_queue,
+            "active_sessions": len(self.sessions),
+            "turn_seconds_avg": round(self.turn_seconds or 0.0, 3),
+            "queue_wait_p50": percentile(0.5),
+            "queue_wait_p95": percentile(0.95),
+            "queue_wait_max": round(waits[-1], 4) if waits else 0.0,
+        }
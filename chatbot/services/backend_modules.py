@@ -0,0 +1,25 @@
+# services/backend_modules.py
+"""Backend modules the chatbot reuses instead of keeping its own copy.
+
+They are loaded straight from ``backend/`` by file path, so that the
+backend's top-level modules (``models`` in particular) never shadow the
+chatbot's packages on ``sys.path``. Only stand-alone modules, which import
+nothing from the backend, can be loaded this way.
+"""
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+
+def load_backend_module(name: str) -> ModuleType:
+    """Import ``backend/<name>.py`` as ``backend_<name>``, once per process."""
+    module_name = f"backend_{name}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(BACKEND_DIR, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,229 @@
+# services/date_parser.py
+"""Resolve check-in phrases ("tomorrow", "next weekend", "March 16th for 4 nights")
+to dates locally, so the model does not have to reason about the calendar.
+
+Rules, relative to today in CHATBOT_TIMEZONE (or the given zone):
+
+- ``2030-03-16``, ``16/03/2030`` (day first), ``16.03.2030``
+- ``March 16``, ``16 March``, ``Mar 16th 2030``: without a year, the next such
+  date (``Feb 29`` is the next leap day)
+- ``the 16th``: this month, or next month once the day has passed
+- ``today``, ``tonight``, ``tomorrow``, ``day after tomorrow``
+- ``in 3 days``, ``in two weeks``, ``in a month``, ``5 days from now``
+- ``friday``, ``this friday``: the coming Friday, today if it is Friday
+- ``next friday``: Friday of next week
+- ``this weekend``, ``next weekend``: Friday check-in, 2 nights; on a
+  Saturday or Sunday "this weekend" starts today and ends on Monday
+- ``next week``: next Monday; ``next month``: the 1st of next month
+- durations: ``for 4 nights``, ``3 nights``, ``for 5 days`` (5 nights),
+  ``for a week``, ``for the weekend``
+- ranges: ``from March 16 to March 20``, ``March 16-20``, ``16-20 March``,
+  ``tomorrow until sunday``
+
+    python services/date_parser.py "next friday for 3 nights"
+"""
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+CHATBOT_TIMEZONE = os.getenv("CHATBOT_TIMEZONE", "UTC")
+
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+            ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+            ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"), ("december", "dec"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+WEEKDAYS = {
+    name: number
+    for number, names in enumerate(
+        [("monday", "mon"), ("tuesday", "tue", "tues"), ("wednesday", "wed"), ("thursday", "thu", "thurs"),
+         ("friday", "fri"), ("saturday", "sat"), ("sunday", "sun")]
+    )
+    for name in names
+}
+NUMBERS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fourteen": 14, "a couple of": 2,
+}
+WEEKEND_NIGHTS = 2
+
+_MONTH = "(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+_WEEKDAY = "(" + "|".join(sorted(WEEKDAYS, key=len, reverse=True)) + r")"
+_NUMBER = r"(\d+|" + "|".join(sorted(map(re.escape, NUMBERS), key=len, reverse=True)) + ")"
+_UNIT = r"(night|day|week|month)s?"
+
+_DURATION = re.compile(rf"\bfor\s+{_NUMBER}\s+(night|day|week)s?\b|\b{_NUMBER}\s+(night)s?\b")
+_FOR_WEEKEND = re.compile(r"\bfor\s+the\s+weekend\b")
+_RANGE_WORD = re.compile(r"(?:^|\s+)(?:to|until|till|til|through|thru)\s+|\s+[-–]\s+")
+_DAY_RANGE_MONTH_FIRST = re.compile(rf"\b{_MONTH}\s+(\d{{1,2}})\s*[-–]\s*(\d{{1,2}})(?:,?\s+(\d{{4}}))?\b")
+_DAY_RANGE_DAY_FIRST = re.compile(rf"\b(\d{{1,2}})\s*[-–]\s*(\d{{1,2}})\s+(?:of\s+)?{_MONTH}(?:,?\s+(\d{{4}}))?\b")
+
+_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_NUMERIC = re.compile(r"\b(\d{1,2})[/.](\d{1,2})[/.](\d{4})\b")
+_MONTH_DAY = re.compile(rf"\b{_MONTH}\s+(\d{{1,2}})(?:,?\s+(\d{{4}}))?\b")
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})\s+(?:of\s+)?{_MONTH}(?:,?\s+(\d{{4}}))?\b")
+_DAY_OF_MONTH = re.compile(r"\bthe\s+(\d{1,2})\b")
+_OFFSET = re.compile(rf"\bin\s+{_NUMBER}\s+{_UNIT}\b|\b{_NUMBER}\s+{_UNIT}\s+(?:from\s+now|later|ahead)\b")
+_WEEKDAY_PHRASE = re.compile(rf"\b(?:(this|next|coming)\s+)?{_WEEKDAY}\b")
+_WEEKEND = re.compile(r"\b(this|next|coming)?\s*weekend\b")
+
+class DateRange(NamedTuple):
+    check_in: date
+    nights: Optional[int] = None
+
+    @property
+    def check_out(self) -> Optional[date]:
+        return self.check_in + timedelta(days=self.nights) if self.nights else None
+
+    def as_update(self) -> str:
+        """The range as update_preference_tool input."""
+        update = f"check_in={self.check_in.isoformat()}"
+        return f"{update}, nights={self.nights}" if self.nights else update
+
+def today_in(timezone: Optional[str] = None) -> date:
+    """Today's date in ``timezone`` (default CHATBOT_TIMEZONE)."""
+    try:
+        zone = ZoneInfo(timezone or CHATBOT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = ZoneInfo("UTC")
+    return datetime.now(zone).date()
+
+def _number(token: str) -> int:
+    return int(token) if token.isdigit() else NUMBERS[token]
+
+def _normalize(phrase: str) -> str:
+    text = phrase.casefold().replace(",", " , ")
+    text = re.sub(r"\b(\d{1,2})(?:st|nd|rd|th)\b", r"\1", text)
+    # "check in 3 days": the "in" belongs to the offset, keep it
+    text = re.sub(rf"\bcheck(?:ing)?[\s-]?(in\s+{_NUMBER}\s)", r"\1", text)
+    text = re.sub(r"\b(?:check(?:ing)?[\s-]?in|arriv(?:e|ing|al)|starting|on|of the)\b", " ", text)
+    return re.sub(r"\s+", " ", text).replace(" ,", ",").strip()
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+def _upcoming(month: int, day: int, year: Optional[str], today: date) -> Optional[date]:
+    if year:
+        return _safe_date(int(year), month, day)
+    # Up to 8 years ahead, for February 29 (2096 to 2104 has no leap year)
+    for year_offset in range(9):
+        found = _safe_date(today.year + year_offset, month, day)
+        if found is not None and found >= today:
+            return found
+    return None
+
+def _add_months(start: date, months: int) -> date:
+    month = start.month - 1 + months
+    year, month = start.year + month // 12, month % 12 + 1
+    day = start.day
+    while _safe_date(year, month, day) is None:
+        day -= 1
+    return date(year, month, day)
+
+def _parse_date(text: str, today: date) -> Tuple[Optional[date], Optional[int]]:
+    """First date mentioned in ``text`` and, for weekends, a default stay length."""
+    if match := _ISO.search(text):
+        return _safe_date(*map(int, match.groups())), None
+    if match := _NUMERIC.search(text):
+        day, month, year = map(int, match.groups())
+        return _safe_date(year, month, day), None
+    if match := _MONTH_DAY.search(text):
+        return _upcoming(MONTHS[match.group(1)], int(match.group(2)), match.group(3), today), None
+    if match := _DAY_MONTH.search(text):
+        return _upcoming(MONTHS[match.group(2)], int(match.group(1)), match.group(3), today), None
+    if match := _OFFSET.search(text):
+        count, unit = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+        count = _number(count)
+        if unit == "month":
+            return _add_months(today, count), None
+        return today + timedelta(days=count * (7 if unit == "week" else 1)), None
+    if "day after tomorrow" in text:
+        return today + timedelta(days=2), None
+    if re.search(r"\btomorrow\b", text):
+        return today + timedelta(days=1), None
+    if re.search(r"\b(?:today|tonight|now)\b", text):
+        return today, None
+    next_monday = today + timedelta(days=7 - today.weekday())
+    if match := _WEEKEND.search(text):
+        if match.group(1) == "next":
+            return next_monday + timedelta(days=4), WEEKEND_NIGHTS
+        if today.weekday() >= 5:
+            # Already the weekend: it starts today and ends on Monday
+            return today, 7 - today.weekday()
+        return today + timedelta(days=4 - today.weekday()), WEEKEND_NIGHTS
+    if match := _WEEKDAY_PHRASE.search(text):
+        qualifier, weekday = match.group(1), WEEKDAYS[match.group(2)]
+        if qualifier == "next":
+            return next_monday + timedelta(days=weekday), None
+        return today + timedelta(days=(weekday - today.weekday()) % 7), None
+    if re.search(r"\bnext\s+week\b", text):
+        return next_monday, None
+    if re.search(r"\bnext\s+month\b", text):
+        return _add_months(today.replace(day=1), 1), None
+    if match := _DAY_OF_MONTH.search(text):
+        day = int(match.group(1))
+        found = _safe_date(today.year, today.month, day)
+        if found is None or found < today:
+            found = _safe_date(*_add_months(today.replace(day=1), 1).timetuple()[:2], day)
+        return found, None
+    return None, None
+
+def _duration(text: str) -> Tuple[Optional[int], str]:
+    """Stay length mentioned in ``text`` and the text without it."""
+    if match := _FOR_WEEKEND.search(text):
+        return WEEKEND_NIGHTS, text[:match.start()] + text[match.end():]
+    if match := _DURATION.search(text):
+        count, unit = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+        count = _number(count)
+        return count * (7 if unit == "week" else 1), text[:match.start()] + text[match.end():]
+    return None, text
+
+def resolve(phrase: str, today: Optional[date] = None, timezone: Optional[str] = None) -> Optional[DateRange]:
+    """Check-in date and stay length described by ``phrase``, or None if no date is found."""
+    today = today or today_in(timezone)
+    text = _normalize(phrase)
+
+    if match := _DAY_RANGE_MONTH_FIRST.search(text):
+        month, first, last, year = MONTHS[match.group(1)], int(match.group(2)), int(match.group(3)), match.group(4)
+    elif match := _DAY_RANGE_DAY_FIRST.search(text):
+        first, last, month, year = int(match.group(1)), int(match.group(2)), MONTHS[match.group(3)], match.group(4)
+    else:
+        match = None
+    if match and last > first:
+        check_in = _upcoming(month, first, year, today)
+        if check_in:
+            return DateRange(check_in, last - first)
+
+    nights, text = _duration(text)
+    parts = _RANGE_WORD.split(text, maxsplit=1)
+    check_in, default_nights = _parse_date(parts[0], today)
+    if check_in is None and len(parts) == 1:
+        check_in, default_nights = _parse_date(text, today)
+    if check_in is None:
+        # Includes "until sunday" alone: there is no start to anchor the end on
+        return None
+
+    if nights is None and len(parts) == 2:
+        # The end is read relative to the start: "friday to sunday", "march 30 to april 2"
+        check_out, _ = _parse_date(parts[1], check_in)
+        if check_out is not None and check_out > check_in:
+            nights = (check_out - check_in).days
+    return DateRange(check_in, nights or default_nights)
+
+if __name__ == "__main__":
+    for phrase in sys.argv[1:] or ["tomorrow"]:
+        resolved = resolve(phrase)
+        print(f"{phrase!r}: {resolved.as_update() if resolved else 'no date found'}")
@@ -0,0 +1,199 @@
+# services/fakes.py
+"""Deterministic stand-ins for Gemini, the geocoder and RapidAPI.
+
+They plug into ``HotelBookingAgent(llm=..., hotel_service=..., geo_service=...)``
+so whole conversations run offline with fixed replies and configurable
+latency, for benchmarks and local debugging.
+"""
+import asyncio
+import math
+import random
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+FALLBACK_REPLY = "Thought: I have no scripted reply for this.\nFinal Answer: Could you rephrase that?"
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replays scripted ReAct steps.
+
+    ``transcripts`` maps a user input to the model replies for that turn,
+    one per ReAct step. The turn is found from the last ``Question:`` in the
+    prompt and the step from the number of observations after it, so the
+    replies stay aligned however the tools answer. Unknown inputs or extra
+    steps get ``FALLBACK_REPLY`` and are counted in ``unscripted``.
+    """
+
+    transcripts: Dict[str, List[str]]
+    latency: float = 0.0  # seconds per call
+    calls: int = 0
+    unscripted: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _reply(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        # The prompt's own example also has a Question, so take the last one
+        tail = prompt.rsplit("\nQuestion: ", 1)[-1]
+        step = tail.count("\nObservation:")
+        turn = max((key for key in self.transcripts if tail.startswith(key)), key=len, default=None)
+        replies = self.transcripts.get(turn, [])
+        self.calls += 1
+        if step < len(replies):
+            text = replies[step]
+        else:
+            self.unscripted += 1
+            text = FALLBACK_REPLY
+        for token in stop or []:
+            text = text.split(token, 1)[0]
+
+        input_tokens, output_tokens = len(prompt) // 4, len(text) // 4
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(messages, stop)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(messages, stop)
+
+class FakeLocation(NamedTuple):
+    latitude: float
+    longitude: float
+    address: str
+
+KNOWN_PLACES = {
+    "paris": (48.8566, 2.3522, "Paris, Île-de-France, France"),
+    "london": (51.5074, -0.1278, "London, England, United Kingdom"),
+    "rome": (41.9028, 12.4964, "Rome, Lazio, Italy"),
+    "berlin": (52.5200, 13.4050, "Berlin, Germany"),
+    "new york": (40.7128, -74.0060, "New York, United States"),
+    "tokyo": (35.6762, 139.6503, "Tokyo, Japan"),
+}
+
+def fake_photon_transport(places: Optional[Dict[str, tuple]] = None, latency: float = 0.0) -> httpx.MockTransport:
+    """``httpx`` transport answering Photon ``/api`` queries from a place table."""
+    places = KNOWN_PLACES if places is None else places
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        place = places.get(" ".join(request.url.params.get("q", "").casefold().split()))
+        features = []
+        if place:
+            latitude, longitude, address = place
+            name, _, country = address.partition(", ")
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+                "properties": {"name": name, "country": country.rpartition(", ")[2]},
+            })
+        return httpx.Response(200, json={"type": "FeatureCollection", "features": features})
+
+    return httpx.MockTransport(handler)
+
+class FakeGeocoder:
+    """Geocoder with geopy's ``geocode`` signature over a fixed place table."""
+
+    def __init__(self, places: Optional[Dict[str, tuple]] = None, latency: float = 0.0):
+        self.places = KNOWN_PLACES if places is None else places
+        self.latency = latency
+        self.calls = 0
+
+    def geocode(self, query: str, **kwargs) -> Optional[FakeLocation]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        place = self.places.get(" ".join(query.casefold().split()))
+        return FakeLocation(*place) if place else None
+
+HOTEL_NAMES = [
+    "Astoria", "Bellevue", "Continental", "Du Parc", "Excelsior", "Flora", "Grand Central",
+    "Harbour View", "Imperial", "Jardin", "Kensington", "Lumière", "Majestic", "Novotel Centre",
+    "Opera", "Palace", "Queen's Court", "Riverside", "Savoy", "Terminus",
+]
+
+def _amount(value: float, currency: str) -> Dict[str, Any]:
+    return {"value": value, "currency": currency, "amount_rounded": f"{currency} {value:.0f}"}
+
+def fake_search_payload(latitude: float, longitude: float, hotels: int = 50, currency: str = "EUR") -> Dict[str, Any]:
+    """A searchHotelsByCoordinates response with ``hotels`` results around a point.
+
+    Names are unique ("Hotel Astoria", ..., "Hotel Astoria 2", ...), so any of
+    them can be booked by name. The same point always gives the same hotels.
+    """
+    rnd = random.Random(f"{latitude:.3f},{longitude:.3f}")
+    result = []
+    for i in range(hotels):
+        name = f"Hotel {HOTEL_NAMES[i % len(HOTEL_NAMES)]}"
+        if i >= len(HOTEL_NAMES):
+            name += f" {i // len(HOTEL_NAMES) + 1}"
+        price = round(rnd.uniform(60, 600), 2)
+        taxes = round(price * 0.1, 2)
+        # Spread hotels up to ~8 km away, inside the tool's 10 km radius
+        distance, bearing = rnd.uniform(0.1, 8.0), rnd.uniform(0, 2 * math.pi)
+        result.append({
+            "hotel_id": 100000 + i,
+            "hotel_name": name,
+            "hotel_name_trans": name,
+            "city": "Fake City",
+            "city_in_trans": "in Fake City",
+            "countrycode": "xx",
+            "latitude": latitude + distance / 111.0 * math.cos(bearing),
+            "longitude": longitude + distance / (111.0 * max(math.cos(math.radians(latitude)), 0.01)) * math.sin(bearing),
+            "review_score": round(rnd.uniform(5, 10), 1),
+            "review_score_word": "Very good",
+            "review_nr": rnd.randint(1, 2000),
+            "main_photo_url": f"https://example.com/{i}.jpg",
+            "min_total_price": price,
+            "currencycode": currency,
+            "is_free_cancellable": rnd.random() < 0.5,
+            "composite_price_breakdown": {
+                "gross_amount": _amount(price, currency),
+                "net_amount": _amount(round(price * 0.9, 2), currency),
+                "excluded_amount": _amount(taxes, currency),
+                "all_inclusive_amount": _amount(price, currency),
+                "strikethrough_amount": _amount(round(price * 1.2, 2), currency) if i % 3 == 0 else None,
+                "items": [{
+                    "kind": "charge", "inclusion_type": "excluded", "name": "City tax",
+                    "item_amount": _amount(taxes, currency),
+                }],
+            },
+            "badges": [{"id": "deal", "text": "Getaway Deal", "badge_variant": "constructive"}] if i % 4 == 0 else [],
+            "accommodation_type": 204,
+            "timezone": "UTC",
+        })
+    return {"status": True, "message": "Success", "data": {"result": result}}
+
+def fake_rapidapi_transport(hotels: int = 50, latency: float = 0.0) -> httpx.MockTransport:
+    """``httpx`` transport answering hotel searches with ``fake_search_payload``."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        params = request.url.params
+        try:
+            latitude, longitude = float(params["latitude"]), float(params["longitude"])
+        except (KeyError, ValueError):
+            return httpx.Response(422, json={"status": False, "message": "latitude and longitude are required"})
+        payload = fake_search_payload(latitude, longitude, hotels, params.get("currency_code", "EUR"))
+        return httpx.Response(200, json=payload)
+
+    return httpx.MockTransport(handler)
@@ -1,15 +1,105 @@
 # services/geo_service.py
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from geopy.geocoders import Photon
 from typing import Optional, Tuple
 
+import httpx
+
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(7 * 24 * 3600)))
+PHOTON_URL = os.getenv("PHOTON_URL", "https://photon.komoot.io/api/")
+GEOCODE_TIMEOUT = float(os.getenv("GEOCODE_TIMEOUT", "5"))
+# Threads for geocoders without an async client (custom geolocators)
+GEOCODE_THREADS = int(os.getenv("GEOCODE_THREADS", "4"))
+USER_AGENT = "hotel_search_app"
+
+# Shared by every GeoService so a city is geocoded once per process
+_geocode_cache: TTLCache = TTLCache(maxsize=2048, ttl=GEOCODE_CACHE_TTL)
+_geocode_lock = threading.Lock()
+# One pooled client per event loop; an httpx.AsyncClient must stay on its loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_geocode_pool: Optional[ThreadPoolExecutor] = None
+
+def _cache_key(location_name: str) -> str:
+    return " ".join(location_name.casefold().split())
+
+def _cached(key: str) -> Optional[Tuple[float, float]]:
+    with _geocode_lock:
+        return _geocode_cache.get(key)
+
+def _remember(key: str, coordinates: Tuple[float, float]) -> None:
+    with _geocode_lock:
+        _geocode_cache[key] = coordinates
+
+def _thread_pool() -> ThreadPoolExecutor:
+    global _geocode_pool
+    with _geocode_lock:
+        if _geocode_pool is None:
+            _geocode_pool = ThreadPoolExecutor(max_workers=GEOCODE_THREADS, thread_name_prefix="geocode")
+        return _geocode_pool
+
+def _new_async_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(GEOCODE_TIMEOUT, connect=3.05),
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+        headers={"User-Agent": USER_AGENT},
+    )
+
+async def aclose_clients() -> None:
+    """Close the pooled client of the running loop (call on shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 class GeoService:
-    """Service for handling geolocation requests."""
-    
-    def __init__(self):
-        self.geolocator = Photon(user_agent="hotel_search_app", timeout=10)
-    
+    """Service for handling geolocation requests.
+
+    ``get_coordinates`` is the blocking call for sync code. Async code uses
+    ``get_coordinates_async``: Photon over a pooled ``httpx.AsyncClient``,
+    or, for a custom ``geolocator``, its blocking ``geocode`` on a small
+    thread pool. Either way the event loop never waits on the network.
+    """
+
+    def __init__(self, geolocator=None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        # Anything with geopy's ``geocode`` signature, e.g. services.fakes.FakeGeocoder
+        self.custom_geolocator = geolocator is not None
+        self.geolocator = geolocator or Photon(user_agent=USER_AGENT, timeout=10)
+        # ``transport`` replaces the network for the async Photon client, e.g. services.fakes
+        self.transport = transport
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
     def get_coordinates(self, location_name: str) -> Optional[Tuple[float, float]]:
-        """Get coordinates for a location name."""
+        """Get coordinates for a location name; successful lookups are cached."""
+        key = _cache_key(location_name)
+        cached = _cached(key)
+        if cached is not None:
+            return cached
+        coordinates = self._geocode(location_name)
+        if coordinates is not None:
+            _remember(key, coordinates)
+        return coordinates
+
+    async def get_coordinates_async(self, location_name: str) -> Optional[Tuple[float, float]]:
+        """``get_coordinates`` without blocking the event loop."""
+        key = _cache_key(location_name)
+        cached = _cached(key)
+        if cached is not None:
+            return cached
+        if self.custom_geolocator:
+            loop = asyncio.get_running_loop()
+            coordinates = await loop.run_in_executor(_thread_pool(), self._geocode, location_name)
+        else:
+            coordinates = await self._geocode_photon(location_name)
+        if coordinates is not None:
+            _remember(key, coordinates)
+        return coordinates
+
+    def _geocode(self, location_name: str) -> Optional[Tuple[float, float]]:
         try:
             location = self.geolocator.geocode(
                 location_name,
@@ -26,3 +116,31 @@ class GeoService:
         except Exception as e:
             print(f"Geocoding error: {str(e)}")
             return None
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        clients = self._clients if self.transport is not None else _async_clients
+        client = clients.get(loop)
+        if client is None or client.is_closed:
+            client = clients[loop] = _new_async_client(self.transport)
+        return client
+
+    async def _geocode_photon(self, location_name: str) -> Optional[Tuple[float, float]]:
+        try:
+            response = await self._client().get(PHOTON_URL, params={"q": location_name, "limit": 1, "lang": "en"})
+            response.raise_for_status()
+            features = response.json().get("features") or []
+            if features:
+                longitude, latitude = features[0]["geometry"]["coordinates"][:2]
+                properties = features[0].get("properties", {})
+                address = ", ".join(
+                    str(properties[part]) for part in ("name", "state", "country") if properties.get(part)
+                )
+                print(f"Found location: {address}")
+                print(f"Coordinates: {latitude}, {longitude}")
+                return (float(latitude), float(longitude))
+            print(f"No location found for: {location_name}")
+            return None
+        except Exception as e:
+            print(f"Geocoding error: {str(e)}")
+            return None
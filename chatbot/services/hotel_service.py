@@ -4,11 +4,20 @@ import os
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from geopy.distance import geodesic
+from services.backend_modules import load_backend_module
+from services.rate_limit import UpstreamLimiter
+
+# One per process so every HotelService instance shares this process's part of the quota
+upstream_limiter = UpstreamLimiter()
+# The backend's price arithmetic, so the chatbot and the UI quote the same figures
+price_math = load_backend_module("price_math")
 
 class HotelService:
     """Service for searching and booking hotels."""
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        # ``transport`` replaces the network, e.g. with services.fakes for offline runs
+        self.transport = transport
         self.api_key = os.getenv("RAPIDAPI_KEY")
         self.api_host = "booking-com15.p.rapidapi.com"
         self.search_results = []
@@ -51,8 +60,10 @@ class HotelService:
 
         try:
             # Using AsyncClient to match the FastAPI async implementation
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers, params=query_params)
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                response = await upstream_limiter.call(
+                    lambda: client.get(url, headers=headers, params=query_params)
+                )
                 response.raise_for_status()
                 raw_data = response.json()
                 
@@ -62,6 +73,8 @@ class HotelService:
                     print("No hotels found.")
                     return None
 
+                nights = price_math.stay_nights(arrival_date, departure_date)
+
                 # Format hotel data
                 formatted_hotels = []
                 for hotel in hotels:
@@ -74,10 +87,11 @@ class HotelService:
                     if distance > max_distance_km:
                         continue
                     
-                    # Create price breakdown dictionary
-                    price_breakdown = None
-                    if "composite_price_breakdown" in hotel:
-                        price_breakdown = hotel.get("composite_price_breakdown")
+                    # Flatten the nested price breakdown once; the raw dict is not kept
+                    price = float(hotel.get("min_total_price", 0))
+                    price_summary = price_math.price_figures(
+                        hotel.get("composite_price_breakdown"), price, hotel.get("currencycode"), nights
+                    )
                     
                     # Create badges list
                     badges = []
@@ -95,7 +109,7 @@ class HotelService:
                         "address": f"{hotel.get('city')}, {hotel.get('countrycode')}",
                         "city": hotel.get("city"),
                         "country_code": hotel.get("countrycode", "").upper() if hotel.get("countrycode") else "",
-                        "price": float(hotel.get("min_total_price", 0)),
+                        "price": price,
                         "currency": hotel.get("currencycode"),
                         "latitude": hotel.get("latitude"),
                         "longitude": hotel.get("longitude"),
@@ -105,7 +119,7 @@ class HotelService:
                         "photo_url": hotel.get("main_photo_url"),
                         "free_cancellation": hotel.get("is_free_cancellable", False),
                         "distance_km": round(distance, 2),
-                        "price_breakdown": price_breakdown,
+                        "price_summary": price_summary,
                         "badges": badges,
                         "accommodation_type": hotel.get("accommodation_type"),
                         "timezone": hotel.get("timezone")
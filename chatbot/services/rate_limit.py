@@ -0,0 +1,120 @@
+# services/rate_limit.py
+"""Client-side limit on the chatbot's RapidAPI calls.
+
+The chatbot shares the RapidAPI key with the backend, which limits its own
+calls in ``backend/rate_limit.py``. Searches here come from tool calls,
+some of which run on a fresh event loop of their own (``asyncio.run`` in
+``HotelSearchTool``), so nothing in this module is bound to a loop: the
+token bucket is guarded by a thread lock and callers only ever sleep.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from services.session_store import CHATBOT_WORKERS
+
+# The key's quota, as configured for the backend; the chatbot takes
+# UPSTREAM_QUOTA_SHARE of it, split between its CHATBOT_WORKERS processes
+UPSTREAM_RATE_PER_SEC = float(os.getenv("UPSTREAM_RATE_PER_SEC", "5"))
+UPSTREAM_BURST = int(os.getenv("UPSTREAM_BURST", "10"))
+UPSTREAM_QUOTA_SHARE = float(os.getenv("UPSTREAM_QUOTA_SHARE", "0.5"))
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 20.0  # seconds
+THROTTLE_STATUSES = {429, 503}
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """``Retry-After`` in seconds, given either as seconds or as an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket kept as the time the next token is free (GCRA)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * max(burst - 1, 0)
+        self._next_free = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            next_free = max(self._next_free, now)
+            self._next_free = next_free + self.interval
+            return max(next_free - self.tolerance - now, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._next_free = max(self._next_free, time.monotonic() + seconds + self.tolerance)
+
+class UpstreamLimiter:
+    """Rate limit and jittered retries of throttled (429/503) responses."""
+
+    def __init__(
+        self,
+        rate: float = UPSTREAM_RATE_PER_SEC * UPSTREAM_QUOTA_SHARE / CHATBOT_WORKERS,
+        burst: int = max(int(UPSTREAM_BURST * UPSTREAM_QUOTA_SHARE / CHATBOT_WORKERS), 1),
+        max_retries: int = UPSTREAM_MAX_RETRIES,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.metrics: Dict[str, float] = {
+            "requests": 0,
+            "throttled": 0,
+            "retries": 0,
+            "gave_up": 0,
+            "rate_wait_seconds": 0.0,
+            "backoff_seconds": 0.0,
+        }
+
+    async def call(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Run ``send`` within the rate, retrying while upstream throttles.
+
+        Returns the last response, so a request that stays throttled still
+        fails through ``raise_for_status`` in the caller.
+        """
+        attempt = 0
+        while True:
+            wait = self.bucket.reserve()
+            if wait:
+                self.metrics["rate_wait_seconds"] += wait
+                await asyncio.sleep(wait)
+            self.metrics["requests"] += 1
+            response = await send()
+            if response.status_code not in THROTTLE_STATUSES:
+                return response
+
+            self.metrics["throttled"] += 1
+            delay = retry_after_seconds(response)
+            if delay is not None:
+                self.bucket.pause(delay)
+            if attempt == self.max_retries:
+                self.metrics["gave_up"] += 1
+                return response
+            if delay is None:
+                delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            attempt += 1
+            self.metrics["retries"] += 1
+            self.metrics["backoff_seconds"] += delay
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.metrics, "rate_per_sec": round(1.0 / self.bucket.interval, 2)}
@@ -0,0 +1,183 @@
+# services/session_store.py
+"""Per-session chat state kept outside the agent, so any worker can serve any turn.
+
+A session is the user's preferences, the recent chat history and the
+hotels of the last search, serialized with orjson. ``MemorySessionStore``
+keeps the bytes in process (one worker); ``SQLiteSessionStore`` keeps them
+in one WAL-mode SQLite file shared by every worker on the host, with a
+lease per session so that only one worker runs a turn of it at a time.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import orjson
+from cachetools import TTLCache
+
+CHATBOT_WORKERS = int(os.getenv("CHATBOT_WORKERS", "1"))
+# In-process state only works with one worker, so more workers default to SQLite
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite" if CHATBOT_WORKERS > 1 else "memory").lower()
+SESSION_DB_PATH = os.getenv(
+    "SESSION_DB_PATH", os.path.join(os.path.dirname(__file__), "..", "sessions.db")
+)
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(24 * 3600)))
+# Messages of chat history kept per session (a turn is two messages)
+SESSION_HISTORY_MESSAGES = int(os.getenv("SESSION_HISTORY_MESSAGES", "20"))
+# Longest one worker may hold a session's turn before another worker may take it;
+# well above a slow turn, it only matters if a worker dies mid-turn
+SESSION_LEASE_SECONDS = float(os.getenv("SESSION_LEASE_SECONDS", "120"))
+_PURGE_EVERY = 500  # writes
+
+# Fields of a search result kept between turns: enough to book and to list
+SEARCH_RESULT_FIELDS = ("hotel_id", "name", "address", "price", "currency", "rating", "distance_km")
+
+class SessionState(NamedTuple):
+    prefs: Dict[str, Any]
+    history: List[Tuple[str, str]]  # (role, text), role is "human" or "ai"
+    search_results: List[list]  # rows of SEARCH_RESULT_FIELDS
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(
+            [self.prefs, self.history[-SESSION_HISTORY_MESSAGES:], self.search_results]
+        )
+
+    @classmethod
+    def loads(cls, data: bytes) -> "SessionState":
+        prefs, history, search_results = orjson.loads(data)
+        return cls(prefs, [tuple(message) for message in history], search_results)
+
+class MemorySessionStore:
+    """Sessions in this process only, expiring SESSION_TTL seconds after the last turn."""
+
+    # One worker: the admission controller already runs one turn per session at a time
+    shared = False
+
+    def __init__(self, ttl: int = SESSION_TTL, maxsize: int = 100_000):
+        self._sessions: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.saves = 0
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            data = self._sessions.get(session_id)
+            self.loads += 1
+        return SessionState.loads(data) if data is not None else None
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        data = state.dumps()
+        with self._lock:
+            self._sessions[session_id] = data
+            self.saves += 1
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def close(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "sessions": len(self._sessions), "loads": self.loads, "saves": self.saves}
+
+class SQLiteSessionStore:
+    """Sessions shared by every worker process through one SQLite file.
+
+    WAL mode lets workers read while another writes; a session is one
+    indexed row, so a load or save is a single statement. ``claim``/``release``
+    hold a lease per session so that two turns of one conversation never run
+    on two workers at once (the later save would overwrite the earlier turn).
+    """
+
+    shared = True
+
+    def __init__(self, path: str = SESSION_DB_PATH, ttl: int = SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.loads = 0
+        self.saves = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Connects, creating the tables, on the first statement and again after ``close``
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, updated_at REAL NOT NULL, state BLOB NOT NULL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS session_leases ("
+                "session_id TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT state FROM sessions WHERE session_id = ? AND updated_at > ?",
+                (session_id, time.time() - self.ttl),
+            ).fetchone()
+            self.loads += 1
+        return SessionState.loads(row[0]) if row is not None else None
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        data = state.dumps()
+        with self._lock:
+            now = time.time()
+            self.db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, updated_at, state) VALUES (?, ?, ?)",
+                (session_id, now, data),
+            )
+            self.saves += 1
+            if self.saves % _PURGE_EVERY == 0:
+                self.db.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl,))
+                self.db.execute("DELETE FROM session_leases WHERE expires_at < ?", (now,))
+
+    def claim(self, session_id: str, owner: str, lease_seconds: float = SESSION_LEASE_SECONDS) -> bool:
+        """Take the turn lease of ``session_id`` for ``owner``; False while another turn holds it."""
+        with self._lock:
+            now = time.time()
+            cursor = self.db.execute(
+                "INSERT INTO session_leases (session_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE session_leases.expires_at < ?",
+                (session_id, owner, now + lease_seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, session_id: str, owner: str) -> None:
+        """Give the lease back, unless it expired and another turn has taken it since."""
+        with self._lock:
+            self.db.execute(
+                "DELETE FROM session_leases WHERE session_id = ? AND owner = ?", (session_id, owner)
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self.db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": "sqlite", "path": self.path, "loads": self.loads, "saves": self.saves}
+
+def get_session_store():
+    """Store selected by SESSION_STORE (memory or sqlite)."""
+    if SESSION_STORE == "sqlite":
+        return SQLiteSessionStore()
+    if SESSION_STORE != "memory":
+        raise ValueError(f"Unknown SESSION_STORE: {SESSION_STORE}")
+    return MemorySessionStore()
@@ -0,0 +1,423 @@
+# services/tracing.py
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib import request as urllib_request
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# jsonl | otlp | off
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "jsonl").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(os.path.dirname(__file__), "..", "traces.jsonl"))
+# The JSONL file is rotated to TRACE_FILE.1 ... .N past this size (0 disables rotation)
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "3"))
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = "hotel-booking-chatbot"
+
+# Tool the AgentExecutor runs when the LLM output could not be parsed
+PARSE_ERROR_TOOL = "_Exception"
+
+def _size(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(value if isinstance(value, str) else str(value))
+
+class Span:
+    """One timed step of a turn: the turn itself, a chain, an LLM call or a tool call."""
+
+    __slots__ = ("span_id", "parent_id", "name", "kind", "start", "end", "status", "attributes")
+
+    def __init__(self, name: str, kind: str, parent_id: Optional[str] = None, span_id: Optional[str] = None):
+        self.span_id = span_id or uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.status = "ok"
+        self.attributes: Dict[str, Any] = {}
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        self.end = time.time()
+        if error is not None:
+            self.status = "error"
+            self.attributes["error"] = str(error).splitlines()[0][:300] if str(error) else type(error).__name__
+
+    @property
+    def duration_ms(self) -> float:
+        return round(((self.end or time.time()) - self.start) * 1000, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+class TurnTracer(BaseCallbackHandler):
+    """LangChain callback handler building the span tree of one chat turn.
+
+    LangChain run ids become span ids, so LLM and tool calls nest the way
+    the ``AgentExecutor`` ran them, under one ``turn`` span. Only the
+    executor and its per-iteration ``agent_step`` chains get spans; the
+    runnables inside a step (prompt, parser, ...) are folded into it.
+    """
+
+    # Cheap bookkeeping only; keeps event order and avoids a thread hop per event
+    run_inline = True
+
+    def __init__(self, user_input: str, session_id: Optional[str] = None):
+        self.trace_id = uuid.uuid4().hex
+        self.turn = Span("turn", "turn")
+        self.turn.attributes.update({"input_chars": len(user_input), "session_id": session_id})
+        self.spans: Dict[str, Span] = {self.turn.span_id: self.turn}
+        self._folded: Dict[str, str] = {}  # hidden run id -> visible ancestor span id
+        self.iterations = 0
+        self.parse_errors = 0
+        self._last_action_log = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def _parent(self, parent_run_id) -> str:
+        if parent_run_id is None:
+            return self.turn.span_id
+        parent_id = str(parent_run_id)
+        if parent_id in self.spans:
+            return parent_id
+        return self._folded.get(parent_id, self.turn.span_id)
+
+    def _open(self, run_id, parent_run_id, name: str, kind: str) -> Span:
+        parent_id = self._parent(parent_run_id)
+        span = Span(name or kind, kind, parent_id=parent_id, span_id=str(run_id))
+        with self._lock:
+            self.spans[span.span_id] = span
+        return span
+
+    def _close(self, run_id, error: Optional[BaseException] = None) -> Optional[Span]:
+        span = self.spans.get(str(run_id))
+        if span is not None:
+            span.close(error)
+        return span
+
+    @staticmethod
+    def _name(serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any], default: str) -> str:
+        return kwargs.get("name") or (serialized or {}).get("name") or default
+
+    # Chains (the executor and the agent runnable)
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        parent_id = self._parent(parent_run_id)
+        parent = self.spans[parent_id]
+        if parent is self.turn:
+            self._open(run_id, parent_run_id, self._name(serialized, kwargs, "chain"), "chain")
+        elif parent.parent_id == self.turn.span_id and parent.kind == "chain":
+            self._open(run_id, parent_run_id, "agent_step", "chain")
+        else:
+            self._folded[str(run_id)] = parent_id
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._close(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error)
+
+    # LLM calls
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        span = self._open(run_id, parent_run_id, self._name(serialized, kwargs, "chat_model"), "llm")
+        span.attributes["prompt_chars"] = sum(_size(message.content) for batch in messages for message in batch)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        span = self._open(run_id, parent_run_id, self._name(serialized, kwargs, "llm"), "llm")
+        span.attributes["prompt_chars"] = sum(len(prompt) for prompt in prompts)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        span = self._close(run_id)
+        if span is None:
+            return
+        input_tokens = output_tokens = 0
+        completion_chars = 0
+        for generations in response.generations:
+            for generation in generations:
+                completion_chars += _size(generation.text)
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+        span.attributes.update({
+            "completion_chars": completion_chars,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        })
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error)
+
+    # Tool calls
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        name = self._name(serialized, kwargs, "tool")
+        span = self._open(run_id, parent_run_id, name, "tool")
+        span.attributes["input_chars"] = _size(input_str)
+        if name == PARSE_ERROR_TOOL:
+            # handle_parsing_errors feeds the parser error back as an observation
+            span.attributes["parse_error"] = True
+            self.parse_errors += 1
+            self.iterations += 1
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        span = self._close(run_id)
+        if span is not None:
+            span.attributes["output_chars"] = _size(output)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error)
+
+    # ReAct iterations
+    def on_agent_action(self, action, *, run_id, **kwargs):
+        # Parallel actions from one model reply share its log and count once
+        if action.log != self._last_action_log:
+            self.iterations += 1
+        self._last_action_log = action.log
+
+    def on_agent_finish(self, finish, *, run_id, **kwargs):
+        self.iterations += 1
+
+    def finish(self, error: Optional[BaseException] = None) -> Dict[str, Any]:
+        """Close the turn span and return the trace record."""
+        self.turn.close(error)
+        spans = sorted(self.spans.values(), key=lambda span: span.start)
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.turn.start,
+            "duration_ms": self.turn.duration_ms,
+            "status": self.turn.status,
+            "iterations": self.iterations,
+            "parse_errors": self.parse_errors,
+            "llm_calls": sum(1 for span in spans if span.kind == "llm"),
+            "tool_calls": sum(1 for span in spans if span.kind == "tool"),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "spans": [span.to_dict() for span in spans],
+        }
+
+class JsonlExporter:
+    """Append one JSON line per turn to a local file, rotated past ``max_bytes``.
+
+    The oldest of ``backups`` rotated files is dropped, so the traces on disk
+    stay under about ``max_bytes * (backups + 1)``.
+    """
+
+    def __init__(self, path: str = TRACE_FILE, max_bytes: int = TRACE_MAX_BYTES, backups: int = TRACE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        line = json.dumps(trace, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                if self.max_bytes and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self._rotate()
+            except FileNotFoundError:
+                # Not written yet, or another worker rotated it first
+                pass
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """Trace record as an OTLP/HTTP JSON ``ExportTraceServiceRequest``."""
+    spans = []
+    for span in trace["spans"]:
+        start_ns = int(span["start"] * 1e9)
+        attributes = dict(span["attributes"], kind=span["kind"])
+        if span["kind"] == "turn":
+            attributes.update({key: trace[key] for key in ("iterations", "parse_errors", "input_tokens", "output_tokens")})
+        spans.append({
+            "traceId": trace["trace_id"],
+            # Run ids are UUIDv7, whose leading hex digits are the timestamp
+            "spanId": span["span_id"].replace("-", "")[-16:],
+            "parentSpanId": (span["parent_id"] or "").replace("-", "")[-16:],
+            "name": span["name"],
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(span["duration_ms"] * 1e6)),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in attributes.items() if value is not None
+            ],
+            "status": {"code": 2 if span["status"] == "error" else 1},
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "services.tracing"}, "spans": spans}],
+        }]
+    }
+
+class OtlpExporter:
+    """POST each turn to an OTLP/HTTP (JSON encoding) traces endpoint."""
+
+    def __init__(self, endpoint: str = TRACE_OTLP_ENDPOINT, timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        body = json.dumps(to_otlp(trace)).encode()
+        req = urllib_request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        try:
+            urllib_request.urlopen(req, timeout=self.timeout).close()
+        except OSError as e:
+            print(f"Trace export failed: {e}")
+
+def get_exporter():
+    """Exporter selected by ``TRACE_EXPORT``, or None when tracing is off."""
+    if TRACE_EXPORT == "jsonl":
+        return JsonlExporter()
+    if TRACE_EXPORT == "otlp":
+        return OtlpExporter()
+    return None
+
+# Summary report
+
+def load_traces(path: str) -> List[Dict[str, Any]]:
+    traces = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                traces.append(json.loads(line))
+    return traces
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)]
+
+def summarize(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
+    turn_ms = [trace["duration_ms"] for trace in traces]
+    by_kind = defaultdict(list)
+    by_tool = defaultdict(list)
+    for trace in traces:
+        for span in trace["spans"]:
+            by_kind[span["kind"]].append(span["duration_ms"])
+            if span["kind"] == "tool":
+                by_tool[span["name"]].append(span["duration_ms"])
+
+    total_ms = sum(turn_ms) or 1.0
+    count = len(traces) or 1
+    return {
+        "turns": len(traces),
+        "errors": sum(1 for trace in traces if trace["status"] == "error"),
+        "turn_ms": {"p50": _percentile(turn_ms, 50), "p95": _percentile(turn_ms, 95), "max": max(turn_ms, default=0.0)},
+        "avg_iterations": round(sum(trace["iterations"] for trace in traces) / count, 2),
+        "avg_llm_calls": round(sum(trace["llm_calls"] for trace in traces) / count, 2),
+        "avg_tool_calls": round(sum(trace["tool_calls"] for trace in traces) / count, 2),
+        "parse_errors": sum(trace["parse_errors"] for trace in traces),
+        "avg_input_tokens": round(sum(trace["input_tokens"] for trace in traces) / count, 1),
+        "avg_output_tokens": round(sum(trace["output_tokens"] for trace in traces) / count, 1),
+        "llm_time_share": round(sum(by_kind["llm"]) / total_ms, 3),
+        "tool_time_share": round(sum(by_kind["tool"]) / total_ms, 3),
+        "tools": {
+            name: {
+                "calls": len(durations),
+                "p50_ms": _percentile(durations, 50),
+                "p95_ms": _percentile(durations, 95),
+                "total_ms": round(sum(durations), 1),
+            }
+            for name, durations in sorted(by_tool.items(), key=lambda item: -sum(item[1]))
+        },
+    }
+
+def print_tree(trace: Dict[str, Any]) -> None:
+    children = defaultdict(list)
+    for span in trace["spans"]:
+        children[span["parent_id"]].append(span)
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for span in children.get(parent_id, []):
+            extra = " ".join(f"{key}={value}" for key, value in span["attributes"].items() if value is not None)
+            flag = " !" if span["status"] == "error" else ""
+            print(f"  {'  ' * depth}{span['name']} [{span['kind']}] {span['duration_ms']:.0f} ms{flag} {extra}")
+            walk(span["span_id"], depth + 1)
+
+    print(
+        f"trace {trace['trace_id']}: {trace['duration_ms']:.0f} ms, {trace['iterations']} iterations, "
+        f"{trace['llm_calls']} LLM / {trace['tool_calls']} tool calls, {trace['parse_errors']} parse errors"
+    )
+    walk(None, 0)
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    """Minimal OTLP/HTTP JSON receiver that appends requests to a JSONL file."""
+
+    out_path = TRACE_FILE + ".otlp"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with open(self.out_path, "ab") as f:
+            f.write(body.replace(b"\n", b" ") + b"\n")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chat turn traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summary", help="aggregate report over a JSONL trace file")
+    summary.add_argument("--file", default=TRACE_FILE)
+    summary.add_argument("--last", type=int, default=0, help="also print the span tree of the last N turns")
+
+    collect = commands.add_parser("collect", help="run a local OTLP/HTTP stand-in collector")
+    collect.add_argument("--port", type=int, default=4318)
+    collect.add_argument("--out", default=TRACE_FILE + ".otlp")
+
+    args = parser.parse_args()
+    if args.command == "collect":
+        _CollectorHandler.out_path = args.out
+        print(f"Collecting OTLP traces on :{args.port}/v1/traces into {args.out}")
+        ThreadingHTTPServer(("0.0.0.0", args.port), _CollectorHandler).serve_forever()
+        return
+
+    traces = load_traces(args.file)
+    print(json.dumps(summarize(traces), indent=2))
+    for trace in traces[-args.last:] if args.last else []:
+        print()
+        print_tree(trace)
+
+if __name__ == "__main__":
+    main()
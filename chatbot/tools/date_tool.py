@@ -1,10 +1,24 @@
 from langchain.tools import BaseTool
-from datetime import datetime
+from models.hotel_models import UserPreferences
+from services.date_parser import resolve, today_in
+from typing import Optional
 
 class DateTool(BaseTool):
     name: str = "date_tool"
-    description: str = "Returns today's date in YYYY-MM-DD format. No input required."
+    description: str = (
+        "Resolves a date phrase such as 'tomorrow', 'next friday for 3 nights' or "
+        "'March 16 to March 20' to check_in=YYYY-MM-DD[, nights=N]. "
+        "Without input, returns today's date in YYYY-MM-DD format."
+    )
+    user_prefs: Optional[UserPreferences] = None
 
     def _run(self, query: str = None) -> str:
-        """Returns today's date in YYYY-MM-DD format."""
-        return datetime.today().strftime('%Y-%m-%d')
\ No newline at end of file
+        """Resolve ``query`` to check-in/nights, or return today's date."""
+        timezone = self.user_prefs.timezone if self.user_prefs else None
+        query = (query or "").strip().strip("'\"")
+        if not query or query.lower() in ("none", "today's date"):
+            return today_in(timezone).strftime('%Y-%m-%d')
+        resolved = resolve(query, timezone=timezone)
+        if resolved is None:
+            return f"Could not resolve a date from '{query}'. Ask the user for the check-in date."
+        return resolved.as_update()
\ No newline at end of file
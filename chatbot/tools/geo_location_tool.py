@@ -1,23 +1,31 @@
 # tools/geo_location_tool.py
 from langchain.tools import BaseTool
-from geopy.geocoders import Photon
 from models.hotel_models import UserPreferences
-from typing import Optional, Tuple
+from services.geo_service import GeoService
+from pydantic import Field
 
 class GeoLocationTool(BaseTool):
     name: str = "geo_location_tool"
     description: str = "Convert city names to coordinates. Input: city name"
     user_prefs: UserPreferences
+    geo_service: GeoService = Field(default_factory=GeoService, exclude=True)
 
     def _run(self, city: str) -> str:
         try:
-            geolocator = Photon(user_agent="hotel_agent")
-            location = geolocator.geocode(city)
-            if not location:
-                return f"Could not find coordinates for {city}"
-            
-            self.user_prefs.city = city
-            self.user_prefs.coordinates = (location.latitude, location.longitude)
-            return f"Coordinates for {city}: {location.latitude}, {location.longitude}"
+            return self._set(city, self.geo_service.get_coordinates(city))
         except Exception as e:
-            return f"Geocoding error: {str(e)}"
\ No newline at end of file
+            return f"Geocoding error: {str(e)}"
+
+    async def _arun(self, city: str) -> str:
+        try:
+            return self._set(city, await self.geo_service.get_coordinates_async(city))
+        except Exception as e:
+            return f"Geocoding error: {str(e)}"
+
+    def _set(self, city: str, coordinates) -> str:
+        if not coordinates:
+            return f"Could not find coordinates for {city}"
+        
+        latitude, longitude = coordinates
+        self.user_prefs.set_destination(city, latitude, longitude)
+        return f"Coordinates for {city}: {latitude}, {longitude}"
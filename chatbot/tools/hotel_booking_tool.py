@@ -24,7 +24,7 @@ class HotelBookingTool(BaseTool):
         }
         
         booking_result = self.hotel_service.book_hotel(hotel_name, context)
-        if "confirmed" in booking_result.lower():
+        if "confirmation" in booking_result.lower():
             self._save_booking_details(hotel_name, context)
             return f"Booking confirmed for {hotel_name}."
         else:
@@ -0,0 +1,35 @@
+# tools/set_destination_tool.py
+from langchain.tools import BaseTool
+from models.hotel_models import UserPreferences
+from services.geo_service import GeoService
+from pydantic import Field
+
+class SetDestinationTool(BaseTool):
+    name: str = "set_destination"
+    description: str = (
+        "Sets the destination for the booking: stores the city and looks up its "
+        "latitude and longitude in one step. Input: city name, e.g. 'Paris'."
+    )
+    user_prefs: UserPreferences
+    geo_service: GeoService = Field(default_factory=GeoService, exclude=True)
+
+    def _run(self, city: str) -> str:
+        city = city.strip().strip("'\"")
+        if not city:
+            return "Please provide a city name."
+        return self._set(city, self.geo_service.get_coordinates(city))
+
+    async def _arun(self, city: str) -> str:
+        # The agent runs tools with ainvoke; geocode without blocking the loop
+        city = city.strip().strip("'\"")
+        if not city:
+            return "Please provide a city name."
+        return self._set(city, await self.geo_service.get_coordinates_async(city))
+
+    def _set(self, city: str, coordinates) -> str:
+        if coordinates is None:
+            return f"Could not find coordinates for {city}. Ask the user to check the city name."
+
+        latitude, longitude = coordinates
+        self.user_prefs.set_destination(city, latitude, longitude)
+        return f"Destination set to {city} (latitude={latitude}, longitude={longitude})"
@@ -2,16 +2,18 @@ from langchain.tools import BaseTool
 from models.hotel_models import UserPreferences
 from typing import Optional
 from pydantic import Field
+import re
 
 class UpdatePreferenceTool(BaseTool):
     name: str = "update_preference_tool"
-    description: str = "Updates a booking preference. Input should be in the format 'field=value', e.g., 'city=Paris', 'check_in=2025-03-16', 'nights=5'."
+    description: str = "Updates a booking preference. Input should be in the format 'field=value', e.g., 'city=Paris', 'check_in=2025-03-16', 'nights=5'. check_in also accepts phrases like 'check_in=next friday'."
     user_prefs: UserPreferences = Field(default_factory=UserPreferences, exclude=True)
     
     def _run(self, query: str) -> str:
         try:
-            if "," in query:
-                updates = query.split(",")
+            # Split only before "field=" so values may contain commas ("March 16, 2030")
+            updates = re.split(r",\s*(?=\w+\s*=)", query)
+            if len(updates) > 1:
                 results = []
                 for update in updates:
                     update = update.strip()
@@ -1,9 +1,11 @@
 # Main app.py file
 import streamlit as st
 from datetime import datetime, timedelta
-from services.api_client import search_hotels
+from services.api_client import search_hotels, suggest_locations
 from services.geocoding import get_coordinates
 from components.hotel_card import hotel_card
+from components.map_component import create_overview_map
+from streamlit_folium import folium_static
 from utils.styles import load_styles
 
 # Set page config
@@ -24,6 +26,17 @@ if 'expanded_hotels' not in st.session_state:
     st.session_state.expanded_hotels = []
 if 'search_params' not in st.session_state:
     st.session_state.search_params = {}
+if 'sort_by' not in st.session_state:
+    st.session_state.sort_by = "recommended"
+
+# Backend sort keys and their labels in the results header
+SORT_OPTIONS = {
+    "recommended": "Recommended",
+    "price": "Price: Low to High",
+    "price_desc": "Price: High to Low",
+    "rating": "Rating: High to Low",
+    "distance": "Distance",
+}
 
 def main():
     # Header with logo and tagline
@@ -140,6 +153,7 @@ def handle_search(location, check_in, check_out, adults, rooms, currency):
     coords = get_coordinates(location)
     if not coords:
         st.error("🚫 We couldn't find that location. Please try another destination.")
+        show_suggestions(location)
         return
     
     lat, lon = coords
@@ -151,7 +165,8 @@ def handle_search(location, check_in, check_out, adults, rooms, currency):
         "adults": adults,
         "room_qty": rooms,
         "currency_code": currency,
-        "radius": 10
+        "radius": 10,
+        "sort": st.session_state.sort_by
     }
     
     with st.status("Searching for the best hotels...", expanded=True) as status:
@@ -164,29 +179,51 @@ def handle_search(location, check_in, check_out, adults, rooms, currency):
             status.update(label="No hotels found", state="error", expanded=True)
             st.warning("😔 We couldn't find any hotels matching your criteria. Try adjusting your search parameters.")
 
+def show_suggestions(location):
+    """Offer close destination names, e.g. for a misspelled one"""
+    suggestions = suggest_locations(location)
+    if not suggestions:
+        return
+    st.markdown("Did you mean:")
+    cols = st.columns(len(suggestions))
+    for col, place in zip(cols, suggestions):
+        with col:
+            if st.button(place["label"], key=f"suggestion_{place['label']}", use_container_width=True):
+                st.session_state.search_params["location"] = place["label"]
+                st.rerun()
+
 def display_results(hotels):
     """Display search results with modern UI"""
-    # Results header with count and sorting options
-    st.markdown(f"""
-    <div class="results-header">
-        <div style="font-size: 1.2rem; font-weight: 600; color: #1e3a8a;">
-            Found {len(hotels)} Properties
-        </div>
-        <div>
-            <span style="color: #6b7280; margin-right: 10px;">Sort by:</span>
-            <select style="padding: 5px 10px; border-radius: 6px; border: 1px solid #d1d5db;">
-                <option>Recommended</option>
-                <option>Price: Low to High</option>
-                <option>Price: High to Low</option>
-                <option>Rating: High to Low</option>
-            </select>
+    # Results header with count and sorting options. Changing the sort reruns
+    # the search, which the backend answers from its cached result set.
+    header_col, sort_col = st.columns([3, 1])
+    with header_col:
+        st.markdown(f"""
+        <div class="results-header">
+            <div style="font-size: 1.2rem; font-weight: 600; color: #1e3a8a;">
+                Found {len(hotels)} Properties
+            </div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
+    with sort_col:
+        st.selectbox(
+            "Sort by",
+            options=list(SORT_OPTIONS),
+            format_func=SORT_OPTIONS.get,
+            key="sort_by"
+        )
+    
+    # One clustered map for the whole result set instead of a map per card
+    show_overview = st.toggle("Show overview map", value=True)
+    if show_overview:
+        overview_map = create_overview_map(hotels)
+        if overview_map:
+            folium_static(overview_map, height=420)
     
     # Display each hotel card
+    version = getattr(hotels, "version", None)
     for hotel in hotels:
-        hotel_card(hotel)
+        hotel_card(hotel, show_map=not show_overview, version=version)
 
 def display_welcome():
     """Display welcome screen with featured destinations"""
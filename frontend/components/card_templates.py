@@ -0,0 +1,306 @@
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from cachetools import LRUCache
+from jinja2 import Environment
+import pytz
+
+# Rendered fragments are kept per (result-set version, hotel_id); a new
+# search result version naturally invalidates older entries.
+CARD_CACHE_SIZE = 1024
+
+ACCOMMODATION_TYPES = {
+    201: "Apartment",
+    204: "Hotel",
+    203: "Resort",
+    202: "Guesthouse",
+    205: "Hostel",
+    208: "Villa",
+    211: "Vacation Home"
+}
+
+AMENITIES = [
+    {"icon": "wifi", "name": "Free WiFi", "category": "Connectivity"},
+    {"icon": "car", "name": "Parking", "category": "Services"},
+    {"icon": "snowflake", "name": "Air Conditioning", "category": "Comfort"},
+    {"icon": "concierge-bell", "name": "24/7 Reception", "category": "Services"},
+    {"icon": "wifi", "name": "Business Center", "category": "Services"},
+]
+
+ATTRACTIONS = [
+    {"name": "City Center", "distance": "1.2 km", "icon": "city"},
+    {"name": "Public Transport", "distance": "0.3 km", "icon": "bus"},
+    {"name": "Shopping Mall", "distance": "2.1 km", "icon": "shopping-bag"},
+    {"name": "Airport", "distance": "15.5 km", "icon": "plane"}
+]
+
+_env = Environment(autoescape=True)
+
+def _compile(source):
+    """Compile a template with per-line indentation stripped.
+
+    Streamlit's markdown renderer treats indented lines as code blocks, so the
+    HTML is flattened once here rather than on every render.
+    """
+    return _env.from_string(" ".join(line.strip() for line in source.splitlines() if line.strip()))
+
+_HEADER = _compile("""
+<h3 class="card-title">{{ name }}</h3>
+<div>📍 {{ city }}, {{ country }} | {{ stars }}</div>
+{% if review_score is not none %}
+<div class="card-review">
+    <div class="card-score" style="background-color: {{ score_color }};">{{ review_score }}</div>
+    <div>
+        <span style="font-weight: 500;">{{ review_word }}</span>
+        <span class="card-muted" style="margin-left: 5px;">({{ review_count }} reviews)</span>
+    </div>
+</div>
+{% endif %}
+<div style="margin-top: 15px;">
+    {% if original_price %}
+    <div style="display: flex; align-items: baseline;">
+        <span class="card-muted" style="text-decoration: line-through; margin-right: 8px;">{{ original_price }}</span>
+        <span class="card-price">{{ display_price }}</span>
+    </div>
+    {% else %}
+    <div class="card-price">{{ display_price }}</div>
+    {% endif %}
+    <div class="card-muted" style="font-size: 0.9rem;">excludes taxes &amp; fees</div>
+</div>
+{% if badges %}
+<div style="margin-top: 10px; display: flex; gap: 8px; flex-wrap: wrap;">
+    {% for badge in badges %}
+    <div class="card-badge" style="background-color: {{ badge.color }};">{{ badge.text }}</div>
+    {% endfor %}
+    {% if free_cancellation %}
+    <div class="card-badge" style="background-color: #16a34a;">Free Cancellation</div>
+    {% endif %}
+</div>
+{% endif %}
+""")
+
+_OVERVIEW = _compile("""
+<div style="background-color: #f9fafb; padding: 15px; border-radius: 8px;">
+    <h4 style="margin-bottom: 10px;">Hotel Overview</h4>
+    <p>
+        This modern accommodation offers comfortable rooms in a convenient location.
+        Perfect for both business and leisure travelers looking for quality accommodations.
+    </p>
+    <div style="margin-top: 15px;">
+        <div style="font-weight: 600; margin-bottom: 8px;">Quick Facts</div>
+        <div style="display: flex; flex-wrap: wrap; gap: 10px;">
+            <div class="card-fact"><span style="color: #4b5563;">Check-in:</span> After 2:00 PM</div>
+            <div class="card-fact"><span style="color: #4b5563;">Check-out:</span> Before 11:00 AM</div>
+            <div class="card-fact"><span style="color: #4b5563;">Type:</span> {{ accommodation_type }}</div>
+        </div>
+    </div>
+</div>
+""")
+
+_AMENITIES = _compile("""
+{% for category, items in amenities_by_category.items() %}
+<div class="category-title">{{ category }}</div>
+<div class="amenity-grid">
+    {% for amenity in items %}
+    <div class="amenity-card">
+        <div class="amenity-icon"><i class="fas fa-{{ amenity.icon }}"></i></div>
+        <div class="amenity-name">{{ amenity.name }}</div>
+    </div>
+    {% endfor %}
+</div>
+{% endfor %}
+<div style="margin-top: 20px; padding: 15px; background-color: #f3f4f6; border-radius: 8px; border-left: 4px solid #3b82f6;">
+    <div style="font-weight: 600; margin-bottom: 5px; color: #1e3a8a;">Note about amenities</div>
+    <p style="margin: 0; font-size: 0.9rem; color: #4b5563;">
+        Some amenities may be available for additional charges and subject to availability.
+        Please contact the property directly for specific details.
+    </p>
+</div>
+""")
+
+_PRICE_TABLE = _compile("""
+<table class="price-table" style="width:100%;">
+    <tr><th>Description</th><th style="text-align:right;">Amount</th></tr>
+    {% for row in rows %}
+    <tr class="{{ row.css }}"><td>{{ row.description }}</td><td style="text-align:right;" class="{{ row.css }}">{{ row.amount }}</td></tr>
+    {% endfor %}
+</table>
+<div style="margin-top: 20px; padding: 15px; background-color: #f9fafb; border-radius: 8px;">
+    <div style="font-weight: 600; margin-bottom: 8px;">Payment Policy</div>
+    <ul style="margin: 0; padding-left: 20px; color: #4b5563;">
+        <li>Pay now or at the property depending on the rate selected</li>
+        <li>Taxes and fees are collected separately</li>
+        <li>Some rates require full prepayment</li>
+    </ul>
+</div>
+""")
+
+_PRICE_POLICY = _compile("""
+<div style="margin-bottom: 15px; padding: 15px; background-color: #f0f9ff; border-left: 4px solid #3b82f6; border-radius: 0 8px 8px 0;">
+    <div style="font-weight: 600; margin-bottom: 8px;">Price Guarantee</div>
+    <p style="color: #4b5563; font-size: 0.9rem; margin: 0;">
+        If you find a lower price elsewhere, we'll match it and give you an additional 10% discount.
+    </p>
+</div>
+{% if free_cancellation %}
+<div style="padding: 15px; background-color: #ecfdf5; border-left: 4px solid #10b981; border-radius: 0 8px 8px 0;">
+    <div style="font-weight: 600; margin-bottom: 8px; color: #065f46;">Free Cancellation</div>
+    <p style="color: #065f46; font-size: 0.9rem; margin: 0;">
+        You can cancel this booking free of charge up to 24 hours before check-in.
+    </p>
+</div>
+{% else %}
+<div style="padding: 15px; background-color: #fef2f2; border-left: 4px solid #ef4444; border-radius: 0 8px 8px 0;">
+    <div style="font-weight: 600; margin-bottom: 8px; color: #b91c1c;">Non-Refundable</div>
+    <p style="color: #b91c1c; font-size: 0.9rem; margin: 0;">
+        This booking cannot be cancelled or modified without charges.
+    </p>
+</div>
+{% endif %}
+""")
+
+_ATTRACTIONS = _compile("""
+{% for attraction in attractions %}
+<div style="display: flex; align-items: center; padding: 10px; margin-bottom: 8px; background-color: #f9fafb; border-radius: 6px;">
+    <i class="fas fa-{{ attraction.icon }}" style="margin-right: 10px; color: #3b82f6;"></i>
+    <div>
+        <div style="font-weight: 500;">{{ attraction.name }}</div>
+        <div class="card-muted" style="font-size: 0.8rem;">{{ attraction.distance }}</div>
+    </div>
+</div>
+{% endfor %}
+""")
+
+_LOCAL_TIME = _compile("""
+<div style="margin-top: 20px; padding: 15px; background-color: #f0f9ff; border-radius: 8px;">
+    <div style="font-weight: 600; margin-bottom: 8px;">Local Time</div>
+    <div style="font-size: 1.2rem; font-weight: 500;">{{ current_time }}</div>
+    <div class="card-muted" style="font-size: 0.9rem;">{{ timezone }}</div>
+</div>
+""")
+
+def _group_amenities(amenities):
+    grouped = {}
+    for amenity in amenities:
+        grouped.setdefault(amenity["category"], []).append(amenity)
+    return grouped
+
+# Static for every hotel, so rendered exactly once
+AMENITIES_HTML = _AMENITIES.render(amenities_by_category=_group_amenities(AMENITIES))
+ATTRACTIONS_HTML = _ATTRACTIONS.render(attractions=ATTRACTIONS)
+
+BOOK_BUTTON_HTML = """<div style="margin-top: 20px; text-align: center;"><a href="#" class="card-book-button">Book Now</a></div>"""
+
+class CardFragments(NamedTuple):
+    header: str
+    overview: str
+    price_table: str
+    price_policy: str
+
+# Shared by every Streamlit session thread; cachetools caches are not thread-safe
+_card_cache = LRUCache(maxsize=CARD_CACHE_SIZE)
+_card_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _timezone(name):
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        return pytz.utc
+
+def local_time_html(timezone_name):
+    """Local time box for the Location tab; the clock is the only per-rerun part."""
+    timezone_name = timezone_name or "UTC"
+    current_time = datetime.now(_timezone(timezone_name)).strftime("%H:%M")
+    return _LOCAL_TIME.render(current_time=current_time, timezone=timezone_name)
+
+def format_money(currency, amount):
+    return f"{currency} {amount:,.2f}"
+
+def _price_summary(hotel):
+    """The backend's flat ``price_summary``, or one derived from the bare price."""
+    summary = hotel.get('price_summary')
+    if summary:
+        return summary
+    price = float(hotel.get('min_total_price', 0))
+    return {"currency": hotel.get('currencycode', 'USD'), "base": price, "taxes": 0.0, "total": price,
+            "original": None, "discount_pct": None, "per_night": price, "nights": 1}
+
+def _price_rows(summary):
+    currency = summary["currency"]
+    rows = [{"description": "Base rate", "amount": format_money(currency, summary["base"]), "css": ""}]
+    if summary.get("discount_pct"):
+        rows.append({"description": "Discount", "amount": f"-{summary['discount_pct']:g}%", "css": "discount"})
+    if summary.get("taxes"):
+        rows.append({"description": "Taxes and fees", "amount": format_money(currency, summary["taxes"]), "css": ""})
+    nights = summary.get("nights", 1)
+    if nights > 1:
+        rows.append({"description": f"Per night ({nights} nights)", "amount": format_money(currency, summary["per_night"]), "css": ""})
+    rows.append({"description": "Total price", "amount": format_money(currency, summary["total"]), "css": "total"})
+    return rows
+
+def build_card_fragments(hotel):
+    """Render the per-hotel HTML fragments of a hotel card."""
+    summary = _price_summary(hotel)
+    currency = summary["currency"]
+    review_score = hotel.get('review_score')
+    is_free_cancellable = hotel.get('is_free_cancellable', False)
+    original_price = format_money(currency, summary["original"]) if summary.get("original") else ''
+    display_price = format_money(currency, summary["base"])
+
+    score_color = None
+    if review_score is not None:
+        score = float(review_score)
+        score_color = "#166534" if score >= 8 else "#ca8a04" if score >= 6 else "#b91c1c"
+
+    badges = [
+        {
+            "text": badge.get('text', ''),
+            "color": "#059669" if badge.get('badge_variant') == "constructive" else "#2563eb",
+        }
+        for badge in hotel.get('badges') or []
+    ]
+
+    header = _HEADER.render(
+        name=hotel.get('hotel_name', 'Hotel Name Not Available'),
+        city=hotel.get('city', 'Unknown City'),
+        country=hotel.get('countrycode', ''),
+        stars='⭐' * (int(review_score) // 2 if isinstance(review_score, (int, float)) else 0),
+        review_score=review_score,
+        score_color=score_color,
+        review_word=hotel.get('review_score_word', ''),
+        review_count=hotel.get('review_nr', 0),
+        original_price=original_price,
+        display_price=display_price,
+        badges=badges,
+        free_cancellation=is_free_cancellable,
+    )
+    overview = _OVERVIEW.render(
+        accommodation_type=ACCOMMODATION_TYPES.get(hotel.get('accommodation_type'), "Accommodation")
+    )
+    price_table = _PRICE_TABLE.render(rows=_price_rows(summary))
+    price_policy = _PRICE_POLICY.render(free_cancellation=is_free_cancellable)
+    return CardFragments(header, overview, price_table, price_policy)
+
+def card_fragments(hotel, version: Optional[str] = None):
+    """Memoized ``build_card_fragments`` keyed by (result-set version, hotel_id).
+
+    Without a version there is nothing safe to key on, so the card is
+    rendered fresh.
+    """
+    if version is None:
+        return build_card_fragments(hotel)
+    key = (version, hotel.get('hotel_id'))
+    with _card_cache_lock:
+        fragments = _card_cache.get(key)
+    if fragments is None:
+        # Rendered outside the lock; two sessions may both render a card once
+        fragments = build_card_fragments(hotel)
+        with _card_cache_lock:
+            _card_cache[key] = fragments
+    return fragments
+
+def clear_card_cache():
+    with _card_cache_lock:
+        _card_cache.clear()
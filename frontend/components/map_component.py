@@ -1,4 +1,31 @@
 import folium
+from folium.plugins import FastMarkerCluster
+from html import escape
+
+# Marker factory for FastMarkerCluster. Each row is
+# [latitude, longitude, card anchor id, tooltip html]; clicking a marker
+# scrolls the Streamlit page to the matching hotel card.
+_OVERVIEW_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindTooltip(row[3]);
+    marker.on('click', function () {
+        try {
+            var card = window.top.document.getElementById(row[2]);
+            if (card) {
+                card.scrollIntoView({behavior: 'smooth', block: 'start'});
+                return;
+            }
+        } catch (e) {}
+        window.top.location.hash = row[2];
+    });
+    return marker;
+}
+"""
+
+def hotel_anchor_id(hotel):
+    """Return the HTML id used to anchor a hotel card on the results page"""
+    return f"hotel-{hotel.get('hotel_id', '')}"
 
 def create_map(hotel):
     """Create an interactive map with the hotel location"""
@@ -30,4 +57,44 @@ def create_map(hotel):
         ).add_to(m)
         
         return m
-    return None
\ No newline at end of file
+    return None
+
+def create_overview_map(hotels):
+    """Create a single clustered map plotting every hotel in the result set.
+
+    Markers are shipped to the browser as one bulk data array and built
+    client-side by FastMarkerCluster, so the page stays responsive with
+    thousands of hotels instead of one iframe per card.
+    """
+    rows = []
+    min_lat = min_lon = float('inf')
+    max_lat = max_lon = float('-inf')
+    for hotel in hotels:
+        lat = hotel.get('latitude')
+        lon = hotel.get('longitude')
+        if lat is None or lon is None:
+            continue
+        tooltip = f"<strong>{escape(str(hotel.get('hotel_name', '')))}</strong>"
+        price = hotel.get('min_total_price')
+        if price is not None:
+            tooltip += f"<br>{escape(str(hotel.get('currencycode', '')))} {float(price):.2f}"
+        rows.append([lat, lon, hotel_anchor_id(hotel), tooltip])
+        min_lat, max_lat = min(min_lat, lat), max(max_lat, lat)
+        min_lon, max_lon = min(min_lon, lon), max(max_lon, lon)
+
+    if not rows:
+        return None
+
+    m = folium.Map(
+        location=[(min_lat + max_lat) / 2, (min_lon + max_lon) / 2],
+        zoom_start=13,
+        tiles='CartoDB positron'
+    )
+    FastMarkerCluster(
+        rows,
+        callback=_OVERVIEW_MARKER_CALLBACK,
+        options={"spiderfyOnMaxZoom": True, "chunkedLoading": True}
+    ).add_to(m)
+    if len(rows) > 1:
+        m.fit_bounds([[min_lat, min_lon], [max_lat, max_lon]])
+    return m
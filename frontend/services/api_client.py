@@ -1,6 +1,55 @@
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Optional
 import streamlit as st
+from utils.config import API_BASE_URL
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (3.05, 30)
+# Searches whose last ETag and payload are kept per user session
+SEARCH_ETAG_ENTRIES = 16
+
+# Keys the hotel card and overview map actually read; everything else is
+# left out of the search payload.
+HOTEL_FIELDS = [
+    "hotel_id", "hotel_name", "min_total_price", "currencycode",
+    "review_score", "review_score_word", "review_nr", "city", "countrycode",
+    "latitude", "longitude", "main_photo_url", "is_free_cancellable",
+    "badges", "price_summary", "accommodation_type", "timezone",
+]
+
+class SearchResults(list):
+    """Hotel list tagged with the backend's result-set version"""
+    version: Optional[str] = None
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Shared keep-alive session reused across Streamlit reruns"""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _suggest(query: str, limit: int) -> List[dict]:
+    # Raises on errors so a failed request is not cached
+    response = get_session().get(
+        f"{API_BASE_URL}/api/locations/autocomplete",
+        params={"q": query, "limit": limit},
+        timeout=REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()["suggestions"]
+
+def suggest_locations(query: str, limit: int = 5) -> List[dict]:
+    """Destination suggestions from the backend's place index"""
+    try:
+        return _suggest(" ".join(query.split()), limit)
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        return []
 
 def search_hotels(params: dict) -> Optional[list]:
     """Fetch hotels from backend API with precise coordinates"""
@@ -9,13 +58,34 @@ def search_hotels(params: dict) -> Optional[list]:
         params['latitude'] = f"{params['latitude']:.8f}"
         params['longitude'] = f"{params['longitude']:.8f}"
         params['max_distance_km'] = 20.0
-        
-        response = requests.get(
-            "http://localhost:8000/api/hotels/search",
-            params=params
+        params['fields'] = ",".join(HOTEL_FIELDS)
+
+        # Revalidate the last payload for these exact parameters; an
+        # unchanged result comes back as a bodiless 304
+        known = st.session_state.setdefault("search_etags", {})
+        key = tuple(sorted(params.items()))
+        cached = known.pop(key, None)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        response = get_session().get(
+            f"{API_BASE_URL}/api/hotels/search",
+            params=params,
+            headers=headers,
+            timeout=REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        return response.json()
+        if response.status_code == 304 and cached:
+            payload = cached[1]
+        else:
+            payload = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            known[key] = (etag, payload)
+            while len(known) > SEARCH_ETAG_ENTRIES:
+                known.pop(next(iter(known)))
+        results = SearchResults(payload)
+        results.version = response.headers.get("X-Result-Version")
+        return results
     except requests.exceptions.RequestException as e:
         st.error(f"API Error: {str(e)}")
-        return None
\ No newline at end of file
+        return None
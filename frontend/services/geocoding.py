@@ -1,22 +1,54 @@
-from geopy.geocoders import Photon
-from geopy.distance import geodesic
+from typing import Optional
+import unicodedata
+import requests
+import streamlit as st
+from services.api_client import get_session, suggest_locations
+
+PHOTON_URL = "https://photon.komoot.io/api/"
+# (connect, read) timeouts in seconds
+GEOCODE_TIMEOUT = (3.05, 5)
+GEOCODE_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+@st.cache_data(ttl=GEOCODE_CACHE_TTL, show_spinner=False)
+def _geocode(query: str) -> Optional[tuple]:
+    # Raises on network errors so a failed lookup is not cached
+    response = get_session().get(
+        PHOTON_URL,
+        params={"q": query, "limit": 1, "lang": "en"},
+        headers={"User-Agent": "hotel_search_app"},
+        timeout=GEOCODE_TIMEOUT,
+    )
+    response.raise_for_status()
+    features = response.json().get("features") or []
+    if not features:
+        return None
+    longitude, latitude = features[0]["geometry"]["coordinates"][:2]
+    return (float(latitude), float(longitude))
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join("".join(ch for ch in text if not unicodedata.combining(ch)).split())
+
+def _known_place(location_name: str) -> Optional[dict]:
+    """The backend's place for a name typed in full, e.g. 'Paris' or 'Paris, France'"""
+    wanted = _fold(location_name)
+    for place in suggest_locations(location_name):
+        if wanted in (_fold(place["name"]), _fold(place["label"])):
+            return place
+    return None
 
 def get_coordinates(location_name: str) -> tuple:
-    """Get coordinates using Photon (OpenStreetMap-based)"""
+    """Get coordinates of a known place, else using Photon (OpenStreetMap-based) over the shared keep-alive session"""
+    place = _known_place(location_name)
+    if place:
+        return (place["latitude"], place["longitude"])
     try:
-        geolocator = Photon(user_agent="hotel_search_app", timeout=10)
-        location = geolocator.geocode(
-            location_name,
-            exactly_one=True,
-            language="en",
-            limit=1
-        )
-        if location:
-            print(f"Found location: {location.address}")
-            print(f"Coordinates: {location.latitude}, {location.longitude}")
-            return (location.latitude, location.longitude)
+        coordinates = _geocode(" ".join(location_name.split()))
+        if coordinates:
+            print(f"Coordinates: {coordinates[0]}, {coordinates[1]}")
+            return coordinates
         print(f"No location found for: {location_name}")
         return None
-    except Exception as e:
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
         print(f"Geocoding error: {str(e)}")
-        return None
\ No newline at end of file
+        return None
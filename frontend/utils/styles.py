@@ -2,6 +2,7 @@
 def load_styles():
     """Load custom CSS styles for a modern, sleek hotel booking platform"""
     return """
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
     <style>
     /* Global Styles */
     .main {
@@ -188,5 +189,118 @@ def load_styles():
         border-radius: 10px;
         box-shadow: 0 2px 5px rgba(0, 0, 0, 0.05);
     }
+    
+    /* Hotel Card (shared by every card, sent once per page) */
+    .card-title {
+        color: #1f2937;
+        margin-bottom: 4px;
+    }
+    .card-muted {
+        color: #6b7280;
+    }
+    .card-review {
+        display: flex;
+        align-items: center;
+        margin: 10px 0;
+    }
+    .card-score {
+        color: white;
+        padding: 4px 8px;
+        border-radius: 4px;
+        font-weight: 600;
+        margin-right: 8px;
+    }
+    .card-price {
+        font-size: 1.4rem;
+        font-weight: 700;
+        color: #1e3a8a;
+    }
+    .card-badge {
+        color: white;
+        font-size: 0.8rem;
+        padding: 2px 8px;
+        border-radius: 4px;
+        display: inline-block;
+    }
+    .card-fact {
+        background-color: white;
+        padding: 8px 12px;
+        border-radius: 6px;
+        font-size: 0.9rem;
+    }
+    .card-book-button {
+        display: inline-block;
+        background-color: #1e40af;
+        color: white !important;
+        padding: 12px 24px;
+        border-radius: 8px;
+        text-decoration: none;
+        font-weight: 600;
+        font-size: 1.1rem;
+    }
+    
+    /* Amenities */
+    .amenity-grid {
+        display: grid;
+        grid-template-columns: repeat(2, 1fr);
+        gap: 8px;
+    }
+    .amenity-card {
+        display: flex;
+        align-items: center;
+        padding: 12px;
+        background-color: white;
+        border-radius: 8px;
+        transition: all 0.2s ease;
+        border: 1px solid #e5e7eb;
+    }
+    .amenity-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 6px rgba(0,0,0,0.05);
+        border-color: #3b82f6;
+    }
+    .amenity-icon {
+        background-color: #f0f9ff;
+        color: #3b82f6;
+        width: 36px;
+        height: 36px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-right: 12px;
+        flex-shrink: 0;
+    }
+    .amenity-name {
+        font-weight: 500;
+        color: #1f2937;
+    }
+    .category-title {
+        font-size: 1.1rem;
+        font-weight: 600;
+        color: #1e3a8a;
+        margin: 16px 0 12px 0;
+        border-bottom: 2px solid #e5e7eb;
+        padding-bottom: 6px;
+    }
+    
+    /* Price Table */
+    .price-table th {
+        font-weight: 600;
+        text-align: left;
+        padding: 10px;
+        border-bottom: 1px solid #e5e7eb;
+    }
+    .price-table td {
+        padding: 10px;
+        border-bottom: 1px solid #e5e7eb;
+    }
+    .price-table tr:last-child {
+        font-weight: 700;
+        background-color: #f3f4f6;
+    }
+    .discount {
+        color: #16a34a;
+    }
     </style>
     """
\ No newline at end of file